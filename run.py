@@ -10,7 +10,11 @@ import os
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from main import start_application
-
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Headless batch mode: no tkinter or matplotlib import on this path
+        from cli import main
+        sys.exit(main())
+    
+    from main import start_application
     start_application()
@@ -2,8 +2,10 @@ import random
 from collections import deque
 
 class PageReplacementAlgorithms:
-    def __init__(self):
+    def __init__(self, seed=None):
         self.clock_pointer = 0
+        # Private generator so RANDOM runs can be seeded and checkpointed
+        self.rng = random.Random(seed)
         
     def fifo(self, memory_frames):
         """First-In-First-Out page replacement"""
@@ -64,7 +66,7 @@ class PageReplacementAlgorithms:
     
     def random_replacement(self, memory_frames):
         """Random page replacement"""
-        return random.randint(0, len(memory_frames) - 1)
+        return self.rng.randint(0, len(memory_frames) - 1)
     
     def lfu(self, memory_frames):
         """Least Frequently Used page replacement"""
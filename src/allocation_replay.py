@@ -0,0 +1,123 @@
+import time
+from collections import namedtuple
+
+AllocationEvent = namedtuple('AllocationEvent', ['timestamp', 'op', 'process_id', 'segment', 'size'])
+
+ALLOC = "alloc"
+FREE = "free"
+EXIT = "exit"   # free every segment of the process
+
+def read_allocation_trace(path):
+    """Stream AllocationEvents from a CSV trace of timestamp,op,process,segment,size
+
+    Blank lines, '#' comments and a header row are skipped. The segment
+    and size columns may be empty for exit events. Malformed rows, such as
+    an alloc without a positive size, raise ValueError naming the line.
+    """
+    with open(path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            fields = [field.strip() for field in line.split(',')]
+            if fields[0] == "timestamp":
+                continue
+            fields += [""] * (5 - len(fields))
+
+            timestamp, op, process_id, segment, size = fields[:5]
+            try:
+                event = AllocationEvent(float(timestamp), op.lower(), int(process_id),
+                                        segment, int(size) if size else 0)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from None
+
+            if event.op not in (ALLOC, FREE, EXIT):
+                raise ValueError(f"{path}:{line_number}: unknown operation {op!r}")
+            if event.op == ALLOC and event.size <= 0:
+                raise ValueError(f"{path}:{line_number}: alloc needs a positive size")
+            if event.op in (ALLOC, FREE) and not segment:
+                raise ValueError(f"{path}:{line_number}: {event.op} needs a segment name")
+            yield event
+
+class AllocationReplayer:
+    """Drive allocation/free event streams through a SegmentationSimulator-style engine
+
+    With a compaction_threshold, a failed allocation that would fit in the
+    total free memory triggers compaction when the engine's external
+    fragmentation ratio is at least the threshold, and is then retried.
+    Compaction cost is bytes moved times cost_per_byte_moved.
+    """
+
+    def __init__(self, engine, compaction_threshold=None, cost_per_byte_moved=1.0):
+        self.engine = engine
+        self.compaction_threshold = compaction_threshold
+        self.cost_per_byte_moved = cost_per_byte_moved
+        self.events = 0
+        self.allocations = 0
+        self.frees = 0
+        self.process_exits = 0
+        self.failures = 0
+        self.compactions = 0
+        self.bytes_moved = 0
+        self.elapsed = 0.0
+
+    def replay(self, events):
+        started = time.perf_counter()
+        engine = self.engine
+
+        for event in events:
+            self.events += 1
+
+            if event.op == ALLOC:
+                self.allocations += 1
+                if engine.allocate_segment(event.process_id, event.segment, event.size) is None:
+                    if not self._compact_and_retry(event):
+                        self.failures += 1
+            elif event.op == FREE:
+                self.frees += 1
+                engine.deallocate_segment(event.process_id, event.segment)
+            elif event.op == EXIT:
+                self.process_exits += 1
+                engine.deallocate_process(event.process_id)
+            else:
+                raise ValueError(f"Unknown allocation event: {event.op}")
+
+        self.elapsed += time.perf_counter() - started
+        return self.get_statistics()
+
+    def _compact_and_retry(self, event):
+        if self.compaction_threshold is None or not self.engine.supports_compaction:
+            return False
+
+        frag = self.engine.calculate_fragmentation()
+        if frag['free_memory'] < event.size or frag['external_fragmentation_ratio'] < self.compaction_threshold:
+            return False
+
+        # The retry below decides whether this allocation failed; forget the first attempt
+        self.engine.forget_failed_allocation()
+        self.bytes_moved += self.engine.compact()
+        self.compactions += 1
+        return self.engine.allocate_segment(event.process_id, event.segment, event.size) is not None
+
+    def get_statistics(self):
+        return {
+            'engine': self.engine.engine_name,
+            'events': self.events,
+            'allocations': self.allocations,
+            'frees': self.frees,
+            'process_exits': self.process_exits,
+            'failures': self.failures,
+            'failure_rate': self.failures / self.allocations if self.allocations > 0 else 0,
+            'throughput': self.events / self.elapsed if self.elapsed > 0 else 0,
+            'compactions': self.compactions,
+            'bytes_moved': self.bytes_moved,
+            'compaction_cost': self.bytes_moved * self.cost_per_byte_moved,
+            'fragmentation': self.engine.calculate_fragmentation()
+        }
+
+def compare_allocators(events, engines, compaction_threshold=None):
+    """Replay the same events through several engines and return statistics per engine"""
+    events = list(events)
+    return {engine.engine_name: AllocationReplayer(engine, compaction_threshold).replay(events)
+            for engine in engines}
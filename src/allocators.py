@@ -0,0 +1,281 @@
+import heapq
+from bisect import bisect_left
+from segmentation import Segment, SegmentationSimulator, HOLE_TAG_BYTES
+
+# Bookkeeping size estimates used for metadata overhead reporting
+FREE_LIST_HEAD_BYTES = 8
+SLAB_HEADER_BYTES = 32
+
+class BuddyAllocator(SegmentationSimulator):
+    """Binary buddy allocator behind the SegmentationSimulator interface
+
+    Blocks are min_block << order in size. Allocation rounds the request up
+    to a power of two and splits larger blocks; freeing merges a block with
+    its buddy for as long as the buddy is free. Memory beyond the last whole
+    top-level block is carved into descending power-of-two blocks, whose
+    buddies lie past the end and so never merge; only the tail smaller than
+    min_block is unusable and is reported as unusable_memory.
+    """
+
+    engine_name = "BUDDY"
+    supports_compaction = False
+
+    def __init__(self, total_memory=1024, min_block=16, fragmentation_sample_interval=1):
+        super().__init__(0, fragmentation_sample_interval=fragmentation_sample_interval)
+        if total_memory < min_block:
+            raise ValueError("total_memory must be at least one min_block")
+
+        self.total_memory = total_memory
+        self.min_block = min_block
+        self.max_order = (total_memory // min_block).bit_length() - 1
+        self.top_block = min_block << self.max_order
+        self.free_lists = [set() for _ in range(self.max_order + 1)]
+        self.free_heaps = [[] for _ in range(self.max_order + 1)]
+        self.block_orders = {}   # base -> order of allocated blocks
+        self.free_bytes = 0
+
+        base = 0
+        for order in range(self.max_order, -1, -1):
+            block = self.min_block << order
+            while total_memory - base >= block:
+                self._push_free(base, order)
+                base += block
+        self.unusable_bytes = total_memory - base
+
+    def initialize_segments(self, segment_sizes, segment_names=None):
+        raise ValueError("The buddy allocator does not use fixed partitions")
+
+    def order_for(self, size):
+        units = -(-size // self.min_block)
+        return max(0, (units - 1).bit_length())
+
+    def _place(self, seg_name, size):
+        order = self.order_for(size)
+        if order > self.max_order:
+            return None
+
+        current = order
+        while current <= self.max_order and not self.free_lists[current]:
+            current += 1
+        if current > self.max_order:
+            return None
+
+        base = self._pop_free(current)
+        while current > order:
+            current -= 1
+            self._push_free(base + (self.min_block << current), current)
+
+        self.block_orders[base] = order
+        segment = Segment(self.next_segment_id, base, self.min_block << order, seg_name)
+        self.next_segment_id += 1
+        return segment
+
+    def _release(self, segment):
+        base = segment.base
+        order = self.block_orders.pop(base)
+
+        while order < self.max_order:
+            buddy = base ^ (self.min_block << order)
+            if buddy not in self.free_lists[order]:
+                break
+            self.free_lists[order].discard(buddy)
+            self.free_bytes -= self.min_block << order
+            base = min(base, buddy)
+            order += 1
+
+        self._push_free(base, order)
+
+    def _push_free(self, base, order):
+        self.free_lists[order].add(base)
+        heapq.heappush(self.free_heaps[order], base)
+        self.free_bytes += self.min_block << order
+
+    def _pop_free(self, order):
+        """Remove and return the lowest free block of an order (heap entries are lazily deleted)"""
+        heap = self.free_heaps[order]
+        free = self.free_lists[order]
+        while True:
+            base = heapq.heappop(heap)
+            if base in free:
+                free.remove(base)
+                self.free_bytes -= self.min_block << order
+                return base
+
+    def largest_free_block(self):
+        for order in range(self.max_order, -1, -1):
+            if self.free_lists[order]:
+                return self.min_block << order
+        return 0
+
+    def calculate_fragmentation(self):
+        internal_frag = self.allocated_bytes - self.requested_bytes
+        largest_hole = self.largest_free_block()
+        external_frag = self.free_bytes - largest_hole
+
+        return {
+            'internal_fragmentation': internal_frag,
+            'external_fragmentation': external_frag,
+            'total_fragmentation': internal_frag + external_frag,
+            'free_memory': self.free_bytes,
+            'largest_hole': largest_hole,
+            'hole_count': sum(len(free) for free in self.free_lists),
+            'external_fragmentation_ratio': external_frag / self.free_bytes if self.free_bytes > 0 else 0,
+            'unusable_memory': self.unusable_bytes
+        }
+
+    def metadata_bytes(self):
+        """One split bit per buddy pair at every order plus a head per free list"""
+        pair_bits = sum(self.total_memory // (self.min_block << order) // 2
+                        for order in range(self.max_order + 1))
+        return -(-pair_bits // 8) + FREE_LIST_HEAD_BYTES * (self.max_order + 1)
+
+    def memory_layout(self):
+        layout = list(self.allocated_segments.values())
+        for order, free in enumerate(self.free_lists):
+            for base in free:
+                layout.append(Segment(None, base, self.min_block << order, "Free"))
+        layout.sort(key=lambda segment: segment.base)
+        return layout
+
+class _Slab:
+    __slots__ = ('base', 'object_size', 'capacity', 'free_slots')
+
+    def __init__(self, base, object_size, capacity):
+        self.base = base
+        self.object_size = object_size
+        self.capacity = capacity
+        self.free_slots = list(range(capacity - 1, -1, -1))
+
+class _ObjectCache:
+    def __init__(self, object_size, slab_size):
+        self.object_size = object_size
+        self.objects_per_slab = slab_size // object_size
+        self.partial = {}   # slab base -> slab with at least one free slot
+        self.slab_count = 0
+
+class SlabAllocator(SegmentationSimulator):
+    """Slab/object-cache allocator behind the SegmentationSimulator interface
+
+    Requests up to the largest size class are served from per-class caches
+    of fixed-size slabs; larger requests take whole slab multiples straight
+    from the backing pool. Empty slabs are returned to the pool at once.
+    """
+
+    engine_name = "SLAB"
+    supports_compaction = False
+
+    def __init__(self, total_memory=1024, slab_size=64, size_classes=(4, 8, 16, 32, 64),
+                 fragmentation_sample_interval=1):
+        super().__init__(total_memory, "FIRST_FIT",
+                         fragmentation_sample_interval=fragmentation_sample_interval)
+        self.slab_size = slab_size
+        self.size_classes = sorted(size for size in size_classes if size <= slab_size)
+        if not self.size_classes:
+            raise ValueError("At least one size class must fit in a slab")
+
+        self.caches = {size: _ObjectCache(size, slab_size) for size in self.size_classes}
+        self.object_slabs = {}      # object base -> slab
+        self.large_objects = set()  # bases of multi-slab allocations
+        self.idle_object_bytes = 0  # free slots inside live slabs
+        self.idle_objects = 0
+
+    def initialize_segments(self, segment_sizes, segment_names=None):
+        raise ValueError("The slab allocator does not use fixed partitions")
+
+    def _place(self, seg_name, size):
+        index = bisect_left(self.size_classes, size)
+
+        if index == len(self.size_classes):
+            block_size = -(-size // self.slab_size) * self.slab_size
+            base = self.free_space.find(block_size, "FIRST_FIT")
+            if base is None:
+                return None
+            self.free_space.take(base, block_size)
+            self.large_objects.add(base)
+        else:
+            cache = self.caches[self.size_classes[index]]
+            slab = self._partial_slab(cache)
+            if slab is None:
+                return None
+
+            slot = slab.free_slots.pop()
+            if not slab.free_slots:
+                del cache.partial[slab.base]
+            base = slab.base + slot * cache.object_size
+            block_size = cache.object_size
+            self.object_slabs[base] = slab
+            self.idle_object_bytes -= block_size
+            self.idle_objects -= 1
+
+        segment = Segment(self.next_segment_id, base, block_size, seg_name)
+        self.next_segment_id += 1
+        return segment
+
+    def _partial_slab(self, cache):
+        if cache.partial:
+            return next(iter(cache.partial.values()))
+
+        base = self.free_space.find(self.slab_size, "FIRST_FIT")
+        if base is None:
+            return None
+        self.free_space.take(base, self.slab_size)
+
+        slab = _Slab(base, cache.object_size, cache.objects_per_slab)
+        cache.partial[base] = slab
+        cache.slab_count += 1
+        self.idle_object_bytes += slab.capacity * slab.object_size
+        self.idle_objects += slab.capacity
+        return slab
+
+    def _release(self, segment):
+        if segment.base in self.large_objects:
+            self.large_objects.remove(segment.base)
+            self.free_space.add_hole(segment.base, segment.limit)
+            return
+
+        slab = self.object_slabs.pop(segment.base)
+        cache = self.caches[slab.object_size]
+        slab.free_slots.append((segment.base - slab.base) // slab.object_size)
+        self.idle_object_bytes += slab.object_size
+        self.idle_objects += 1
+
+        if len(slab.free_slots) == slab.capacity:
+            cache.partial.pop(slab.base, None)
+            cache.slab_count -= 1
+            self.idle_object_bytes -= slab.capacity * slab.object_size
+            self.idle_objects -= slab.capacity
+            self.free_space.add_hole(slab.base, self.slab_size)
+        else:
+            cache.partial[slab.base] = slab
+
+    def calculate_fragmentation(self):
+        """Slab tail waste counts as internal, idle cached objects as external fragmentation"""
+        tail_waste = sum(cache.slab_count * (self.slab_size - cache.objects_per_slab * cache.object_size)
+                         for cache in self.caches.values())
+        internal_frag = self.allocated_bytes - self.requested_bytes + tail_waste
+
+        pool_largest = self.free_space.largest_hole()
+        largest_hole = pool_largest
+        for size in reversed(self.size_classes):
+            if self.caches[size].partial:
+                largest_hole = max(largest_hole, size)
+                break
+
+        free_memory = self.free_space.free_bytes + self.idle_object_bytes
+        external_frag = free_memory - largest_hole
+
+        return {
+            'internal_fragmentation': internal_frag,
+            'external_fragmentation': external_frag,
+            'total_fragmentation': internal_frag + external_frag,
+            'free_memory': free_memory,
+            'largest_hole': largest_hole,
+            'hole_count': len(self.free_space) + self.idle_objects,
+            'external_fragmentation_ratio': external_frag / free_memory if free_memory > 0 else 0
+        }
+
+    def metadata_bytes(self):
+        """A header and a free-slot bitmap per slab plus boundary tags in the backing pool"""
+        slab_bytes = sum(cache.slab_count * (SLAB_HEADER_BYTES + -(-cache.objects_per_slab // 8))
+                         for cache in self.caches.values())
+        return slab_bytes + len(self.free_space) * HOLE_TAG_BYTES
@@ -0,0 +1,243 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from memory_simulator import MemorySimulator, iter_pages
+
+# Stack algorithms never show Belady's anomaly and get every frame count from one pass
+STACK_ALGORITHMS = ["LRU", "OPTIMAL"]
+SCAN_BATCHES_PER_WORKER = 4
+
+class FenwickTree:
+    """Prefix sums over positions 1..size with O(log n) updates and queries"""
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, position, value):
+        while position <= self.size:
+            self.tree[position] += value
+            position += position & -position
+
+    def prefix_sum(self, position):
+        total = 0
+        while position > 0:
+            total += self.tree[position]
+            position -= position & -position
+        return total
+
+def _curve_from_distances(distances, max_frames):
+    """Faults for 1..max_frames frames from stack distances (0 means a cold miss)"""
+    histogram = [0] * (max_frames + 2)
+    for distance in distances:
+        histogram[min(distance, max_frames + 1) if distance else max_frames + 1] += 1
+
+    faults = []
+    misses = sum(histogram)
+    for frames in range(1, max_frames + 1):
+        misses -= histogram[frames]
+        faults.append(misses)
+    return faults
+
+def lru_stack_distances(reference_string):
+    """LRU stack distance of every reference, 0 for first references
+
+    A reference's distance is the number of distinct pages used since
+    the previous reference to the same page, plus one; a Fenwick tree
+    over reference times marks the latest use of each page.
+    """
+    tree = FenwickTree(len(reference_string))
+    last_use = {}
+    distances = []
+    for time, page in enumerate(reference_string, 1):
+        previous = last_use.get(page)
+        if previous is None:
+            distances.append(0)
+        else:
+            distances.append(tree.prefix_sum(time) - tree.prefix_sum(previous - 1))
+            tree.add(previous, -1)
+        tree.add(time, 1)
+        last_use[page] = time
+    return distances
+
+def opt_stack_distances(reference_string):
+    """OPT stack distance of every reference, 0 for first references
+
+    Mattson's priority stack: after each reference the stack is reordered
+    so that, at every depth, the page needed soonest stays higher.
+    """
+    never = len(reference_string)
+    next_use = [never] * len(reference_string)
+    upcoming = {}
+    for time in range(len(reference_string) - 1, -1, -1):
+        page = reference_string[time]
+        next_use[time] = upcoming.get(page, never)
+        upcoming[page] = time
+
+    stack = []       # pages, top first
+    priority = {}    # page -> time of its next use
+    distances = []
+    for time, page in enumerate(reference_string):
+        try:
+            depth = stack.index(page)
+            distances.append(depth + 1)
+        except ValueError:
+            depth = len(stack)
+            stack.append(None)
+            distances.append(0)
+
+        carry = stack[0] if depth > 0 else None
+        stack[0] = page
+        for position in range(1, depth + 1):
+            if position == depth:
+                stack[position] = carry
+                break
+            resident = stack[position]
+            if priority[carry] < priority[resident]:
+                stack[position], carry = carry, resident
+        priority[page] = next_use[time]
+
+    return distances
+
+def stack_fault_curve(reference_string, algorithm, max_frames):
+    """Faults for 1..max_frames frames of a stack algorithm in one pass"""
+    if algorithm == "LRU":
+        distances = lru_stack_distances(reference_string)
+    elif algorithm == "OPTIMAL":
+        distances = opt_stack_distances(reference_string)
+    else:
+        raise ValueError(f"{algorithm} is not a stack algorithm")
+    return _curve_from_distances(distances, max_frames)
+
+def count_faults(reference_string, num_frames, algorithm, seed=0):
+    """Page faults of one full simulation; module level so it can run in a worker process
+
+    RANDOM replacement draws from seed, so every frame count of a curve
+    replays the same random stream and its anomalies are reproducible.
+    """
+    simulator = MemorySimulator()
+    simulator.initialize(num_frames, 1024, algorithm, seed)
+    simulator.set_reference_string(reference_string)
+    simulator.record_history = False
+    for page in iter_pages(reference_string):
+        simulator.simulate_step(page)
+    return simulator.page_faults
+
+def simulated_fault_curve(reference_string, frame_counts, algorithm, seed=0):
+    return [count_faults(reference_string, frames, algorithm, seed) for frames in frame_counts]
+
+def simulated_fault_curves(traces, frame_counts, algorithms, seed=0):
+    """Simulated curves for a batch of named traces, as {name: {algorithm: curve}}"""
+    return {name: {algorithm: simulated_fault_curve(reference_string, frame_counts, algorithm, seed)
+                   for algorithm in algorithms}
+            for name, reference_string in traces.items()}
+
+def fault_curves(reference_string, frame_counts, algorithms, pool=None, seed=0):
+    """Faults per frame count for each algorithm
+
+    Stack algorithms come from one stack-distance pass; the others run
+    one simulation per frame count, spread over pool when given.
+    """
+    reference_string = list(iter_pages(reference_string))
+    curves = {}
+    pending = {}
+    for algorithm in algorithms:
+        if algorithm in STACK_ALGORITHMS:
+            curve = stack_fault_curve(reference_string, algorithm, max(frame_counts))
+            curves[algorithm] = [curve[frames - 1] for frames in frame_counts]
+        elif pool is not None:
+            pending[algorithm] = [pool.submit(count_faults, reference_string, frames, algorithm, seed)
+                                  for frames in frame_counts]
+        else:
+            curves[algorithm] = simulated_fault_curve(reference_string, frame_counts, algorithm, seed)
+
+    for algorithm, futures in pending.items():
+        curves[algorithm] = [future.result() for future in futures]
+    return {algorithm: curves[algorithm] for algorithm in algorithms}
+
+def find_anomalies(frame_counts, faults):
+    """Belady anomalies: more frames but more faults, between neighbouring frame counts"""
+    return [{'frames': frame_counts[i], 'faults': faults[i],
+             'more_frames': frame_counts[i + 1], 'more_faults': faults[i + 1]}
+            for i in range(len(faults) - 1) if faults[i + 1] > faults[i]]
+
+def find_crossovers(frame_counts, curves):
+    """Frame counts where the better of two algorithms changes (ties keep the last leader)"""
+    crossovers = []
+    for first, second in combinations(curves, 2):
+        leader = None
+        for frames, a, b in zip(frame_counts, curves[first], curves[second]):
+            if a == b:
+                continue
+            better = first if a < b else second
+            if leader is not None and better != leader:
+                crossovers.append({'frames': frames, 'algorithms': [first, second], 'better': better})
+            leader = better
+    return crossovers
+
+def analyze_curves(frame_counts, curves):
+    anomalies = {}
+    for algorithm, curve in curves.items():
+        found = find_anomalies(frame_counts, curve)
+        if found:
+            anomalies[algorithm] = found
+
+    return {
+        'curves': curves,
+        'anomalies': anomalies,
+        'crossovers': find_crossovers(frame_counts, curves)
+    }
+
+def analyze_trace(reference_string, frame_counts, algorithms, pool=None, seed=0):
+    return analyze_curves(frame_counts, fault_curves(reference_string, frame_counts, algorithms, pool, seed))
+
+def scan_traces(traces, frame_counts, algorithms, workers=None, seed=0):
+    """Analyze many named traces
+
+    With workers > 1 the non-stack simulations of all traces are queued
+    on one process pool in batches of traces before any result is
+    awaited, while the stack curves are computed in this process.
+    """
+    traces = {name: list(iter_pages(reference_string)) for name, reference_string in traces.items()}
+    simulated = [algorithm for algorithm in algorithms if algorithm not in STACK_ALGORITHMS]
+    pool = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 and simulated else None
+
+    try:
+        batches = []
+        if pool is not None:
+            names = list(traces)
+            size = max(1, len(names) // (workers * SCAN_BATCHES_PER_WORKER))
+            for start in range(0, len(names), size):
+                batch = {name: traces[name] for name in names[start:start + size]}
+                batches.append(pool.submit(simulated_fault_curves, batch, frame_counts, simulated, seed))
+
+        curves = {name: fault_curves(reference_string, frame_counts,
+                                     [algorithm for algorithm in algorithms
+                                      if pool is None or algorithm in STACK_ALGORITHMS], seed=seed)
+                  for name, reference_string in traces.items()}
+        for batch in batches:
+            for name, simulated_curves in batch.result().items():
+                curves[name].update(simulated_curves)
+
+        results = {name: analyze_curves(frame_counts, {algorithm: curves[name][algorithm]
+                                                       for algorithm in algorithms})
+                   for name in traces}
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return {
+        'frame_counts': list(frame_counts),
+        'algorithms': list(algorithms),
+        'seed': seed,
+        'traces': len(results),
+        'traces_with_anomalies': sum(1 for result in results.values() if result['anomalies']),
+        'traces_with_crossovers': sum(1 for result in results.values() if result['crossovers']),
+        'results': results
+    }
+
+def random_traces(count, length=30, max_page=6, seed=0):
+    """Uniform random reference strings like the GUI's Generate Random, keyed by name"""
+    rng = random.Random(seed)
+    return {f"random-{index}": [rng.randint(1, max_page) for _ in range(length)]
+            for index in range(count)}
@@ -0,0 +1,88 @@
+import queue
+import threading
+
+_DONE = "done"
+_CANCELLED = "cancelled"
+_ERROR = "error"
+
+class TaskCancelled(Exception):
+    """Raised inside a worker once its task has been cancelled"""
+
+class BackgroundTask:
+    """Run a function on a worker thread and hand its results back to the Tk thread
+
+    The function is called as function(task) and may report with
+    task.post(kind, payload) and poll task.check_cancelled(). Messages are
+    queued and delivered to on_message(kind, payload) from root.after
+    polling, so every callback runs on the Tk thread. The task ends with
+    on_done(result), on_cancel() or on_error(exception).
+    """
+
+    def __init__(self, root, function, on_message=None, on_done=None, on_cancel=None,
+                 on_error=None, poll_interval=50):
+        self.root = root
+        self.function = function
+        self.on_message = on_message
+        self.on_done = on_done
+        self.on_cancel = on_cancel
+        self.on_error = on_error
+        self.poll_interval = poll_interval
+        self.queue = queue.Queue()
+        self.cancelled = threading.Event()
+        self.finished = False
+        self.thread = threading.Thread(target=self._run, name="BackgroundTask", daemon=True)
+
+    @property
+    def running(self):
+        return self.thread.is_alive() or not self.finished
+
+    def start(self):
+        self.thread.start()
+        self.root.after(self.poll_interval, self._poll)
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def check_cancelled(self):
+        if self.cancelled.is_set():
+            raise TaskCancelled()
+
+    def post(self, kind, payload=None):
+        self.queue.put((kind, payload))
+
+    def _run(self):
+        try:
+            result = self.function(self)
+        except TaskCancelled:
+            self.queue.put((_CANCELLED, None))
+        except Exception as e:
+            self.queue.put((_ERROR, e))
+        else:
+            self.queue.put((_DONE, result))
+
+    def _poll(self):
+        while True:
+            try:
+                kind, payload = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == _DONE:
+                self._finish(self.on_done, payload)
+                return
+            if kind == _CANCELLED:
+                self._finish(self.on_cancel)
+                return
+            if kind == _ERROR:
+                self._finish(self.on_error, payload)
+                return
+            if self.on_message is not None:
+                self.on_message(kind, payload)
+
+        self.root.after(self.poll_interval, self._poll)
+
+    def _finish(self, callback, *args):
+        self.finished = True
+        if callback is not None:
+            callback(*args)
@@ -0,0 +1,184 @@
+import os
+import numpy as np
+from memory_simulator import MemorySimulator, SIMULATOR_VERSION, iter_pages
+from result_format import history_to_columns, read_binary_results, write_binary_results
+from trace_import import PAGE_TRACE_DTYPE, load_page_trace
+
+# Checkpoints are .vmr files (JSON header plus packed arrays), so loading one
+# never runs code. The trace is kept once in a .pages file next to them.
+CHECKPOINT_KIND = "checkpoint"
+TRACE_SUFFIX = ".trace.pages"
+NO_PAGE = -1
+
+FRAME_FIELDS = ['page', 'allocated', 'last_accessed', 'reference_bit', 'load_time', 'access_count']
+
+def capture_state(simulator, include_history=False):
+    """Snapshot everything needed to continue a simulation exactly
+
+    The trace itself is not copied, only its digest, which the simulator
+    computes once per trace.
+    """
+    handler = simulator.algorithm_handler
+
+    state = {
+        'version': SIMULATOR_VERSION,
+        'num_frames': simulator.num_frames,
+        'page_size': simulator.page_size,
+        'algorithm': simulator.algorithm,
+        'seed': simulator.seed,
+        'frames': [(frame.page, frame.allocated, frame.last_accessed, frame.reference_bit,
+                    frame.load_time, frame.access_count) for frame in simulator.memory_frames],
+        'page_table': dict(simulator.page_table),
+        'clock_pointer': handler.clock_pointer,
+        'rng_state': handler.rng.getstate(),
+        'time_counter': simulator.time_counter,
+        'page_faults': simulator.page_faults,
+        'hits': simulator.hits,
+        'reference_digest': simulator.reference_digest(),
+        'reference_length': len(simulator.reference_string),
+        'history': list(simulator.history) if include_history else None
+    }
+    return state
+
+def restore_state(state, reference_string, verify=True):
+    """Build a new MemorySimulator from a captured state and its trace
+
+    With verify=True the trace is checked against the stored digest.
+    """
+    if state['version'] != SIMULATOR_VERSION:
+        raise ValueError(f"Checkpoint was written by simulator version {state['version']}, "
+                         f"this is {SIMULATOR_VERSION}")
+
+    simulator = MemorySimulator()
+    simulator.initialize(state['num_frames'], state['page_size'], state['algorithm'], state['seed'])
+    if verify:
+        simulator.set_reference_string(reference_string)
+        if simulator.reference_digest() != state['reference_digest']:
+            raise ValueError("Reference string does not match the checkpointed trace")
+    else:
+        simulator.set_reference_string(reference_string, state['reference_digest'])
+
+    for frame, values in zip(simulator.memory_frames, state['frames']):
+        (frame.page, frame.allocated, frame.last_accessed, frame.reference_bit,
+         frame.load_time, frame.access_count) = values
+
+    simulator.page_table = dict(state['page_table'])
+    simulator.algorithm_handler.clock_pointer = state['clock_pointer']
+    simulator.algorithm_handler.rng.setstate(state['rng_state'])
+    simulator.time_counter = state['time_counter']
+    simulator.page_faults = state['page_faults']
+    simulator.hits = state['hits']
+    if state['history'] is not None:
+        simulator.history = list(state['history'])
+
+    return simulator
+
+def trace_path_for(path):
+    return path + TRACE_SUFFIX
+
+def save_trace(simulator, path):
+    """Write the simulator's trace as a .pages file once; return its path"""
+    trace_path = trace_path_for(path)
+    tmp_path = trace_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(np.ascontiguousarray(simulator.reference_string, dtype=PAGE_TRACE_DTYPE).tobytes())
+    os.replace(tmp_path, trace_path)
+    return trace_path
+
+def save_checkpoint(simulator, path, include_reference=True, include_history=False, reference_path=None):
+    """Write a checkpoint atomically, so a crash never leaves a torn file
+
+    include_reference writes the trace to a .pages file beside the
+    checkpoint; pass reference_path instead to point at a trace that is
+    already on disk, so repeated checkpoints hold only the simulator state.
+    """
+    state = capture_state(simulator, include_history)
+    if include_reference and reference_path is None:
+        reference_path = save_trace(simulator, path)
+
+    frames = np.array([[NO_PAGE if value is None else int(value) for value in frame]
+                       for frame in state['frames']], dtype='<i8').reshape(-1, len(FRAME_FIELDS))
+    page_table = np.array(sorted(state['page_table'].items()), dtype='<i8').reshape(-1, 2)
+    rng_version, rng_internal, rng_gauss = state['rng_state']
+
+    metadata = {
+        'kind': CHECKPOINT_KIND,
+        'state': {key: state[key] for key in ('version', 'num_frames', 'page_size', 'algorithm', 'seed',
+                                               'clock_pointer', 'time_counter', 'page_faults', 'hits',
+                                               'reference_digest', 'reference_length')},
+        'rng': {'version': rng_version, 'gauss_next': rng_gauss},
+        'reference_path': None if reference_path is None else os.path.relpath(
+            reference_path, os.path.dirname(os.path.abspath(path))),
+        'has_history': include_history
+    }
+    columns = {
+        'frames': frames,
+        'page_table': page_table,
+        'rng_state': np.array(rng_internal, dtype='<u4')
+    }
+    if include_history:
+        columns.update(history_to_columns(state['history'], state['num_frames']))
+
+    tmp_path = path + ".tmp"
+    write_binary_results(tmp_path, metadata, columns)
+    os.replace(tmp_path, path)
+
+    return path
+
+def load_checkpoint(path, reference_string=None):
+    """Restore a MemorySimulator from a checkpoint file
+
+    Without reference_string the trace saved beside the checkpoint is used.
+    """
+    results = read_binary_results(path)
+    header = results.header
+    if header.get('kind') != CHECKPOINT_KIND:
+        raise ValueError(f"{path} is not a simulator checkpoint")
+
+    if reference_string is None:
+        if header['reference_path'] is None:
+            raise ValueError("Checkpoint does not reference its trace; pass it explicitly")
+        trace_path = os.path.join(os.path.dirname(os.path.abspath(path)), header['reference_path'])
+        reference_string = load_page_trace(trace_path)
+
+    state = dict(header['state'])
+    state['frames'] = [(None if page == NO_PAGE else int(page), bool(allocated), int(last_accessed),
+                        int(reference_bit), int(load_time), int(access_count))
+                       for page, allocated, last_accessed, reference_bit, load_time, access_count
+                       in results.column('frames')]
+    state['page_table'] = {int(page): int(frame) for page, frame in results.column('page_table')}
+    state['rng_state'] = (header['rng']['version'], tuple(int(value) for value in results.column('rng_state')),
+                          header['rng']['gauss_next'])
+    state['history'] = list(results.history) if header['has_history'] else None
+
+    return restore_state(state, reference_string)
+
+def fork_simulator(simulator, count=1):
+    """Return independent copies of simulator that continue from its current state
+
+    The copies share nothing with the original but its trace, so several
+    what-if continuations can be run from one warmed-up state. Listeners
+    are not carried over.
+    """
+    state = capture_state(simulator, include_history=True)
+    return [restore_state(state, simulator.reference_string, verify=False) for _ in range(count)]
+
+def run_with_checkpoints(simulator, path, interval, max_steps=None):
+    """Continue simulating from the current trace position, checkpointing every interval steps
+
+    The trace is written once beside the checkpoint; each checkpoint then
+    holds only frames, counters and replacement-policy state.
+    """
+    reference_path = save_trace(simulator, path)
+    end = len(simulator.reference_string)
+    if max_steps is not None:
+        end = min(end, simulator.time_counter + max_steps)
+
+    for page in iter_pages(simulator.reference_string[simulator.time_counter:end]):
+        simulator.simulate_step(page)
+
+        if simulator.time_counter % interval == 0:
+            save_checkpoint(simulator, path, reference_path=reference_path)
+
+    save_checkpoint(simulator, path, reference_path=reference_path)
+    return simulator
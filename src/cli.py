@@ -0,0 +1,432 @@
+"""
+Headless command-line interface for batch simulations
+
+Nothing on this path imports tkinter or matplotlib; plotting modules are
+only loaded when --plot is requested.
+"""
+
+import argparse
+import json
+import random
+import sys
+from memory_simulator import MemorySimulator, iter_pages, trace_digest
+
+ALGORITHMS = ["FIFO", "LRU", "OPTIMAL", "CLOCK", "RANDOM"]
+
+def read_trace(path):
+    """Read a reference string of page numbers separated by commas or whitespace
+
+    Binary .pages traces written by the import command are memory-mapped
+    instead of parsed and returned as the mapped array.
+    """
+    if path.endswith(".pages"):
+        from trace_import import load_page_trace
+        return load_page_trace(path)
+
+    with open(path, 'r') as f:
+        return [int(token) for token in f.read().replace(',', ' ').split()]
+
+def parse_frame_range(text):
+    """Parse '8', '1-16' or '1-64:4' into a list of frame counts"""
+    if '-' not in text:
+        return [int(text)]
+
+    bounds, _, step = text.partition(':')
+    start, end = bounds.split('-')
+    return list(range(int(start), int(end) + 1, int(step) if step else 1))
+
+def load_reference_string(args):
+    if args.ref:
+        return [int(x.strip()) for x in args.ref.split(',')]
+    if args.trace:
+        return read_trace(args.trace)
+    raise SystemExit("error: either --trace or --ref is required")
+
+def run_simulation(reference_string, num_frames, page_size, algorithm, listener=None, seed=None):
+    """Run one complete simulation and return the finished simulator"""
+    simulator = MemorySimulator()
+    simulator.initialize(num_frames, page_size, algorithm, seed)
+    simulator.set_reference_string(reference_string)
+    if listener is not None:
+        simulator.add_listener(listener)
+
+    for page in iter_pages(simulator.reference_string):
+        simulator.simulate_step(page)
+
+    return simulator
+
+def command_run(args):
+    reference_string = load_reference_string(args)
+
+    seed = args.seed if args.seed is not None else random.getrandbits(32)
+
+    writer = None
+    if args.log:
+        from event_log import EventLogWriter
+        writer = EventLogWriter(args.log, interval=args.log_interval)
+        if writer.initial_size == 0:
+            writer.write_header(args.algorithm, args.frames, args.page_size, seed)
+
+    simulator = run_simulation(reference_string, args.frames, args.page_size, args.algorithm, writer, seed)
+
+    if writer is not None:
+        writer.close()
+
+    if args.output:
+        from utils import save_simulation_results
+        save_simulation_results(simulator, args.output)
+
+    print_statistics({args.algorithm: simulator.get_statistics()}, args.json)
+    return 0
+
+def command_sweep(args):
+    reference_string = load_reference_string(args)
+    algorithms = args.algorithms.split(',')
+    frame_counts = parse_frame_range(args.frames)
+    cache = make_cache(args)
+    digest = trace_digest(reference_string) if cache is not None else None
+
+    rows = []
+    for num_frames in frame_counts:
+        for algorithm in algorithms:
+            stats = cached_statistics(reference_string, num_frames, args.page_size, algorithm, cache, digest)
+            rows.append(dict(stats, num_frames=num_frames))
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(f"{'Frames':>6}  {'Algorithm':<10}{'Faults':>10}{'Hit Ratio':>12}")
+        for row in rows:
+            print(f"{row['num_frames']:>6}  {row['algorithm']:<10}{row['page_faults']:>10}"
+                  f"{row['hit_ratio']:>12.2%}")
+    return 0
+
+def command_report(args):
+    from utils import generate_performance_report
+
+    simulator = MemorySimulator()
+    simulator.initialize(args.frames, args.page_size, "FIFO")
+    simulator.set_reference_string(load_reference_string(args))
+
+    report = generate_performance_report(simulator, args.algorithms.split(','), cache=make_cache(args))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.plot:
+        from utils import plot_algorithm_comparison
+        plot_algorithm_comparison(report, save_path=args.plot)
+
+    print_statistics(report['comparison'], args.json)
+    return 0
+
+def command_hierarchy(args):
+    from memory_hierarchy import standard_hierarchy
+
+    hierarchy = standard_hierarchy(args.frames, numa_frames=args.numa_frames,
+                                   compressed_pool_pages=args.compressed_pages,
+                                   compression_ratio=args.ratio, compression_spread=args.ratio_spread,
+                                   swap=not args.no_swap, page_size=args.page_size, policy=args.policy)
+    statistics = hierarchy.run(load_reference_string(args))
+
+    if args.json:
+        print(json.dumps(statistics, indent=2))
+        return 0
+
+    print(f"{'Tier':<12}{'Hits':>10}{'Hit Rate':>10}{'Pages':>8}{'Demoted':>9}{'Promoted':>9}")
+    for tier in statistics['tiers']:
+        print(f"{tier['name']:<12}{tier['hits']:>10}{tier['hit_rate']:>10.2%}{tier['resident_pages']:>8}"
+              f"{tier['demotions']:>9}{tier['promotions']:>9}")
+    print(f"Cold misses: {statistics['cold_misses']} ({statistics['miss_rate']:.2%})")
+    print(f"Average access time: {statistics['average_access_time_ns']:.1f} ns")
+    return 0
+
+def command_multicore(args):
+    from multicore import MultiCoreSimulator, partition_trace
+
+    simulator = MultiCoreSimulator(args.cores, args.frames, args.page_size, args.algorithm,
+                                   tlb_entries=args.tlb_entries, quantum=args.quantum,
+                                   shootdown=args.shootdown, workers=args.workers,
+                                   partitions=args.partitions, seed=args.seed)
+    statistics = simulator.run(partition_trace(load_reference_string(args), args.cores))
+
+    if args.json:
+        print(json.dumps(statistics, indent=2))
+        return 0
+
+    if statistics['memory_model'] == "partitioned":
+        print(f"Partitioned memory model: {statistics['partitions']} partitions, "
+              f"not comparable with shared-frame results")
+    print(f"{'Core':<6}{'Accesses':>10}{'Faults':>8}{'TLB Hits':>10}{'TLB Hit':>9}{'IPIs':>7}")
+    for core in statistics['per_core']:
+        print(f"{core['core']:<6}{core['accesses']:>10}{core['page_faults']:>8}{core['tlb_hits']:>10}"
+              f"{core['tlb_hit_ratio']:>9.2%}{core['ipis_received']:>7}")
+    print(f"Page faults: {statistics['page_faults']} (hit ratio {statistics['hit_ratio']:.2%})")
+    print(f"Shootdowns: {statistics['shootdowns']} ({statistics['evictions']} evictions, "
+          f"{statistics['unmaps']} unmaps), {statistics['ipis']} IPIs")
+    print(f"Shootdown cost: {statistics['shootdown_cost_ns']} ns, "
+          f"page walks: {statistics['page_walk_cost_ns']} ns")
+    return 0
+
+def command_fork(args):
+    from shared_memory import SharedMemorySimulator, prefork_workload
+
+    events = prefork_workload(args.workers, args.heap_pages, args.library_pages, args.requests,
+                              args.touches, args.write_ratio, seed=args.seed)
+    simulator = SharedMemorySimulator(args.frames, args.page_size, args.policy, seed=args.seed)
+    statistics = simulator.run(events)
+
+    if args.json:
+        print(json.dumps(statistics, indent=2))
+        return 0
+
+    print(f"Processes: {statistics['processes']} ({statistics['forks']} forks)")
+    print(f"Page faults: {statistics['page_faults']} ({statistics['minor_faults']} minor, "
+          f"{statistics['major_faults']} major), fault ratio {statistics['fault_ratio']:.2%}")
+    print(f"COW faults: {statistics['cow_faults']} ({statistics['cow_copies']} copies), "
+          f"{statistics['cow_fault_time_ns'] / 1e6:.2f} ms")
+    print(f"Memory saved by sharing: {statistics['bytes_saved'] / 2**20:.1f} MiB now, "
+          f"{statistics['peak_bytes_saved'] / 2**20:.1f} MiB at peak")
+    return 0
+
+def command_hugepages(args):
+    from huge_pages import HugePageSimulator, format_size, parse_size
+
+    reference_string = load_reference_string(args)
+    huge_page_sizes = [parse_size(size) for size in args.huge_sizes.split(',') if size.strip()]
+    tlb_entries = [int(entries) for entries in args.tlb_entries.split(',')]
+
+    results = {}
+    for thp in args.thp.split(','):
+        simulator = HugePageSimulator(args.frames, args.page_size, huge_page_sizes, args.policy, thp.strip(),
+                                      args.threshold, not args.no_demote, tlb_entries)
+        results[simulator.thp] = simulator.run(reference_string)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'THP':<9}{'Faults':>9}{'TLB Hit':>9}{'Avg Reach':>11}{'Bloat':>10}{'Peak Bloat':>12}"
+          f"{'Promoted':>10}{'Demoted':>9}")
+    for thp, stats in results.items():
+        print(f"{thp:<9}{stats['page_faults']:>9}{stats['tlb_hit_ratio']:>9.2%}"
+              f"{format_size(int(stats['average_tlb_reach_bytes']) // 1024 * 1024):>11}"
+              f"{format_size(stats['internal_fragmentation_bytes']):>10}"
+              f"{format_size(stats['peak_internal_fragmentation_bytes']):>12}"
+              f"{stats['promotions']:>10}{stats['demotions']:>9}")
+    return 0
+
+def command_anomalies(args):
+    from analysis import random_traces, scan_traces
+
+    traces = {path: read_trace(path) for path in args.traces}
+    if args.ref:
+        traces['ref'] = [int(x.strip()) for x in args.ref.split(',')]
+    if args.generate:
+        traces.update(random_traces(args.generate, args.length, args.max_page, args.seed))
+    if not traces:
+        raise SystemExit("error: give trace files, --ref or --generate")
+
+    frame_counts = parse_frame_range(args.frames)
+    report = scan_traces(traces, frame_counts, args.algorithms.split(','), args.workers, args.seed)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"Scanned {report['traces']} traces over {frame_counts[0]}-{frame_counts[-1]} frames")
+    print(f"Belady anomalies in {report['traces_with_anomalies']} traces:")
+    for name, result in report['results'].items():
+        for algorithm, anomalies in result['anomalies'].items():
+            for anomaly in anomalies:
+                print(f"  {name} {algorithm}: {anomaly['frames']} -> {anomaly['more_frames']} frames, "
+                      f"{anomaly['faults']} -> {anomaly['more_faults']} faults")
+
+    pairs = {}
+    for name, result in report['results'].items():
+        for crossover in result['crossovers']:
+            counts = pairs.setdefault(' vs '.join(crossover['algorithms']), [0, set()])
+            counts[0] += 1
+            counts[1].add(name)
+    print(f"Policy crossovers in {report['traces_with_crossovers']} traces:")
+    for pair, (crossovers, traces_crossing) in pairs.items():
+        print(f"  {pair}: {crossovers} crossovers in {len(traces_crossing)} traces")
+    return 0
+
+def command_import(args):
+    from trace_import import import_trace
+
+    statistics = import_trace(args.input, args.output, format=args.format, page_size=args.page_size,
+                              base=args.base, kinds=args.kinds.upper(),
+                              collapse_repeats=args.collapse_repeats)
+
+    if args.json:
+        print(json.dumps(statistics, indent=2))
+    else:
+        print(f"Imported {statistics['references']} references ({statistics['format']}) "
+              f"into {statistics['output_path']}")
+        print(f"  Lines: {statistics['lines']} ({statistics['skipped_lines']} skipped)")
+        print(f"  Throughput: {statistics['throughput_mb_s']:.1f} MB/s")
+    return 0
+
+def make_cache(args):
+    if args.no_cache:
+        return None
+    from result_cache import ResultCache
+    return ResultCache(args.cache_dir)
+
+def cached_statistics(reference_string, num_frames, page_size, algorithm, cache, digest=None):
+    if cache is not None:
+        return cache.get_or_run(reference_string, num_frames, page_size, algorithm, digest=digest)
+    return run_simulation(reference_string, num_frames, page_size, algorithm).get_statistics()
+
+def print_statistics(results, as_json=False):
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for algorithm, stats in results.items():
+        print(f"{algorithm}:")
+        print(f"  Total Accesses: {stats['total_accesses']}")
+        print(f"  Page Faults: {stats['page_faults']}")
+        print(f"  Hit Ratio: {stats['hit_ratio']:.2%}")
+        print(f"  Fault Ratio: {stats['fault_ratio']:.2%}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="run.py", description="Virtual memory simulator (headless)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(sub):
+        sub.add_argument("--trace", help="file with page numbers separated by commas or whitespace")
+        sub.add_argument("--ref", help="inline reference string, e.g. 1,2,3,4,1,2,5")
+        sub.add_argument("--page-size", type=int, default=1024)
+        sub.add_argument("--json", action="store_true", help="print results as JSON")
+
+    def add_cache(sub):
+        sub.add_argument("--no-cache", action="store_true", help="always re-run simulations")
+        sub.add_argument("--cache-dir", help="result cache directory")
+
+    run_parser = subparsers.add_parser("run", help="run a single simulation")
+    add_common(run_parser)
+    run_parser.add_argument("--frames", type=int, default=4)
+    run_parser.add_argument("--algorithm", choices=ALGORITHMS, default="FIFO")
+    run_parser.add_argument("--output", help="save results (.vmr, .npz or .json)")
+    run_parser.add_argument("--log", help="stream step events to an NDJSON file")
+    run_parser.add_argument("--log-interval", type=int, help="aggregate log events per N steps")
+    run_parser.add_argument("--seed", type=int, help="seed for RANDOM replacement (logged with --log)")
+    run_parser.set_defaults(handler=command_run)
+
+    sweep_parser = subparsers.add_parser("sweep", help="sweep frame counts and algorithms")
+    add_common(sweep_parser)
+    add_cache(sweep_parser)
+    sweep_parser.add_argument("--frames", default="1-16", help="frame count or range, e.g. 1-64:4")
+    sweep_parser.add_argument("--algorithms", default="FIFO,LRU,OPTIMAL,CLOCK")
+    sweep_parser.set_defaults(handler=command_sweep)
+
+    report_parser = subparsers.add_parser("report", help="compare algorithms at one frame count")
+    add_common(report_parser)
+    add_cache(report_parser)
+    report_parser.add_argument("--frames", type=int, default=4)
+    report_parser.add_argument("--algorithms", default="FIFO,LRU,OPTIMAL,CLOCK")
+    report_parser.add_argument("--output", help="write the report as JSON")
+    report_parser.add_argument("--plot", help="save a comparison chart (imports matplotlib)")
+    report_parser.set_defaults(handler=command_report)
+
+    hierarchy_parser = subparsers.add_parser("hierarchy", help="simulate DRAM, compressed memory and swap tiers")
+    add_common(hierarchy_parser)
+    hierarchy_parser.add_argument("--frames", type=int, default=4, help="DRAM frames")
+    hierarchy_parser.add_argument("--numa-frames", type=int, default=0, help="NUMA-remote frames")
+    hierarchy_parser.add_argument("--compressed-pages", type=int, default=0,
+                                  help="compressed pool size in uncompressed pages")
+    hierarchy_parser.add_argument("--ratio", type=float, default=3.0, help="mean compression ratio")
+    hierarchy_parser.add_argument("--ratio-spread", type=float, default=0.0,
+                                  help="standard deviation of per-page compression ratios")
+    hierarchy_parser.add_argument("--no-swap", action="store_true", help="drop pages evicted from the last tier")
+    hierarchy_parser.add_argument("--policy", choices=ALGORITHMS, default="LRU")
+    hierarchy_parser.set_defaults(handler=command_hierarchy)
+
+    multicore_parser = subparsers.add_parser("multicore",
+                                             help="split a trace across cores with private TLBs")
+    add_common(multicore_parser)
+    multicore_parser.add_argument("--cores", type=int, default=4)
+    multicore_parser.add_argument("--frames", type=int, default=4, help="shared physical frames")
+    multicore_parser.add_argument("--algorithm", choices=ALGORITHMS, default="FIFO")
+    multicore_parser.add_argument("--tlb-entries", type=int, default=64, help="TLB entries per core")
+    multicore_parser.add_argument("--quantum", type=int, default=1,
+                                  help="references each core runs per round-robin turn")
+    multicore_parser.add_argument("--shootdown", choices=["precise", "broadcast"], default="precise",
+                                  help="interrupt only cores caching the entry, or every other core")
+    multicore_parser.add_argument("--partitions", type=int, default=1,
+                                  help="use the partitioned memory model instead of shared frames: "
+                                       "frames and page table split by page number (results differ)")
+    multicore_parser.add_argument("--workers", type=int,
+                                  help="worker processes for the TLB replay (and partitions, if any); "
+                                       "results match a serial run")
+    multicore_parser.add_argument("--seed", type=int, help="seed for RANDOM replacement")
+    multicore_parser.set_defaults(handler=command_multicore)
+
+    hugepages_parser = subparsers.add_parser("hugepages", help="compare base pages with transparent huge pages")
+    add_common(hugepages_parser)
+    hugepages_parser.set_defaults(page_size=4096)
+    hugepages_parser.add_argument("--frames", type=int, default=65536, help="memory size in base pages")
+    hugepages_parser.add_argument("--huge-sizes", default="2M,1G", help="huge page sizes, e.g. 2M or 2M,1G")
+    hugepages_parser.add_argument("--thp", default="never,always,promote",
+                                  help="THP modes to compare: never, always, promote")
+    hugepages_parser.add_argument("--threshold", type=float, default=0.5,
+                                  help="share of a region's base pages resident before promotion")
+    hugepages_parser.add_argument("--no-demote", action="store_true",
+                                  help="evict huge pages whole instead of splitting them")
+    hugepages_parser.add_argument("--tlb-entries", default="64,32,4", help="TLB entries per page size")
+    hugepages_parser.add_argument("--policy", choices=["FIFO", "LRU", "CLOCK", "RANDOM"], default="LRU")
+    hugepages_parser.set_defaults(handler=command_hugepages)
+
+    fork_parser = subparsers.add_parser("fork", help="simulate a pre-fork server with copy-on-write sharing")
+    fork_parser.add_argument("--workers", type=int, default=8, help="worker processes forked by the master")
+    fork_parser.add_argument("--frames", type=int, default=4096, help="physical frames")
+    fork_parser.add_argument("--page-size", type=int, default=4096)
+    fork_parser.add_argument("--heap-pages", type=int, default=256, help="heap pages the master warms")
+    fork_parser.add_argument("--library-pages", type=int, default=512, help="pages of the shared library")
+    fork_parser.add_argument("--requests", type=int, default=10000)
+    fork_parser.add_argument("--touches", type=int, default=16, help="pages touched per request")
+    fork_parser.add_argument("--write-ratio", type=float, default=0.1, help="share of heap touches that write")
+    fork_parser.add_argument("--policy", choices=["FIFO", "LRU", "CLOCK", "RANDOM"], default="LRU")
+    fork_parser.add_argument("--seed", type=int, default=0)
+    fork_parser.add_argument("--json", action="store_true", help="print results as JSON")
+    fork_parser.set_defaults(handler=command_fork)
+
+    anomalies_parser = subparsers.add_parser("anomalies",
+                                             help="search traces for Belady anomalies and policy crossovers")
+    anomalies_parser.add_argument("traces", nargs="*", help="trace files to scan")
+    anomalies_parser.add_argument("--ref", help="inline reference string, e.g. 1,2,3,4,1,2,5")
+    anomalies_parser.add_argument("--generate", type=int, default=0, help="also scan N random traces")
+    anomalies_parser.add_argument("--length", type=int, default=30, help="length of generated traces")
+    anomalies_parser.add_argument("--max-page", type=int, default=6, help="largest page in generated traces")
+    anomalies_parser.add_argument("--seed", type=int, default=0,
+                                  help="seed for generated traces and for RANDOM replacement")
+    anomalies_parser.add_argument("--frames", default="1-16", help="frame count range, e.g. 1-64:4")
+    anomalies_parser.add_argument("--algorithms", default="FIFO,LRU,OPTIMAL,CLOCK")
+    anomalies_parser.add_argument("--workers", type=int, help="worker processes for non-stack policies")
+    anomalies_parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    anomalies_parser.set_defaults(handler=command_anomalies)
+
+    import_parser = subparsers.add_parser("import", help="convert a memory trace to a binary .pages trace")
+    import_parser.add_argument("input", help="Valgrind Lackey output or one address per line (.gz/.zst ok)")
+    import_parser.add_argument("output", nargs="?", help="output .pages file (default: next to the input)")
+    import_parser.add_argument("--format", choices=["auto", "lackey", "addresses"], default="auto")
+    import_parser.add_argument("--page-size", type=int, default=4096, help="bytes per page (power of two)")
+    import_parser.add_argument("--base", type=int, choices=[10, 16], default=16, help="address radix")
+    import_parser.add_argument("--kinds", default="ILSM", help="Lackey access kinds to keep")
+    import_parser.add_argument("--collapse-repeats", action="store_true",
+                               help="drop consecutive references to the same page")
+    import_parser.add_argument("--json", action="store_true", help="print statistics as JSON")
+    import_parser.set_defaults(handler=command_import)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+import json
+import os
+import queue
+import threading
+import time
+
+_STOP = object()
+RECOVERY_CHUNK = 65536
+MAX_PENDING_EVENTS = 65536
+
+class EventLogWriter:
+    """Append-only NDJSON log of simulation events written by a background thread
+
+    Attach an instance to MemorySimulator.add_listener. Step events are only
+    queued on the simulation thread; serialisation and file I/O happen on the
+    writer thread. With interval=N, one aggregated record is written per N
+    steps instead of one record per step.
+
+    At most max_pending events wait in the queue. When the disk falls that
+    far behind, the simulation thread blocks on the next event until the
+    writer catches up, so memory stays bounded on long runs.
+    """
+
+    def __init__(self, path, interval=None, flush_interval=0.5, max_pending=MAX_PENDING_EVENTS):
+        self.path = path
+        self.interval = interval
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.events_written = 0
+        self.initial_size = 0
+        self.last_step = self._recover()
+
+        self._interval_start = None
+        self._interval_end = None
+        self._interval_hits = 0
+        self._interval_faults = 0
+
+        self.file = open(path, 'ab')
+        self.thread = threading.Thread(target=self._run, name="EventLogWriter", daemon=True)
+        self.thread.start()
+
+    def __call__(self, step_info):
+        step = step_info['step_number']
+
+        if self.interval is None:
+            self.queue.put(('step', step, step_info['page'], step_info['page_fault'],
+                            step_info['replaced_page'], step_info['frame_index']))
+            return
+
+        if self._interval_start is None:
+            self._interval_start = step
+        self._interval_end = step
+        if step_info['page_fault']:
+            self._interval_faults += 1
+        else:
+            self._interval_hits += 1
+
+        if step - self._interval_start + 1 >= self.interval:
+            self._emit_interval()
+
+    def write_header(self, algorithm, num_frames, page_size, seed):
+        """Record the run configuration, including the replacement seed, as the first event"""
+        self.write_event('run', algorithm=algorithm, num_frames=num_frames, page_size=page_size, seed=seed)
+
+    def write_event(self, event_type, **fields):
+        """Queue an arbitrary event, e.g. run metadata or a checkpoint marker"""
+        self.queue.put(('event', event_type, fields))
+
+    def close(self):
+        if self._interval_start is not None:
+            self._emit_interval()
+        self.queue.put(_STOP)
+        self.thread.join()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _emit_interval(self):
+        self.queue.put(('interval', self._interval_start, self._interval_end,
+                        self._interval_hits, self._interval_faults))
+        self._interval_start = None
+        self._interval_end = None
+        self._interval_hits = 0
+        self._interval_faults = 0
+
+    def _run(self):
+        last_flush = time.monotonic()
+
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self.file.flush()
+                last_flush = time.monotonic()
+                continue
+
+            if item is _STOP:
+                self.file.flush()
+                return
+
+            self.file.write(self._encode(item))
+            self.events_written += 1
+
+            if self.queue.empty() or time.monotonic() - last_flush >= self.flush_interval:
+                self.file.flush()
+                last_flush = time.monotonic()
+
+    def _encode(self, item):
+        kind = item[0]
+
+        if kind == 'step':
+            _, step, page, fault, replaced, frame = item
+            record = {'type': 'step', 'step': step, 'page': int(page), 'page_fault': fault,
+                      'replaced_page': None if replaced is None else int(replaced),
+                      'frame_index': frame}
+        elif kind == 'interval':
+            _, start, end, hits, faults = item
+            record = {'type': 'interval', 'start_step': start, 'end_step': end,
+                      'hits': hits, 'page_faults': faults}
+        else:
+            _, event_type, fields = item
+            record = dict(fields, type=event_type)
+
+        return (json.dumps(record, separators=(',', ':')) + "\n").encode()
+
+    def _recover(self):
+        """Drop a partially written last line and return the last logged step
+
+        The file is read backwards in chunks until a step or interval
+        record turns up, so large trailing records cannot hide progress.
+        """
+        if not os.path.exists(self.path):
+            return 0
+
+        with open(self.path, 'rb+') as f:
+            end = _complete_length(f)
+            f.truncate(end)
+            self.initial_size = end
+
+            for line in _reverse_lines(f, end):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('type') == 'step':
+                    return record['step']
+                if record.get('type') == 'interval':
+                    return record['end_step']
+
+        return 0
+
+def _complete_length(f):
+    """Length of a file up to and including its last newline"""
+    position = f.seek(0, os.SEEK_END)
+    while position > 0:
+        start = max(0, position - RECOVERY_CHUNK)
+        f.seek(start)
+        cut = f.read(position - start).rfind(b"\n")
+        if cut >= 0:
+            return start + cut + 1
+        position = start
+    return 0
+
+def _reverse_lines(f, end):
+    """Yield the non-empty lines before end, last first, reading backwards in chunks"""
+    position = end
+    partial = b""
+    while position > 0:
+        start = max(0, position - RECOVERY_CHUNK)
+        f.seek(start)
+        lines = (f.read(position - start) + partial).split(b"\n")
+        partial = lines[0]
+        for line in reversed(lines[1:]):
+            if line:
+                yield line
+        position = start
+    if partial:
+        yield partial
+
+def read_events(path, follow=False, poll_interval=0.5):
+    """Yield decoded events from a log, optionally waiting for new lines like tail -f"""
+    with open(path, 'rb') as f:
+        pending = b""
+        while True:
+            line = f.readline()
+            if not line:
+                if not follow:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            pending += line
+            if not pending.endswith(b"\n"):
+                continue
+
+            yield json.loads(pending)
+            pending = b""
+
+def read_header(path):
+    """Return the 'run' event at the start of a log, or None"""
+    try:
+        with open(path, 'rb') as f:
+            line = f.readline()
+    except OSError:
+        return None
+
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if record.get('type') == 'run' else None
+
+def resume_from_log(simulator, path, interval=None):
+    """Fast-forward simulator to the last logged step and keep logging to path
+
+    The prefix is replayed without events, so the log continues exactly
+    where an interrupted run stopped. The simulator is reinitialized from
+    the log's run header, so RANDOM replacement draws the same victims. A
+    header is only written to an empty log, never after existing records.
+    """
+    header = read_header(path)
+    writer = EventLogWriter(path, interval=interval)
+
+    if header is not None:
+        simulator.initialize(header['num_frames'], header['page_size'], header['algorithm'], header['seed'])
+    elif writer.initial_size == 0:
+        simulator.reset()
+        writer.write_header(simulator.algorithm, simulator.num_frames, simulator.page_size, simulator.seed)
+    elif simulator.algorithm == "RANDOM":
+        writer.close()
+        raise ValueError(f"{path} has no run header with a seed, so a RANDOM run cannot be resumed")
+    else:
+        simulator.reset()
+
+    for page in simulator.reference_string[:writer.last_step]:
+        simulator.simulate_step(page)
+
+    simulator.add_listener(writer)
+    return writer
@@ -0,0 +1,219 @@
+import random
+
+class _Node:
+    __slots__ = ('key', 'size', 'priority', 'left', 'right', 'max_size')
+
+    def __init__(self, key, size, priority):
+        self.key = key
+        self.size = size
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_size = size
+
+def _update(node):
+    best = node.size
+    if node.left is not None and node.left.max_size > best:
+        best = node.left.max_size
+    if node.right is not None and node.right.max_size > best:
+        best = node.right.max_size
+    node.max_size = best
+
+def _split(node, key):
+    """Split into (keys < key, keys >= key)"""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, key)
+    _update(node)
+    return left, node
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+class HoleTree:
+    """Treap of holes ordered by key and augmented with the largest size in each subtree
+
+    All operations are O(log n) expected. The augmentation lets first_fit
+    skip every subtree whose largest hole is too small.
+    """
+
+    def __init__(self, seed=0):
+        self.root = None
+        self.count = 0
+        self.rng = random.Random(seed)
+
+    def __len__(self):
+        return self.count
+
+    def insert(self, key, size):
+        left, right = _split(self.root, key)
+        node = _Node(key, size, self.rng.random())
+        self.root = _merge(_merge(left, node), right)
+        self.count += 1
+
+    def remove(self, key):
+        self.root = self._remove(self.root, key)
+        self.count -= 1
+
+    def _remove(self, node, key):
+        if node is None:
+            raise KeyError(key)
+        if key == node.key:
+            return _merge(node.left, node.right)
+        if key < node.key:
+            node.left = self._remove(node.left, key)
+        else:
+            node.right = self._remove(node.right, key)
+        _update(node)
+        return node
+
+    def lower_bound(self, key):
+        """Return the node with the smallest key >= key"""
+        node = self.root
+        found = None
+        while node is not None:
+            if node.key < key:
+                node = node.right
+            else:
+                found = node
+                node = node.left
+        return found
+
+    def last(self):
+        node = self.root
+        if node is None:
+            return None
+        while node.right is not None:
+            node = node.right
+        return node
+
+    def first_fit(self, size, min_key=None):
+        """Return the lowest-keyed node with key >= min_key and at least size"""
+        return self._first_fit(self.root, size, min_key)
+
+    def _first_fit(self, node, size, min_key):
+        if node is None or node.max_size < size:
+            return None
+        if min_key is not None and node.key < min_key:
+            return self._first_fit(node.right, size, min_key)
+        found = self._first_fit(node.left, size, min_key)
+        if found is not None:
+            return found
+        if node.size >= size:
+            return node
+        return self._first_fit(node.right, size, None)
+
+    def __iter__(self):
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key, node.size
+            node = node.right
+
+class FreeSpaceIndex:
+    """Free holes indexed by address (first/next fit) and by size (best/worst fit)
+
+    Neighbouring holes are found through start/end dictionaries, so
+    coalescing on free is O(1) on top of the O(log n) tree updates.
+    """
+
+    def __init__(self):
+        self.by_address = HoleTree()
+        self.by_size = HoleTree()
+        self.holes = {}       # base -> size
+        self.hole_ends = {}   # base + size -> base
+        self.free_bytes = 0
+
+    def __len__(self):
+        return len(self.holes)
+
+    def add_hole(self, base, size, coalesce=True):
+        """Return a region to the free pool, merging it with adjacent holes"""
+        if coalesce:
+            before = self.hole_ends.get(base)
+            if before is not None:
+                size += self.holes[before]
+                self._remove_hole(before)
+                base = before
+
+            after_size = self.holes.get(base + size)
+            if after_size is not None:
+                self._remove_hole(base + size)
+                size += after_size
+
+        self._insert_hole(base, size)
+        return base, size
+
+    def take(self, base, size, split=True):
+        """Allocate size bytes at the start of the hole at base; return the bytes taken"""
+        hole_size = self.holes[base]
+        self._remove_hole(base)
+
+        if not split:
+            return hole_size
+
+        if hole_size > size:
+            self._insert_hole(base + size, hole_size - size)
+        return size
+
+    def find(self, size, policy, cursor=0):
+        """Return the base of a hole of at least size chosen by policy, or None"""
+        if policy == "BEST_FIT":
+            node = self.by_size.lower_bound((size, -1))
+            return node.key[1] if node is not None else None
+
+        if policy == "WORST_FIT":
+            node = self.by_size.last()
+            return node.key[1] if node is not None and node.size >= size else None
+
+        if policy == "NEXT_FIT":
+            node = self.by_address.first_fit(size, cursor)
+            if node is None:
+                node = self.by_address.first_fit(size)
+            return node.key if node is not None else None
+
+        node = self.by_address.first_fit(size)
+        return node.key if node is not None else None
+
+    def largest_hole(self):
+        node = self.by_size.last()
+        return node.size if node is not None else 0
+
+    def iter_holes(self):
+        """Yield (base, size) in address order"""
+        return iter(self.by_address)
+
+    def clear(self):
+        self.__init__()
+
+    def _insert_hole(self, base, size):
+        self.holes[base] = size
+        self.hole_ends[base + size] = base
+        self.by_address.insert(base, size)
+        self.by_size.insert((size, base), size)
+        self.free_bytes += size
+
+    def _remove_hole(self, base):
+        size = self.holes.pop(base)
+        del self.hole_ends[base + size]
+        self.by_address.remove(base)
+        self.by_size.remove((size, base))
+        self.free_bytes -= size
@@ -0,0 +1,300 @@
+from collections import OrderedDict
+from memory_hierarchy import DRAM_LATENCY_NS, MemoryTier
+from memory_simulator import iter_pages
+
+HUGE_PAGE_SIZES = (2 * 1024 ** 2, 1024 ** 3)
+# Entries per TLB, one TLB per page size as on x86 (4K, 2M, 1G)
+DEFAULT_TLB_ENTRIES = (64, 32, 4)
+
+THP_MODES = ["never", "always", "promote"]
+HUGE_PAGE_POLICIES = ["FIFO", "LRU", "CLOCK", "RANDOM"]
+
+def format_size(size):
+    for unit, scale in (("G", 1024 ** 3), ("M", 1024 ** 2), ("K", 1024)):
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}"
+    return str(size)
+
+def parse_size(text):
+    """Parse '4096', '2M' or '1G' into bytes"""
+    scales = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    text = text.strip().upper()
+    if text[-1:] in scales:
+        return int(text[:-1]) * scales[text[-1]]
+    return int(text)
+
+class HugePageSimulator:
+    """Base pages plus transparent huge pages sharing one pool of physical memory
+
+    The trace holds base page numbers. Memory is mapped in units of one
+    page size each, named (level, index) with level 0 for base pages.
+    thp="always" maps a whole huge page on the first fault in an empty
+    region when memory is free; thp="promote" collapses a region into a
+    huge page once promote_threshold of its base pages are resident, as
+    khugepaged does, and only if that needs no reclaim. Under memory
+    pressure a huge page chosen for eviction is first demoted into the
+    next smaller pages that were actually touched, dropping the rest.
+
+    Each page size has its own LRU TLB. Internal fragmentation is the
+    untouched part of every huge page, memory that base pages would not
+    have used.
+    """
+
+    def __init__(self, num_frames, page_size=4096, huge_page_sizes=HUGE_PAGE_SIZES, policy="LRU",
+                 thp="promote", promote_threshold=0.5, demote=True, tlb_entries=DEFAULT_TLB_ENTRIES,
+                 seed=None):
+        if thp not in THP_MODES:
+            raise ValueError(f"Unknown THP mode: {thp}")
+        if policy not in HUGE_PAGE_POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        sizes = [page_size] + sorted(huge_page_sizes)
+        for smaller, larger in zip(sizes, sizes[1:]):
+            if larger % smaller:
+                raise ValueError("Each page size must be a multiple of the next smaller one")
+        if len(tlb_entries) < len(sizes):
+            raise ValueError("tlb_entries needs one entry count per page size")
+
+        self.num_frames = num_frames
+        self.page_size = page_size
+        self.sizes = sizes
+        self.pages_per_unit = [size // page_size for size in sizes]
+        self.policy = policy
+        self.thp = thp
+        self.promote_threshold = promote_threshold
+        self.demote = demote
+        self.tlb_entries = list(tlb_entries[:len(sizes)])
+        self.seed = seed
+        self.reset()
+
+    def reset(self):
+        self.memory = MemoryTier("DRAM", self.num_frames * self.page_size, DRAM_LATENCY_NS, self.policy,
+                                 seed=self.seed)
+        self.levels = len(self.sizes)
+        # members[level][region]: resident smaller units inside a region
+        self.members = [dict() for _ in range(self.levels)]
+        # touched[level][region]: touched resident base pages inside a region
+        self.touched_counts = [dict() for _ in range(self.levels)]
+        self.member_bytes = [dict() for _ in range(self.levels)]
+        self.touched = {}   # huge unit -> set of touched base pages
+        self.tlbs = [OrderedDict() for _ in range(self.levels)]
+        self.time_counter = 0
+
+        self.page_faults = 0
+        self.hits = 0
+        self.promotions = 0
+        self.demotions = 0
+        self.evictions = 0
+        self.tlb_hits = 0
+        self.tlb_misses = 0
+        self.tlb_reach = 0
+        self.tlb_reach_total = 0
+        self.huge_bytes = 0
+        self.huge_touched_pages = 0
+        self.peak_fragmentation = 0
+
+    def lookup(self, page):
+        """Return the resident unit mapping a base page, or None"""
+        for level in range(self.levels - 1, -1, -1):
+            unit = (level, page // self.pages_per_unit[level])
+            if unit in self.memory:
+                return unit
+        return None
+
+    def access(self, page):
+        self.time_counter += 1
+        unit = self.lookup(page)
+        fault = unit is None
+
+        if fault:
+            self.page_faults += 1
+            unit = self._fault_in(page)
+        else:
+            self.hits += 1
+            self.memory.touch(unit, self.time_counter)
+            if unit[0] > 0:
+                self._touch_subpage(unit, page)
+
+        tlb_hit = self._tlb_access(unit)
+        if self.thp != "never":
+            unit = self._maybe_promote(page, unit)
+
+        return {
+            'step_number': self.time_counter,
+            'page': page,
+            'page_fault': fault,
+            'page_size': self.sizes[unit[0]],
+            'tlb_hit': tlb_hit
+        }
+
+    def run(self, reference_string):
+        for page in iter_pages(reference_string):
+            self.access(page)
+        return self.get_statistics()
+
+    def internal_fragmentation(self):
+        """Bytes of huge pages whose base pages were never touched"""
+        return self.huge_bytes - self.huge_touched_pages * self.page_size
+
+    def _free_bytes(self):
+        return self.memory.capacity - self.memory.used_bytes
+
+    def _fault_in(self, page):
+        huge = (1, page // self.pages_per_unit[1]) if self.levels > 1 else None
+        if (self.thp == "always" and huge is not None and not self.members[1].get(huge[1])
+                and self._free_bytes() >= self.sizes[1]):
+            unit = huge
+        else:
+            unit = (0, page)
+            self._make_room(self.page_size)
+        self._store(unit, {page})
+        return unit
+
+    def _maybe_promote(self, page, unit):
+        """Collapse the regions around a page into huge pages once they are dense enough"""
+        for level in range(max(1, unit[0] + 1), self.levels):
+            region = page // self.pages_per_unit[level]
+            members = self.members[level].get(region)
+            if not members:
+                break
+            touched = self.touched_counts[level].get(region, 0)
+            if touched < self.promote_threshold * self.pages_per_unit[level]:
+                continue
+            if self._free_bytes() < self.sizes[level] - self.member_bytes[level][region]:
+                continue
+
+            pages = set()
+            for member in list(members):
+                pages |= self._remove(member)
+            unit = (level, region)
+            self._store(unit, pages)
+            self.memory.touch(unit, self.time_counter)
+            self.promotions += 1
+        return unit
+
+    def _make_room(self, size):
+        while self._free_bytes() < size:
+            victim = self.memory.pick_victim(self.time_counter)
+            if victim[0] > 0 and self.demote:
+                self._demote(victim)
+            else:
+                self._remove(victim)
+                self.evictions += 1
+
+    def _demote(self, unit):
+        """Split a huge page into the next smaller pages that hold touched base pages"""
+        frame = self.memory.frames[self.memory.slots[unit]]
+        load_time, last_accessed = frame.load_time, frame.last_accessed
+        level = unit[0] - 1
+        children = {}
+        for page in self._remove(unit):
+            children.setdefault(page // self.pages_per_unit[level], set()).add(page)
+
+        for index, pages in children.items():
+            child = (level, index)
+            self._store(child, pages)
+            # Split pages keep the age of the huge page they came from
+            child_frame = self.memory.frames[self.memory.slots[child]]
+            child_frame.load_time = load_time
+            child_frame.last_accessed = last_accessed
+            child_frame.reference_bit = 0
+        self.demotions += 1
+
+    def _store(self, unit, pages):
+        """Map a unit holding the given touched base pages; memory must have room"""
+        level, index = unit
+        self.memory.store(unit, self.sizes[level], self.time_counter, ())
+        base = index * self.pages_per_unit[level]
+        for upper in range(level + 1, self.levels):
+            region = base // self.pages_per_unit[upper]
+            self.members[upper].setdefault(region, set()).add(unit)
+            self.member_bytes[upper][region] = self.member_bytes[upper].get(region, 0) + self.sizes[level]
+            self.touched_counts[upper][region] = self.touched_counts[upper].get(region, 0) + len(pages)
+
+        if level > 0:
+            self.touched[unit] = set(pages)
+            self.huge_bytes += self.sizes[level]
+            self.huge_touched_pages += len(pages)
+            self.peak_fragmentation = max(self.peak_fragmentation, self.internal_fragmentation())
+
+    def _remove(self, unit):
+        """Unmap a unit and return the touched base pages it held"""
+        level, index = unit
+        self.memory.remove(unit)
+        pages = self.touched.pop(unit, None) if level > 0 else {index}
+        base = index * self.pages_per_unit[level]
+        for upper in range(level + 1, self.levels):
+            region = base // self.pages_per_unit[upper]
+            members = self.members[upper][region]
+            members.discard(unit)
+            self.member_bytes[upper][region] -= self.sizes[level]
+            if not members:
+                del self.members[upper][region]
+                del self.member_bytes[upper][region]
+            self.touched_counts[upper][region] -= len(pages)
+
+        if level > 0:
+            self.huge_bytes -= self.sizes[level]
+            self.huge_touched_pages -= len(pages)
+
+        if self.tlbs[level].pop(unit, None) is not None:
+            self.tlb_reach -= self.sizes[level]
+        return pages
+
+    def _touch_subpage(self, unit, page):
+        pages = self.touched[unit]
+        if page in pages:
+            return
+        pages.add(page)
+        self.huge_touched_pages += 1
+        for upper in range(unit[0] + 1, self.levels):
+            region = page // self.pages_per_unit[upper]
+            self.touched_counts[upper][region] += 1
+
+    def _tlb_access(self, unit):
+        level = unit[0]
+        tlb = self.tlbs[level]
+        hit = unit in tlb
+        if hit:
+            tlb.move_to_end(unit)
+            self.tlb_hits += 1
+        else:
+            self.tlb_misses += 1
+            tlb[unit] = True
+            self.tlb_reach += self.sizes[level]
+            if len(tlb) > self.tlb_entries[level]:
+                tlb.popitem(last=False)
+                self.tlb_reach -= self.sizes[level]
+        self.tlb_reach_total += self.tlb_reach
+        return hit
+
+    def get_statistics(self):
+        total_accesses = self.time_counter
+        tlb_lookups = self.tlb_hits + self.tlb_misses
+        used_bytes = self.memory.used_bytes
+        fragmentation = self.internal_fragmentation()
+
+        pages_by_size = {format_size(size): 0 for size in self.sizes}
+        for frame in self.memory.frames:
+            pages_by_size[format_size(self.sizes[frame.page[0]])] += 1
+
+        return {
+            'thp': self.thp,
+            'total_accesses': total_accesses,
+            'page_faults': self.page_faults,
+            'fault_ratio': self.page_faults / total_accesses if total_accesses > 0 else 0,
+            'hits': self.hits,
+            'promotions': self.promotions,
+            'demotions': self.demotions,
+            'evictions': self.evictions,
+            'tlb_hits': self.tlb_hits,
+            'tlb_misses': self.tlb_misses,
+            'tlb_hit_ratio': self.tlb_hits / tlb_lookups if tlb_lookups > 0 else 0,
+            'max_tlb_reach_bytes': sum(entries * size for entries, size in zip(self.tlb_entries, self.sizes)),
+            'average_tlb_reach_bytes': self.tlb_reach_total / total_accesses if total_accesses > 0 else 0,
+            'used_bytes': used_bytes,
+            'huge_page_bytes': self.huge_bytes,
+            'internal_fragmentation_bytes': fragmentation,
+            'fragmentation_ratio': fragmentation / used_bytes if used_bytes > 0 else 0,
+            'peak_internal_fragmentation_bytes': self.peak_fragmentation,
+            'pages_by_size': pages_by_size
+        }
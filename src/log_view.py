@@ -0,0 +1,129 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from array import array
+from tkinter import ttk
+
+NO_VALUE = -1
+
+class StepLog:
+    """Compact per-step log of a paging run, formatted into text only on demand
+
+    Steps are kept in typed arrays (about 33 bytes a step) instead of
+    strings, so multi-million-step runs stay small.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self.steps)
+
+    def clear(self):
+        self.steps = array('q')
+        self.pages = array('q')
+        self.faults = array('b')
+        self.frames = array('q')
+        self.replaced = array('q')
+
+    @staticmethod
+    def record(step_info):
+        """Reduce a step_info dict to the tuple stored by the log"""
+        frame_index = step_info['frame_index']
+        replaced_page = step_info.get('replaced_page')
+        return (step_info['step_number'], step_info['page'], step_info['page_fault'],
+                NO_VALUE if frame_index is None else frame_index,
+                NO_VALUE if replaced_page is None else replaced_page)
+
+    def append(self, step_info):
+        self.extend([self.record(step_info)])
+
+    def extend(self, records):
+        for step, page, fault, frame_index, replaced_page in records:
+            self.steps.append(step)
+            self.pages.append(page)
+            self.faults.append(fault)
+            self.frames.append(frame_index)
+            self.replaced.append(replaced_page)
+
+    def format(self, index):
+        log_entry = f"Step {self.steps[index]:02d}: Page {self.pages[index]} - "
+
+        if not self.faults[index]:
+            return log_entry + "Hit"
+
+        log_entry += "Page Fault"
+        if self.replaced[index] != NO_VALUE:
+            log_entry += f" (Replaced page {self.replaced[index]} in frame {self.frames[index]})"
+        else:
+            log_entry += f" (Loaded in frame {self.frames[index]})"
+        return log_entry
+
+    def lines(self, start, stop):
+        return [self.format(index) for index in range(start, stop)]
+
+class LogView(ttk.Frame):
+    """Scrollable view of a StepLog that only formats the rows on screen
+
+    The Text widget holds just the visible lines and the scrollbar is
+    driven by row numbers, so scrolling and refreshing cost the same for
+    a log of ten steps or ten million.
+    """
+
+    def __init__(self, parent, log, width=35, height=15, font=('Consolas', 9)):
+        super().__init__(parent)
+        self.log = log
+        self.first = 0
+        self.follow = True
+        self.line_height = max(1, tkfont.Font(font=font).metrics('linespace'))
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text = tk.Text(self, width=width, height=height, font=font, wrap=tk.NONE,
+                            state=tk.DISABLED)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.text.bind('<Configure>', lambda event: self.refresh())
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.text.bind(sequence, self._on_wheel)
+
+    def visible_rows(self):
+        return max(1, self.text.winfo_height() // self.line_height)
+
+    def refresh(self):
+        total = len(self.log)
+        rows = self.visible_rows()
+        if self.follow:
+            self.first = max(0, total - rows)
+        self.first = max(0, min(self.first, total - rows))
+        stop = min(total, self.first + rows)
+
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, '\n'.join(self.log.lines(self.first, stop)))
+        self.text.configure(state=tk.DISABLED)
+
+        if total:
+            self.scrollbar.set(self.first / total, stop / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, first):
+        rows = self.visible_rows()
+        last_first = max(0, len(self.log) - rows)
+        self.first = max(0, min(int(first), last_first))
+        self.follow = self.first >= last_first
+        self.refresh()
+
+    def _on_scrollbar(self, action, *args):
+        if action == tk.MOVETO:
+            self.scroll_to(float(args[0]) * len(self.log))
+        elif action == tk.SCROLL:
+            amount = int(args[0])
+            if args[1] == tk.PAGES:
+                amount *= self.visible_rows()
+            self.scroll_to(self.first + amount)
+
+    def _on_wheel(self, event):
+        up = event.num == 4 or event.delta > 0
+        self.scroll_to(self.first + (-3 if up else 3))
+        return 'break'
@@ -1,15 +1,52 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
 import random
 from collections import deque
 import time
-from memory_simulator import MemorySimulator
+from memory_simulator import MemorySimulator, trace_digest
 from algorithms import PageReplacementAlgorithms
 from visualization import MemoryVisualizer
-from segmentation import SegmentationSimulator, SegmentationVisualizer
+from segmentation import SegmentationSimulator, SegmentationVisualizer, PLACEMENT_POLICIES
+from result_cache import ResultCache
+from background import BackgroundTask
+from log_view import StepLog, LogView
+
+# How often a worker hands finished steps to the GUI
+PROGRESS_INTERVAL = 0.05
+
+# Auto play ticks at about display refresh rate and renders once per tick;
+# each tick simulates the steps that fell due, within a time budget that
+# grows with the redraw cost so rendering never takes more than a quarter
+AUTO_PLAY_TICK_MS = 16
+AUTO_PLAY_BUDGET = 0.03
+AUTO_PLAY_RENDER_SHARE = 0.25
+AUTO_PLAY_MAX_LAG = 0.25
+MAX_SPEED_EXPONENT = 6
+
+def auto_play_due(due, rate, elapsed):
+    """Steps owed after elapsed seconds at rate steps/s
+
+    Slow redraws may delay a tick, but never bank more than a short burst
+    of steps.
+    """
+    return min(due + rate * elapsed, rate * AUTO_PLAY_MAX_LAG + 1)
+
+def auto_play_budget(render_time):
+    """Seconds a tick may simulate so that rendering takes at most its share of the tick"""
+    return max(AUTO_PLAY_BUDGET, render_time * (1 - AUTO_PLAY_RENDER_SHARE) / AUTO_PLAY_RENDER_SHARE)
+
+def simulate_steps(simulator, start, count, deadline):
+    """StepLog records of up to count steps from start, stopping early at the deadline"""
+    reference_string = simulator.reference_string
+    records = []
+    for i in range(count):
+        records.append(StepLog.record(simulator.simulate_step(reference_string[start + i])))
+        if i % 256 == 255 and time.monotonic() >= deadline:
+            break
+    return records
 
 class VirtualMemoryGUI:
     def __init__(self, root):
@@ -23,10 +60,16 @@ class VirtualMemoryGUI:
         self.visualizer = MemoryVisualizer()
         self.seg_simulator = SegmentationSimulator()
         self.seg_visualizer = SegmentationVisualizer()
+        self.result_cache = None  # created on first comparison, see get_result_cache
         
         # Current step tracking
         self.current_step = 0
         self.auto_play = False
+        self.auto_play_due = 0.0
+        self.auto_play_last = 0.0
+        self.render_time = 0.0
+        self.task = None
+        self.step_log = StepLog()
         
         self.setup_gui()
         self.apply_initial_config()
@@ -80,6 +123,15 @@ class VirtualMemoryGUI:
                                  values=algorithms, state="readonly", width=12)
         algo_combo.grid(row=0, column=5, padx=(0, 20))
         
+        # Auto play speed, log scale from 1 to 1e6 steps per second
+        ttk.Label(top_frame, text="Speed:").grid(row=0, column=6, sticky=tk.W, padx=(0, 10))
+        self.speed_var = tk.DoubleVar(value=0.0)
+        ttk.Scale(top_frame, from_=0, to=MAX_SPEED_EXPONENT, variable=self.speed_var,
+                  command=self.update_speed_label, length=150).grid(row=0, column=7, padx=(0, 10))
+        self.speed_label_var = tk.StringVar()
+        ttk.Label(top_frame, textvariable=self.speed_label_var, width=16).grid(row=0, column=8, sticky=tk.W)
+        self.update_speed_label()
+        
         # Middle control row
         mid_frame = ttk.Frame(control_frame)
         mid_frame.pack(fill=tk.X, pady=5)
@@ -119,6 +171,17 @@ class VirtualMemoryGUI:
         
         button_frame.columnconfigure(tuple(range(len(buttons))), weight=1)
         
+        # Progress of Run All / Compare Algorithms running in the background
+        progress_frame = ttk.Frame(control_frame)
+        progress_frame.pack(fill=tk.X)
+        
+        self.progress_var = tk.StringVar(value="Idle")
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate')
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+        ttk.Label(progress_frame, textvariable=self.progress_var, width=24).pack(side=tk.LEFT, padx=(0, 10))
+        self.cancel_button = ttk.Button(progress_frame, text="Cancel", command=self.cancel_task, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT)
+        
         # Paging visualization
         viz_frame = ttk.LabelFrame(paging_frame, text="Paging Visualization", padding="10")
         viz_frame.pack(fill=tk.BOTH, expand=True)
@@ -126,6 +189,11 @@ class VirtualMemoryGUI:
         # Create matplotlib figure for paging
         self.fig = Figure(figsize=(10, 6), dpi=100)
         self.canvas = FigureCanvasTkAgg(self.fig, viz_frame)
+        
+        # Zooming in on long reference strings or large frame grids reveals per-item detail
+        toolbar = NavigationToolbar2Tk(self.canvas, viz_frame, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(side=tk.BOTTOM, fill=tk.X)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
     def setup_segmentation_tab(self):
@@ -145,6 +213,16 @@ class VirtualMemoryGUI:
         ttk.Button(seg_control_frame, text="Initialize Segments", 
                   command=self.initialize_segments).grid(row=0, column=2, padx=5)
         
+        # Placement policy and partitioning mode
+        ttk.Label(seg_control_frame, text="Placement:").grid(row=2, column=0, sticky=tk.W)
+        self.placement_var = tk.StringVar(value="FIRST_FIT")
+        ttk.Combobox(seg_control_frame, textvariable=self.placement_var,
+                     values=PLACEMENT_POLICIES, state="readonly", width=12).grid(row=2, column=1, sticky=tk.W, padx=5)
+        
+        self.dynamic_partitions_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(seg_control_frame, text="Variable-size partitions",
+                        variable=self.dynamic_partitions_var).grid(row=2, column=2, padx=5)
+        
         # Process allocation
         ttk.Label(seg_control_frame, text="Process Requirements (name:size):").grid(row=1, column=0, sticky=tk.W, pady=5)
         self.process_req_var = tk.StringVar(value="Code:32,Data:64,Stack:16")
@@ -156,6 +234,17 @@ class VirtualMemoryGUI:
         ttk.Button(seg_control_frame, text="Deallocate All", 
                   command=self.deallocate_all).grid(row=1, column=3, padx=5, pady=5)
         
+        # Per-process deallocation and compaction
+        ttk.Label(seg_control_frame, text="Process ID:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        self.dealloc_pid_var = tk.StringVar(value="1")
+        ttk.Entry(seg_control_frame, textvariable=self.dealloc_pid_var, width=8).grid(row=3, column=1, sticky=tk.W, padx=5, pady=5)
+        
+        ttk.Button(seg_control_frame, text="Deallocate Process", 
+                  command=self.deallocate_process).grid(row=3, column=2, padx=5, pady=5)
+        
+        ttk.Button(seg_control_frame, text="Compact Memory", 
+                  command=self.compact_memory).grid(row=3, column=3, padx=5, pady=5)
+        
         # Segmentation visualization
         seg_viz_frame = ttk.LabelFrame(segmentation_frame, text="Segmentation Visualization", padding="10")
         seg_viz_frame.pack(fill=tk.BOTH, expand=True)
@@ -176,9 +265,9 @@ class VirtualMemoryGUI:
         history_frame = ttk.LabelFrame(parent, text="Simulation History", padding="10")
         history_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Create text widget for history
-        self.history_text = scrolledtext.ScrolledText(history_frame, width=35, height=15, font=('Consolas', 9))
-        self.history_text.pack(fill=tk.BOTH, expand=True)
+        # Only the visible rows of the step log are ever formatted
+        self.history_view = LogView(history_frame, self.step_log, width=35, height=15, font=('Consolas', 9))
+        self.history_view.pack(fill=tk.BOTH, expand=True)
         
     def apply_initial_config(self):
         self.apply_config()
@@ -193,6 +282,8 @@ class VirtualMemoryGUI:
             messagebox.showerror("Error", "Invalid max page or length value!")
             
     def apply_config(self):
+        if self.task_running():
+            return
         try:
             num_frames = int(self.frames_var.get())
             page_size = int(self.page_size_var.get())
@@ -212,9 +303,14 @@ class VirtualMemoryGUI:
     def initialize_segments(self):
         try:
             sizes = [int(x.strip()) for x in self.seg_sizes_var.get().split(',')]
-            total_memory = sum(sizes) * 2  # Double for visualization space
-            self.seg_simulator = SegmentationSimulator(total_memory)
-            self.seg_simulator.initialize_segments(sizes)
+            placement = self.placement_var.get()
+            if self.dynamic_partitions_var.get():
+                # Variable-size partitions: the sizes only define the memory pool
+                self.seg_simulator = SegmentationSimulator(sum(sizes), placement)
+            else:
+                total_memory = sum(sizes) * 2  # Double for visualization space
+                self.seg_simulator = SegmentationSimulator(total_memory, placement)
+                self.seg_simulator.initialize_segments(sizes)
             self.update_segmentation_display()
             messagebox.showinfo("Success", f"Segments initialized: {sizes}")
         except ValueError:
@@ -227,7 +323,7 @@ class VirtualMemoryGUI:
                 name, size = req.split(':')
                 requirements[name.strip()] = int(size.strip())
             
-            process_id = len(self.seg_simulator.segment_table) // 3 + 1
+            process_id = max(self.seg_simulator.process_segments, default=0) + 1
             allocations = self.seg_simulator.allocate_process(process_id, requirements)
             
             if allocations:
@@ -240,20 +336,47 @@ class VirtualMemoryGUI:
             messagebox.showerror("Error", f"Invalid process requirements: {e}")
             
     def deallocate_all(self):
-        self.seg_simulator = SegmentationSimulator(self.seg_simulator.total_memory)
-        sizes = [int(x.strip()) for x in self.seg_sizes_var.get().split(',')]
-        self.seg_simulator.initialize_segments(sizes)
+        for process_id in list(self.seg_simulator.process_segments):
+            self.seg_simulator.deallocate_process(process_id)
         self.update_segmentation_display()
         messagebox.showinfo("Success", "All processes deallocated!")
+        
+    def deallocate_process(self):
+        try:
+            process_id = int(self.dealloc_pid_var.get())
+        except ValueError:
+            messagebox.showerror("Error", "Invalid process ID!")
+            return
+            
+        freed = self.seg_simulator.deallocate_process(process_id)
+        self.update_segmentation_display()
+        if freed:
+            messagebox.showinfo("Success", f"Process {process_id}: {freed} segments deallocated")
+        else:
+            messagebox.showwarning("Warning", f"Process {process_id} has no allocated segments!")
+            
+    def compact_memory(self):
+        if self.seg_simulator.fixed_partitions:
+            messagebox.showwarning("Warning", "Fixed partitions cannot be compacted!")
+            return
+            
+        moved = self.seg_simulator.compact()
+        self.update_segmentation_display()
+        messagebox.showinfo("Success", f"Memory compacted: {moved}KB moved")
             
     def reset_simulation(self):
+        if self.task_running():
+            return
         self.simulator.reset()
         self.current_step = 0
         self.auto_play = False
         self.update_display()
-        self.history_text.delete(1.0, tk.END)
+        self.step_log.clear()
+        self.history_view.refresh()
         
     def step_forward(self):
+        if self.task_running():
+            return
         if self.current_step < len(self.simulator.reference_string):
             page = self.simulator.reference_string[self.current_step]
             step_info = self.simulator.simulate_step(page)
@@ -264,55 +387,183 @@ class VirtualMemoryGUI:
             messagebox.showinfo("Simulation Complete", "All steps have been executed!")
             
     def run_all(self):
+        if self.task_running():
+            return
         self.reset_simulation()
         total_steps = len(self.simulator.reference_string)
         
-        for i in range(total_steps):
-            page = self.simulator.reference_string[i]
-            step_info = self.simulator.simulate_step(page)
-            self.log_step(step_info)
+        # The worker runs its own copy of the freshly reset simulator, which
+        # replaces the GUI's one on the Tk thread once the task ends
+        simulator = MemorySimulator()
+        simulator.initialize(self.simulator.num_frames, self.simulator.page_size,
+                             self.simulator.algorithm, self.simulator.seed)
+        simulator.set_reference_string(self.simulator.reference_string)
+        simulator.record_history = self.simulator.record_history
+        
+        def work(task):
+            batch = []
+            last_post = time.monotonic()
+            for page in simulator.reference_string:
+                batch.append(StepLog.record(simulator.simulate_step(page)))
+                if len(batch) % 256 == 0 and time.monotonic() - last_post >= PROGRESS_INTERVAL:
+                    task.post('steps', batch)
+                    task.check_cancelled()
+                    batch = []
+                    last_post = time.monotonic()
+            task.post('steps', batch)
+            return total_steps
+        
+        def on_message(kind, batch):
+            self.step_log.extend(batch)
+            self.history_view.refresh()
+            self.show_progress(len(self.step_log), total_steps, "steps")
+            
+        def on_done(result):
+            self.finish_run(simulator)
+            messagebox.showinfo("Simulation Complete", f"Executed all {total_steps} steps!")
             
-        self.current_step = total_steps
+        # A cancelled run keeps its partial state so stepping can continue from there
+        self.start_task(work, total_steps, on_message, on_done, on_cancel=lambda: self.finish_run(simulator))
+        
+    def finish_run(self, simulator):
+        self.simulator = simulator
+        self.current_step = simulator.time_counter
+        self.history_view.refresh()
         self.update_display()
-        messagebox.showinfo("Simulation Complete", f"Executed all {total_steps} steps!")
+        
+    def start_task(self, work, total, on_message=None, on_done=None, on_cancel=None):
+        self.progress_bar.configure(maximum=max(total, 1), value=0)
+        self.progress_var.set("Running...")
+        self.cancel_button.configure(state=tk.NORMAL)
+        
+        def finished(callback, status):
+            def handler(*args):
+                self.task = None
+                self.cancel_button.configure(state=tk.DISABLED)
+                self.progress_var.set(status)
+                if callback is not None:
+                    callback(*args)
+            return handler
+        
+        def show_error(error):
+            messagebox.showerror("Error", f"Background task failed: {error}")
+        
+        self.task = BackgroundTask(self.root, work, on_message=on_message,
+                                   on_done=finished(on_done, "Done"),
+                                   on_cancel=finished(on_cancel, "Cancelled"),
+                                   on_error=finished(show_error, "Failed")).start()
+        
+    def show_progress(self, done, total, unit):
+        self.progress_bar.configure(value=done)
+        self.progress_var.set(f"{done:,} / {total:,} {unit}")
+        
+    def cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.progress_var.set("Cancelling...")
+        
+    def task_running(self):
+        if self.task is not None:
+            messagebox.showwarning("Busy", "Wait for the running task to finish or cancel it.")
+            return True
+        return False
         
     def toggle_auto_play(self):
+        if self.task_running():
+            return
         self.auto_play = not self.auto_play
         if self.auto_play:
+            self.auto_play_due = 1.0  # first step right away
+            self.auto_play_last = time.monotonic()
             self.auto_play_step()
             
+    def steps_per_second(self):
+        return 10 ** self.speed_var.get()
+        
+    def update_speed_label(self, *args):
+        rate = self.steps_per_second()
+        self.speed_label_var.set(f"{rate:,.0f} steps/s" if rate >= 10 else f"{rate:.1f} steps/s")
+            
     def auto_play_step(self):
-        if self.auto_play and self.current_step < len(self.simulator.reference_string):
-            self.step_forward()
-            self.root.after(1000, self.auto_play_step)  # 1 second delay
+        remaining = len(self.simulator.reference_string) - self.current_step
+        if not self.auto_play or remaining <= 0:
+            self.auto_play = False
+            return
+        
+        now = time.monotonic()
+        self.auto_play_due = auto_play_due(self.auto_play_due, self.steps_per_second(), now - self.auto_play_last)
+        self.auto_play_last = now
+        
+        steps = min(int(self.auto_play_due), remaining)
+        delay = AUTO_PLAY_TICK_MS
+        if steps > 0:
+            executed = self.run_steps(steps, now + auto_play_budget(self.render_time))
+            if executed < steps:
+                # Behind the target rate: drop the backlog and tick again as soon as Tk is idle
+                self.auto_play_due = 0.0
+                delay = 1
+            else:
+                self.auto_play_due -= executed
+            
+            started = time.monotonic()
+            self.history_view.refresh()
+            self.update_display()
+            self.render_time = time.monotonic() - started
+            
+        self.root.after(delay, self.auto_play_step)
+        
+    def run_steps(self, count, deadline):
+        """Simulate up to count steps, stopping early at the deadline; return the steps run"""
+        records = simulate_steps(self.simulator, self.current_step, count, deadline)
+        self.current_step += len(records)
+        self.step_log.extend(records)
+        return len(records)
             
     def compare_algorithms(self):
+        if self.task_running():
+            return
         if not self.simulator.reference_string:
             messagebox.showwarning("Warning", "Please set a reference string first!")
             return
             
         algorithms = ["FIFO", "LRU", "OPTIMAL", "CLOCK"]
-        results = {}
-        
-        original_algorithm = self.simulator.algorithm
-        
-        for algo in algorithms:
-            # Create temporary simulator for comparison
-            temp_simulator = MemorySimulator()
-            temp_simulator.initialize(
-                int(self.frames_var.get()),
-                int(self.page_size_var.get()),
-                algo
-            )
-            temp_simulator.set_reference_string(self.simulator.reference_string)
-            
-            # Run complete simulation
-            for page in temp_simulator.reference_string:
-                temp_simulator.simulate_step(page)
+        reference_string = list(self.simulator.reference_string)
+        total_steps = len(reference_string) * len(algorithms)
+        
+        num_frames = int(self.frames_var.get())
+        page_size = int(self.page_size_var.get())
+        self.auto_play = False
+        
+        result_cache = self.get_result_cache()
+        
+        def work(task):
+            results = {}
+            digest = trace_digest(reference_string)
+            for index, algo in enumerate(algorithms):
+                offset = index * len(reference_string)
                 
-            stats = temp_simulator.get_statistics()
-            results[algo] = stats
-            
+                def listener(step_info):
+                    if step_info['step_number'] % 1024 == 0:
+                        task.check_cancelled()
+                        task.post('progress', offset + step_info['step_number'])
+                
+                results[algo] = result_cache.get_or_run(
+                    reference_string, num_frames, page_size, algo, listener=listener, digest=digest)
+                task.post('progress', offset + len(reference_string))
+            return results
+        
+        def on_message(kind, done):
+            self.show_progress(done, total_steps, "steps")
+        
+        self.start_task(work, total_steps, on_message, on_done=self.show_comparison)
+        
+    def get_result_cache(self):
+        # The cache directory is only created once a comparison needs it
+        if self.result_cache is None:
+            self.result_cache = ResultCache()
+        return self.result_cache
+        
+    def show_comparison(self, results):
         # Display comparison results
         comparison_window = tk.Toplevel(self.root)
         comparison_window.title("Algorithm Comparison")
@@ -331,37 +582,17 @@ class VirtualMemoryGUI:
             text_widget.insert(tk.END, f"  Fault Ratio: {stats['fault_ratio']:.2%}\n\n")
             
     def log_step(self, step_info):
-        timestamp = f"Step {step_info['step_number']:02d}"
-        page = step_info['page']
-        action = step_info['action']
-        
-        log_entry = f"{timestamp}: Page {page} - {action}"
-        
-        if step_info['page_fault']:
-            if step_info.get('replaced_page') is not None:
-                log_entry += f" (Replaced page {step_info['replaced_page']} in frame {step_info['frame_index']})"
-            else:
-                log_entry += f" (Loaded in frame {step_info['frame_index']})"
-                
-        log_entry += "\n"
-        
-        self.history_text.insert(tk.END, log_entry)
-        self.history_text.see(tk.END)
+        self.step_log.append(step_info)
+        self.history_view.refresh()
         
     def update_display(self):
-        # Clear previous figure
-        self.fig.clear()
-        
-        # Update visualization
-        self.visualizer.plot_memory_state(self.fig, self.simulator)
+        # Redraw only the parts of the visualization that changed
+        self.visualizer.render(self.fig, self.canvas, self.simulator)
         
         # Update statistics
         stats = self.simulator.get_statistics()
         self.update_statistics_display(stats)
         
-        # Refresh canvas
-        self.canvas.draw()
-        
     def update_segmentation_display(self):
         self.seg_fig.clear()
         self.seg_visualizer.plot_segmentation_memory(self.seg_fig, self.seg_simulator)
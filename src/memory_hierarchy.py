@@ -0,0 +1,318 @@
+import math
+import random
+from algorithms import PageReplacementAlgorithms
+from memory_simulator import MemoryFrame, iter_pages
+
+# Typical access and store costs in nanoseconds
+DRAM_LATENCY_NS = 100
+NUMA_REMOTE_LATENCY_NS = 250
+COMPRESSED_LATENCY_NS = 3000      # decompress one page
+COMPRESS_STORE_LATENCY_NS = 6000  # compress one page on demotion
+SWAP_LATENCY_NS = 100000          # read one page from an SSD swap device
+SWAP_STORE_LATENCY_NS = 100000    # write one page to it on swap-out
+
+TIER_POLICIES = ["FIFO", "LRU", "OPTIMAL", "CLOCK", "RANDOM"]
+
+class CompressionModel:
+    """Compressed size of each page from a per-page compression ratio
+
+    Ratios are drawn once per page from a normal distribution around
+    ratio (spread=0 makes every page compress alike). Pages whose ratio
+    is below min_ratio are rejected as incompressible, like zswap does,
+    and skip the compressed tier.
+    """
+
+    def __init__(self, ratio=3.0, spread=0.0, min_ratio=1.0, seed=0):
+        if ratio < 1:
+            raise ValueError("compression ratio must be at least 1")
+        self.ratio = ratio
+        self.spread = spread
+        self.min_ratio = min_ratio
+        self.rng = random.Random(seed)
+        self.ratios = {}
+
+    def page_ratio(self, page):
+        ratio = self.ratios.get(page)
+        if ratio is None:
+            ratio = self.ratio if self.spread == 0 else max(1.0, self.rng.gauss(self.ratio, self.spread))
+            self.ratios[page] = ratio
+        return ratio
+
+    def compressed_size(self, page, page_size):
+        """Bytes the page takes in the pool, or None if the page is rejected"""
+        ratio = self.page_ratio(page)
+        if ratio < self.min_ratio:
+            return None
+        return math.ceil(page_size / ratio)
+
+class MemoryTier:
+    """One level of the hierarchy, holding whole pages up to a byte capacity
+
+    Resident pages are kept in MemoryFrame objects so that the usual
+    PageReplacementAlgorithms pick victims. With a compression model each
+    page takes its compressed size instead of a full page. capacity=None
+    means unlimited, e.g. a swap device that never fills.
+    """
+
+    def __init__(self, name, capacity, latency, policy="LRU", store_latency=0, compression=None, seed=None):
+        if policy not in TIER_POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        self.name = name
+        self.capacity = capacity
+        self.latency = latency
+        self.policy = policy
+        self.store_latency = store_latency
+        self.compression = compression
+        self.seed = seed
+        self.reset()
+
+    def reset(self):
+        self.frames = []
+        self.slots = {}   # page -> index in frames
+        self.sizes = {}   # page -> bytes used
+        self.used_bytes = 0
+        self.algorithm_handler = PageReplacementAlgorithms(self.seed)
+
+        self.hits = 0
+        self.demotions = 0
+        self.promotions = 0
+        self.evictions = 0
+        self.rejected = 0
+
+    def __contains__(self, page):
+        return page in self.slots
+
+    def __len__(self):
+        return len(self.frames)
+
+    def stored_size(self, page, page_size):
+        """Bytes the page would take here, or None if the tier cannot hold it"""
+        size = page_size
+        if self.compression is not None:
+            size = self.compression.compressed_size(page, page_size)
+        if size is None or (self.capacity is not None and size > self.capacity):
+            return None
+        return size
+
+    def touch(self, page, timestamp):
+        self.frames[self.slots[page]].access(timestamp)
+
+    def store(self, page, size, timestamp, reference_string):
+        """Add a page, evicting victims until it fits; return the evicted pages"""
+        evicted = []
+
+        while self.capacity is not None and self.used_bytes + size > self.capacity:
+            index = self._select_victim(timestamp, reference_string)
+            victim = self.frames[index]
+            evicted.append(victim.page)
+            self.evictions += 1
+            self.used_bytes -= self.sizes.pop(victim.page)
+            del self.slots[victim.page]
+
+            if self.used_bytes + size <= self.capacity:
+                # Reuse the victim's frame in place, as MemorySimulator does
+                victim.deallocate()
+                victim.allocate(page, timestamp)
+                self._track(page, size, index)
+                return evicted
+
+            self._remove_at(index)
+
+        frame = MemoryFrame(len(self.frames))
+        frame.allocate(page, timestamp)
+        self.frames.append(frame)
+        self._track(page, size, len(self.frames) - 1)
+        return evicted
+
+    def remove(self, page):
+        index = self.slots.pop(page)
+        self.used_bytes -= self.sizes.pop(page)
+        self._remove_at(index)
+
+    def pick_victim(self, timestamp, reference_string=()):
+        """Page the replacement policy would evict next from a full tier"""
+        return self.frames[self._select_victim(timestamp, reference_string)].page
+
+    def _track(self, page, size, index):
+        self.slots[page] = index
+        self.sizes[page] = size
+        self.used_bytes += size
+
+    def _remove_at(self, index):
+        """Drop a frame by moving the last frame into its place"""
+        last = self.frames.pop()
+        if index < len(self.frames):
+            self.frames[index] = last
+            self.slots[last.page] = index
+        if self.algorithm_handler.clock_pointer >= len(self.frames):
+            self.algorithm_handler.clock_pointer = 0
+
+    def _select_victim(self, timestamp, reference_string):
+        handler = self.algorithm_handler
+        if self.policy == "FIFO":
+            return handler.fifo(self.frames)
+        elif self.policy == "LRU":
+            return handler.lru(self.frames)
+        elif self.policy == "OPTIMAL":
+            return handler.optimal(self.frames, reference_string, timestamp)
+        elif self.policy == "CLOCK":
+            return handler.clock(self.frames, timestamp)
+        else:
+            return handler.random_replacement(self.frames)
+
+    def get_statistics(self, page_size):
+        resident_bytes = len(self.frames) * page_size
+        return {
+            'name': self.name,
+            'policy': self.policy,
+            'capacity': self.capacity,
+            'latency_ns': self.latency,
+            'hits': self.hits,
+            'resident_pages': len(self.frames),
+            'used_bytes': self.used_bytes,
+            'effective_compression_ratio': resident_bytes / self.used_bytes if self.used_bytes > 0 else 0,
+            'demotions': self.demotions,
+            'promotions': self.promotions,
+            'evictions': self.evictions,
+            'rejected': self.rejected
+        }
+
+class MemoryHierarchy:
+    """Chain of memory tiers, fastest first, with each page in at most one tier
+
+    A hit below the top tier promotes the page to the top. A tier that
+    overflows demotes its victims to the next tier down, and victims of a
+    full last tier are dropped. A page found in no tier is a cold miss
+    costing miss_latency and is loaded into the top tier. Pages a tier
+    rejects (incompressible for a compressed pool) pass straight through.
+    Storing a page in a tier costs its store_latency, charged to the
+    access whose placement caused the demotion.
+    """
+
+    def __init__(self, tiers, page_size=4096, miss_latency=SWAP_LATENCY_NS):
+        if not tiers:
+            raise ValueError("A memory hierarchy needs at least one tier")
+        self.tiers = tiers
+        self.page_size = page_size
+        self.miss_latency = miss_latency
+        self.reference_string = []
+        self.reset()
+
+    def reset(self):
+        for tier in self.tiers:
+            tier.reset()
+        self.time_counter = 0
+        self.cold_misses = 0
+        self.discarded = 0
+        self.total_latency = 0
+
+    def set_reference_string(self, ref_string):
+        self.reference_string = ref_string
+
+    def locate(self, page):
+        """Return the index of the tier holding the page, or None"""
+        for level, tier in enumerate(self.tiers):
+            if page in tier:
+                return level
+        return None
+
+    def access(self, page):
+        self.time_counter += 1
+        timestamp = self.time_counter
+        level = self.locate(page)
+        top = self.tiers[0]
+
+        if level == 0:
+            top.hits += 1
+            top.touch(page, timestamp)
+            latency = top.latency
+        else:
+            if level is None:
+                self.cold_misses += 1
+                latency = self.miss_latency
+            else:
+                tier = self.tiers[level]
+                tier.hits += 1
+                tier.promotions += 1
+                tier.remove(page)
+                latency = tier.latency
+            latency += self._place(page, timestamp)
+
+        self.total_latency += latency
+        return {
+            'step_number': timestamp,
+            'page': page,
+            'tier': self.tiers[level].name if level is not None else None,
+            'latency': latency
+        }
+
+    def run(self, reference_string=None):
+        if reference_string is not None:
+            self.set_reference_string(reference_string)
+        for page in iter_pages(self.reference_string):
+            self.access(page)
+        return self.get_statistics()
+
+    def _place(self, page, timestamp):
+        """Store a page in the top tier, cascading demotions; return the store cost"""
+        cost = 0
+        pending = [(0, page)]
+
+        while pending:
+            level, page = pending.pop()
+            if level == len(self.tiers):
+                self.discarded += 1
+                continue
+
+            tier = self.tiers[level]
+            size = tier.stored_size(page, self.page_size)
+            if size is None:
+                tier.rejected += 1
+                pending.append((level + 1, page))
+                continue
+
+            if level > 0:
+                tier.demotions += 1
+            cost += tier.store_latency
+            for victim in tier.store(page, size, timestamp, self.reference_string):
+                pending.append((level + 1, victim))
+
+        return cost
+
+    def get_statistics(self):
+        total_accesses = self.time_counter
+        tiers = []
+        for tier in self.tiers:
+            stats = tier.get_statistics(self.page_size)
+            stats['hit_rate'] = tier.hits / total_accesses if total_accesses > 0 else 0
+            tiers.append(stats)
+
+        return {
+            'total_accesses': total_accesses,
+            'cold_misses': self.cold_misses,
+            'miss_rate': self.cold_misses / total_accesses if total_accesses > 0 else 0,
+            'discarded_pages': self.discarded,
+            'total_access_time_ns': self.total_latency,
+            'average_access_time_ns': self.total_latency / total_accesses if total_accesses > 0 else 0,
+            'tiers': tiers
+        }
+
+def standard_hierarchy(dram_frames, numa_frames=0, compressed_pool_pages=0, compression_ratio=3.0,
+                       compression_spread=0.0, swap=True, page_size=4096, policy="LRU", seed=None):
+    """DRAM, then optional NUMA-remote memory, a compressed pool and a swap device
+
+    compressed_pool_pages sizes the pool in uncompressed pages of memory,
+    so at ratio 3 it holds about three times as many pages.
+    """
+    tiers = [MemoryTier("DRAM", dram_frames * page_size, DRAM_LATENCY_NS, policy, seed=seed)]
+    if numa_frames:
+        tiers.append(MemoryTier("NUMA_REMOTE", numa_frames * page_size, NUMA_REMOTE_LATENCY_NS, policy,
+                                seed=seed))
+    if compressed_pool_pages:
+        compression = CompressionModel(compression_ratio, compression_spread, seed=seed or 0)
+        tiers.append(MemoryTier("COMPRESSED", compressed_pool_pages * page_size, COMPRESSED_LATENCY_NS, policy,
+                                store_latency=COMPRESS_STORE_LATENCY_NS, compression=compression, seed=seed))
+    if swap:
+        tiers.append(MemoryTier("SWAP", None, SWAP_LATENCY_NS, "FIFO", store_latency=SWAP_STORE_LATENCY_NS,
+                                seed=seed))
+    return MemoryHierarchy(tiers, page_size)
@@ -1,7 +1,34 @@
+import hashlib
+import random
 import time
 from collections import deque, OrderedDict
 from algorithms import PageReplacementAlgorithms
 
+# Bump whenever simulation semantics change so cached results are invalidated
+SIMULATOR_VERSION = "1.1.0"
+
+def trace_digest(reference_string):
+    """SHA-256 of a trace as little-endian int64 page numbers
+
+    Lists, arrays and memory-mapped .pages traces with the same pages
+    give the same digest.
+    """
+    import numpy as np
+    pages = np.ascontiguousarray(reference_string, dtype='<i8')
+    return hashlib.sha256(pages.data).hexdigest()
+
+def iter_pages(reference_string, chunk_size=65536):
+    """Iterate a trace as Python ints
+
+    Arrays, such as memory-mapped .pages traces, are converted one chunk
+    at a time, so the whole trace is never held as a list.
+    """
+    if not hasattr(reference_string, 'tolist'):
+        yield from reference_string
+        return
+    for start in range(0, len(reference_string), chunk_size):
+        yield from reference_string[start:start + chunk_size].tolist()
+
 class MemoryFrame:
     def __init__(self, frame_id):
         self.frame_id = frame_id
@@ -42,28 +69,57 @@ class MemorySimulator:
         self.page_size = 1024
         self.memory_frames = []
         self.page_table = {}
-        self.algorithm_handler = PageReplacementAlgorithms()
+        self.seed = random.getrandbits(32)
         self.reference_string = []
+        self._reference_digest = None
         self.history = []
+        self.record_history = True  # long batch runs can skip the per-step memory snapshots
         self.time_counter = 0
+        self.listeners = []
         self.reset()
         
-    def initialize(self, num_frames, page_size, algorithm):
+    def initialize(self, num_frames, page_size, algorithm, seed=None):
+        """Configure a fresh run; RANDOM replacement draws from seed, a random one if omitted"""
         self.num_frames = num_frames
         self.page_size = page_size
         self.algorithm = algorithm
+        self.seed = seed if seed is not None else random.getrandbits(32)
         self.reset()
         
     def reset(self):
         self.memory_frames = [MemoryFrame(i) for i in range(self.num_frames)]
         self.page_table = {}
+        # A fresh handler rewinds the clock hand and the RANDOM generator
+        self.algorithm_handler = PageReplacementAlgorithms(self.seed)
         self.history = []
         self.time_counter = 0
         self.page_faults = 0
         self.hits = 0
         
-    def set_reference_string(self, ref_string):
+    def set_reference_string(self, ref_string, digest=None):
+        """Set the trace; digest may pass on an already known trace_digest of it"""
         self.reference_string = ref_string
+        self._reference_digest = digest
+        
+    def extend_reference_string(self, pages):
+        """Append pages to the trace in place; the digest is recomputed when next asked for"""
+        if not isinstance(self.reference_string, list):
+            self.reference_string = list(self.reference_string)
+        self.reference_string.extend(pages)
+        self._reference_digest = None
+        
+    def reference_digest(self):
+        """trace_digest of the reference string, computed once per trace"""
+        if self._reference_digest is None:
+            self._reference_digest = trace_digest(self.reference_string)
+        return self._reference_digest
+        
+    def add_listener(self, listener):
+        """Register a callable that receives every step_info as it is produced"""
+        self.listeners.append(listener)
+        
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
         
     def simulate_step(self, page):
         self.time_counter += 1
@@ -124,10 +180,21 @@ class MemorySimulator:
             'page_fault': step_info['page_fault'],
             'replaced_page': step_info['replaced_page']
         }
-        self.history.append(current_state)
+        if self.record_history:
+            self.history.append(current_state)
+        
+        for listener in self.listeners:
+            listener(step_info)
         
         return step_info
     
+    def unmap_page(self, page):
+        """Remove a page from memory and free its frame; return the frame index or None"""
+        frame_index = self.page_table.pop(page, None)
+        if frame_index is not None:
+            self.memory_frames[frame_index].deallocate()
+        return frame_index
+    
     def find_free_frame(self):
         for i, frame in enumerate(self.memory_frames):
             if not frame.allocated:
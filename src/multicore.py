@@ -0,0 +1,312 @@
+import heapq
+import random
+import time
+from array import array
+from collections import Counter, OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from memory_simulator import MemorySimulator, iter_pages
+
+# Typical translation and shootdown costs in nanoseconds
+PAGE_WALK_NS = 30          # refill one TLB entry from the page table
+SHOOTDOWN_NS = 500         # initiator: local invalidation and sending the IPIs
+IPI_NS = 1500              # each remote core interrupted to flush an entry
+
+DEFAULT_TLB_ENTRIES = 64
+SHOOTDOWN_MODES = ["precise", "broadcast"]
+
+# Stream item that unmaps a page instead of accessing it
+Unmap = namedtuple('Unmap', ['page'])
+
+def partition_trace(reference_string, num_cores):
+    """Split one trace into num_cores contiguous per-core streams"""
+    size = -(-len(reference_string) // num_cores)
+    return [list(iter_pages(reference_string[core * size:(core + 1) * size])) for core in range(num_cores)]
+
+def interleave(streams, quantum=1):
+    """Yield (core, item) round-robin, quantum items per core per turn
+
+    The order depends only on the stream lengths, so every run over the
+    same streams sees the same global order.
+    """
+    positions = [0] * len(streams)
+    active = [core for core, stream in enumerate(streams) if len(stream)]
+
+    while active:
+        remaining = []
+        for core in active:
+            stream = streams[core]
+            start = positions[core]
+            stop = min(start + quantum, len(stream))
+            for item in stream[start:stop]:
+                yield core, item
+            positions[core] = stop
+            if stop < len(stream):
+                remaining.append(core)
+        active = remaining
+
+def simulate_core_tlb(core, times, pages, shootdowns, tlb_entries):
+    """Replay one core's accesses through an LRU TLB
+
+    times holds the global step of each access in pages. shootdowns are
+    (global step, page, initiating core) tuples in step order and are
+    applied before the core's next later access; shootdowns of pages the
+    core never touches may be left out. Module level so that it can run
+    in a worker process.
+    """
+    tlb = OrderedDict()
+    hits = misses = invalidated = ipis = 0
+    next_shootdown = 0
+
+    def apply(shootdown):
+        nonlocal invalidated, ipis
+        _, page, initiator = shootdown
+        if tlb.pop(page, None) is not None:
+            invalidated += 1
+            if initiator != core:
+                ipis += 1
+
+    for step, page in zip(times, pages):
+        while next_shootdown < len(shootdowns) and shootdowns[next_shootdown][0] <= step:
+            apply(shootdowns[next_shootdown])
+            next_shootdown += 1
+
+        if page in tlb:
+            tlb.move_to_end(page)
+            hits += 1
+        else:
+            misses += 1
+            tlb[page] = True
+            if len(tlb) > tlb_entries:
+                tlb.popitem(last=False)
+
+    for shootdown in shootdowns[next_shootdown:]:
+        apply(shootdown)
+
+    return {
+        'core': core,
+        'tlb_hits': hits,
+        'tlb_misses': misses,
+        'entries_invalidated': invalidated,
+        'ipis_received': ipis
+    }
+
+def simulate_memory_partition(num_frames, page_size, algorithm, seed, steps, cores, pages, unmaps, num_cores):
+    """Run one memory partition's share of the merged order through its own frames and page table
+
+    steps, cores and pages give the global step, core and page of every
+    item owned by the partition, in step order; unmaps flags the Unmap
+    items. Returns the partition's shootdowns in step order, its faults
+    per core and its totals. Module level so that it can run in a worker
+    process.
+    """
+    memory = MemorySimulator()
+    memory.initialize(num_frames, page_size, algorithm, seed)
+    memory.set_reference_string([page for page, unmap in zip(pages, unmaps) if not unmap])
+    memory.record_history = False
+
+    core_faults = [0] * num_cores
+    unmapped = 0
+    shootdowns = []
+    for step, core, page, unmap in zip(steps, cores, pages, unmaps):
+        if unmap:
+            if memory.unmap_page(page) is not None:
+                unmapped += 1
+                shootdowns.append((step, page, core))
+            continue
+
+        step_info = memory.simulate_step(page)
+        if step_info['page_fault']:
+            core_faults[core] += 1
+        if step_info['replaced_page'] is not None:
+            shootdowns.append((step, step_info['replaced_page'], core))
+
+    return {
+        'shootdowns': shootdowns,
+        'core_faults': core_faults,
+        'unmaps': unmapped,
+        'hits': memory.hits,
+        'page_faults': memory.page_faults
+    }
+
+class MultiCoreSimulator:
+    """Several cores sharing physical frames and a page table, each with its own TLB
+
+    Per-core streams are merged round-robin, quantum references per turn;
+    the turn boundaries are the deterministic merge points. By default
+    the merged order runs through one shared MemorySimulator, so every
+    core competes for all frames. Every eviction or unmap becomes a TLB
+    shootdown started by the core that caused it. A core's TLB depends
+    only on its own accesses and the shootdowns of pages it touches, so
+    with workers > 1 the TLBs are replayed in worker processes with the
+    same result as a serial run; the shared-memory pass stays serial.
+
+    partitions > 1 selects a different, opt-in model: memory is split by
+    page number (page % partitions) into partitions with their own share
+    of the frames, page-table slice and replacement state, like memory
+    controllers that each manage their own frames. Its results differ
+    from the shared model and are not comparable with it. Given the
+    merged order its partitions never interact, so with workers > 1 they
+    also run in worker processes and their shootdowns are merged back by
+    global step.
+
+    In precise mode only remote cores holding the entry are interrupted;
+    broadcast mode interrupts every other core, as when the OS does not
+    track which cores cached a mapping.
+    """
+
+    def __init__(self, num_cores, num_frames=4, page_size=1024, algorithm="FIFO",
+                 tlb_entries=DEFAULT_TLB_ENTRIES, quantum=1, shootdown="precise", workers=None,
+                 partitions=1, seed=None):
+        if num_cores < 1:
+            raise ValueError("num_cores must be at least 1")
+        if quantum < 1:
+            raise ValueError("quantum must be at least 1")
+        if shootdown not in SHOOTDOWN_MODES:
+            raise ValueError(f"Unknown shootdown mode: {shootdown}")
+        if not 1 <= partitions <= num_frames:
+            raise ValueError("partitions must be between 1 and num_frames")
+
+        self.num_cores = num_cores
+        self.num_frames = num_frames
+        self.page_size = page_size
+        self.algorithm = algorithm
+        self.tlb_entries = tlb_entries
+        self.quantum = quantum
+        self.shootdown = shootdown
+        self.workers = workers
+        self.partitions = partitions
+        # Partition p replaces with seed + p, so RANDOM runs are repeatable
+        self.seed = seed if seed is not None else random.getrandbits(32)
+
+    def partition_frames(self, partition):
+        """Frames owned by one partition; the first num_frames % partitions get one extra"""
+        return self.num_frames // self.partitions + (partition < self.num_frames % self.partitions)
+
+    def run(self, streams):
+        """Simulate the per-core streams and return the statistics"""
+        if len(streams) != self.num_cores:
+            raise ValueError(f"Expected {self.num_cores} streams, got {len(streams)}")
+
+        pool = None
+        if self.workers and self.workers > 1 and max(self.partitions, self.num_cores) > 1:
+            pool = ProcessPoolExecutor(max_workers=min(self.workers, max(self.partitions, self.num_cores)))
+
+        try:
+            started = time.perf_counter()
+            times, pages, touched, jobs = self._split(streams)
+            memory = self._run_memory(pool, jobs)
+            memory_elapsed = time.perf_counter() - started
+
+            started = time.perf_counter()
+            cores = self._run_tlbs(pool, times, pages, touched, memory['shootdowns'])
+            tlb_elapsed = time.perf_counter() - started
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return self._statistics(memory, cores, memory_elapsed, tlb_elapsed)
+
+    def _split(self, streams):
+        """Merge the streams and split the order into per-core accesses and per-partition jobs
+
+        touched maps each accessed page to a bit mask of the cores that
+        access it, so shootdowns can be sent only to those cores.
+        """
+        times = [array('q') for _ in range(self.num_cores)]
+        pages = [array('q') for _ in range(self.num_cores)]
+        touched = {}
+        parts = [(array('q'), array('q'), array('q'), array('b')) for _ in range(self.partitions)]
+
+        for step, (core, item) in enumerate(interleave(streams, self.quantum)):
+            unmap = isinstance(item, Unmap)
+            page = item.page if unmap else item
+            if not unmap:
+                times[core].append(step)
+                pages[core].append(page)
+                touched[page] = touched.get(page, 0) | (1 << core)
+
+            steps, cores, part_pages, unmaps = parts[page % self.partitions]
+            steps.append(step)
+            cores.append(core)
+            part_pages.append(page)
+            unmaps.append(unmap)
+
+        jobs = [(self.partition_frames(partition), self.page_size, self.algorithm,
+                 (self.seed + partition) & 0xffffffff, *parts[partition], self.num_cores)
+                for partition in range(self.partitions)]
+        return times, pages, touched, jobs
+
+    def _run_memory(self, pool, jobs):
+        """Run every partition and merge their shootdowns by global step"""
+        if pool is not None and len(jobs) > 1:
+            results = list(pool.map(simulate_memory_partition, *zip(*jobs)))
+        else:
+            results = [simulate_memory_partition(*job) for job in jobs]
+
+        return {
+            'shootdowns': list(heapq.merge(*(result['shootdowns'] for result in results))),
+            'core_faults': [sum(faults) for faults in zip(*(result['core_faults'] for result in results))],
+            'unmaps': sum(result['unmaps'] for result in results),
+            'hits': sum(result['hits'] for result in results),
+            'page_faults': sum(result['page_faults'] for result in results)
+        }
+
+    def _run_tlbs(self, pool, times, pages, touched, shootdowns):
+        core_shootdowns = [[] for _ in range(self.num_cores)]
+        for shootdown in shootdowns:
+            mask = touched.get(shootdown[1], 0)
+            core = 0
+            while mask:
+                if mask & 1:
+                    core_shootdowns[core].append(shootdown)
+                mask >>= 1
+                core += 1
+
+        jobs = [(core, times[core], pages[core], core_shootdowns[core], self.tlb_entries)
+                for core in range(self.num_cores)]
+
+        if pool is not None and self.num_cores > 1:
+            return list(pool.map(simulate_core_tlb, *zip(*jobs)))
+        return [simulate_core_tlb(*job) for job in jobs]
+
+    def _statistics(self, memory, cores, memory_elapsed, tlb_elapsed):
+        shootdowns = memory['shootdowns']
+
+        if self.shootdown == "broadcast":
+            initiated = Counter(initiator for _, _, initiator in shootdowns)
+            for core in cores:
+                core['ipis_received'] = len(shootdowns) - initiated[core['core']]
+
+        for core in cores:
+            accesses = core['tlb_hits'] + core['tlb_misses']
+            core['accesses'] = accesses
+            core['page_faults'] = memory['core_faults'][core['core']]
+            core['tlb_hit_ratio'] = core['tlb_hits'] / accesses if accesses > 0 else 0
+
+        total_accesses = memory['hits'] + memory['page_faults']
+        tlb_hits = sum(core['tlb_hits'] for core in cores)
+        tlb_misses = sum(core['tlb_misses'] for core in cores)
+        ipis = sum(core['ipis_received'] for core in cores)
+        shootdown_cost = len(shootdowns) * SHOOTDOWN_NS + ipis * IPI_NS
+
+        return {
+            'cores': self.num_cores,
+            'memory_model': "shared" if self.partitions == 1 else "partitioned",
+            'partitions': self.partitions,
+            'algorithm': self.algorithm,
+            'shootdown_mode': self.shootdown,
+            'total_accesses': total_accesses,
+            'page_faults': memory['page_faults'],
+            'hit_ratio': memory['hits'] / total_accesses if total_accesses > 0 else 0,
+            'tlb_hits': tlb_hits,
+            'tlb_misses': tlb_misses,
+            'tlb_hit_ratio': tlb_hits / (tlb_hits + tlb_misses) if tlb_hits + tlb_misses > 0 else 0,
+            'shootdowns': len(shootdowns),
+            'evictions': len(shootdowns) - memory['unmaps'],
+            'unmaps': memory['unmaps'],
+            'ipis': ipis,
+            'page_walk_cost_ns': tlb_misses * PAGE_WALK_NS,
+            'shootdown_cost_ns': shootdown_cost,
+            'per_core': cores,
+            'elapsed': {'memory': memory_elapsed, 'tlb': tlb_elapsed}
+        }
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from memory_simulator import MemorySimulator, SIMULATOR_VERSION, iter_pages, trace_digest
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".vm_simulator_cache")
+
+# RANDOM replacement does not produce repeatable statistics, so it is never cached
+UNCACHEABLE_ALGORITHMS = {"RANDOM"}
+
+class ResultCache:
+    """Content-addressed on-disk cache of simulation statistics with LRU eviction
+
+    The simulator version is part of every key, so several versions can
+    share one cache directory; entries of other versions are never read
+    and age out through LRU eviction.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=64 * 1024 * 1024, version=SIMULATOR_VERSION):
+        self.cache_dir = cache_dir or os.environ.get("VM_SIMULATOR_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.version = version
+        self.entries = OrderedDict()  # key -> size in bytes, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        self._load_index()
+
+    def make_key(self, reference_string, num_frames, page_size, algorithm, digest=None):
+        """Combine the trace digest with the simulation configuration
+
+        digest is trace_digest(reference_string); pass it to avoid hashing
+        the same trace again for every configuration.
+        """
+        if digest is None:
+            digest = trace_digest(reference_string)
+        config = f"{self.version}|{algorithm}|{num_frames}|{page_size}|{digest}"
+        return hashlib.sha256(config.encode()).hexdigest()
+
+    def get(self, key):
+        """Return cached statistics for key, or None on a miss"""
+        if key not in self.entries:
+            self.misses += 1
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r') as f:
+                statistics = json.load(f)
+        except (OSError, ValueError):
+            self._discard(key)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        os.utime(path)
+        self.hits += 1
+        return statistics
+
+    def put(self, key, statistics):
+        """Store statistics under key and evict least recently used entries"""
+        data = json.dumps(statistics).encode()
+
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._entry_path(key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        if key in self.entries:
+            self.total_bytes -= self.entries[key]
+        self.entries[key] = len(data)
+        self.entries.move_to_end(key)
+        self.total_bytes += len(data)
+
+        while self.total_bytes > self.max_bytes and self.entries:
+            oldest_key = next(iter(self.entries))
+            self._discard(oldest_key)
+
+    def get_or_run(self, reference_string, num_frames, page_size, algorithm, listener=None, digest=None):
+        """Return statistics for a configuration, simulating only on a cache miss
+
+        A listener is attached to the simulator on a miss; an exception it
+        raises aborts the run without caching anything. digest is an
+        optional precomputed trace_digest(reference_string).
+        """
+        cacheable = algorithm not in UNCACHEABLE_ALGORITHMS
+
+        if cacheable:
+            key = self.make_key(reference_string, num_frames, page_size, algorithm, digest)
+            statistics = self.get(key)
+            if statistics is not None:
+                return statistics
+
+        simulator = MemorySimulator()
+        simulator.initialize(num_frames, page_size, algorithm)
+        simulator.set_reference_string(reference_string)
+        if listener is not None:
+            simulator.add_listener(listener)
+
+        for page in iter_pages(simulator.reference_string):
+            simulator.simulate_step(page)
+
+        statistics = simulator.get_statistics()
+
+        if cacheable:
+            self.put(key, statistics)
+
+        return statistics
+
+    def invalidate(self):
+        """Remove every cached entry, for all simulator versions"""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json") or name.endswith(".tmp"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def get_statistics(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'total_bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups > 0 else 0
+        }
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def _discard(self, key):
+        size = self.entries.pop(key, 0)
+        self.total_bytes -= size
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
+
+    def _load_index(self):
+        """Rebuild the in-memory LRU index from file modification times"""
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            found.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+
+        for _, key, size in sorted(found):
+            self.entries[key] = size
+            self.total_bytes += size
+
+        while self.total_bytes > self.max_bytes and self.entries:
+            self._discard(next(iter(self.entries)))
@@ -0,0 +1,196 @@
+import json
+import struct
+import numpy as np
+
+# Layout of a .vmr file:
+#   8 bytes   magic
+#   8 bytes   little-endian header length
+#   N bytes   JSON header (metadata and column descriptors)
+#   padding   up to COLUMN_ALIGNMENT
+#   columns   raw little-endian arrays, each aligned to COLUMN_ALIGNMENT
+MAGIC = b"VMSRES01"
+ZIP_MAGIC = b"PK\x03\x04"
+COLUMN_ALIGNMENT = 64
+NO_PAGE = -1
+
+def history_to_columns(history, num_frames):
+    """Convert a list of history dicts into column arrays"""
+    count = len(history)
+    columns = {
+        'time': np.fromiter((h['time'] for h in history), dtype='<i8', count=count),
+        'page': np.fromiter((h['page'] for h in history), dtype='<i8', count=count),
+        'page_fault': np.fromiter((h['page_fault'] for h in history), dtype='u1', count=count),
+        'replaced_page': np.fromiter(
+            (NO_PAGE if h['replaced_page'] is None else h['replaced_page'] for h in history),
+            dtype='<i8', count=count),
+    }
+
+    memory = np.full((count, num_frames), NO_PAGE, dtype='<i8')
+    for i, h in enumerate(history):
+        memory[i, :len(h['memory'])] = h['memory']
+    columns['memory'] = memory
+
+    return columns
+
+def write_binary_results(filename, metadata, columns, compress=False):
+    """Write metadata and column arrays as .vmr (memory-mappable) or compressed .npz"""
+    header = dict(metadata)
+    header['columns'] = {}
+
+    if compress:
+        for name, values in columns.items():
+            header['columns'][name] = {'dtype': values.dtype.str, 'shape': list(values.shape)}
+        header_bytes = np.frombuffer(json.dumps(header).encode(), dtype='u1')
+        with open(filename, 'wb') as f:
+            np.savez_compressed(f, header=header_bytes, **columns)
+        return filename
+
+    offset = 0
+    for name, values in columns.items():
+        header['columns'][name] = {
+            'dtype': values.dtype.str,
+            'shape': list(values.shape),
+            'offset': offset
+        }
+        offset += _aligned(values.nbytes)
+
+    header_bytes = json.dumps(header).encode()
+    data_start = _aligned(len(MAGIC) + 8 + len(header_bytes))
+
+    with open(filename, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (data_start - f.tell()))
+
+        for name, values in columns.items():
+            f.write(np.ascontiguousarray(values).tobytes())
+            f.write(b"\0" * (_aligned(values.nbytes) - values.nbytes))
+
+    return filename
+
+def read_binary_results(filename):
+    """Open a .vmr or compressed .npz result file without parsing its history"""
+    with open(filename, 'rb') as f:
+        magic = f.read(len(MAGIC))
+
+        if magic.startswith(ZIP_MAGIC):
+            archive = np.load(filename)
+            header = json.loads(archive['header'].tobytes().decode())
+            columns = {name: _LazyMember(archive, name, info['shape'])
+                       for name, info in header['columns'].items()}
+            return SimulationResults(header, columns)
+
+        if magic != MAGIC:
+            raise ValueError(f"{filename} is not a binary simulation result file")
+
+        header_length = struct.unpack('<Q', f.read(8))[0]
+        header = json.loads(f.read(header_length).decode())
+
+    data_start = _aligned(len(MAGIC) + 8 + header_length)
+    columns = {}
+
+    for name, info in header['columns'].items():
+        shape = tuple(info['shape'])
+        if int(np.prod(shape)) == 0:
+            columns[name] = np.empty(shape, dtype=info['dtype'])
+            continue
+        columns[name] = np.memmap(filename, dtype=info['dtype'], mode='r',
+                                  offset=data_start + info['offset'], shape=shape)
+
+    return SimulationResults(header, columns)
+
+def is_binary_results(filename):
+    with open(filename, 'rb') as f:
+        magic = f.read(len(MAGIC))
+    return magic == MAGIC or magic.startswith(ZIP_MAGIC)
+
+class SimulationResults:
+    """Dict-like view of a binary result file with lazily materialised history"""
+
+    def __init__(self, header, columns):
+        self.header = header
+        self.columns = columns
+        self.history = HistoryView(columns)
+
+    def __getitem__(self, key):
+        if key == 'history':
+            return self.history
+        if key == 'configuration':
+            configuration = dict(self.header['configuration'])
+            configuration['reference_string'] = self.column('reference_string')
+            return configuration
+        if key == 'page_table':
+            return {page: frame for page, frame in self.header['page_table']}
+        return self.header[key]
+
+    def __contains__(self, key):
+        return key in ('history', 'configuration', 'page_table') or key in self.header
+
+    def keys(self):
+        return ['timestamp', 'configuration', 'statistics', 'history',
+                'final_memory_state', 'page_table']
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def column(self, name):
+        return _materialise(self.columns[name])
+
+    def step(self, n):
+        """Return the history entry for step index n"""
+        return self.history[n]
+
+class HistoryView:
+    """Sequence of history dicts built on demand from the column arrays"""
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def _column(self, name):
+        return _materialise(self.columns[name])
+
+    def __len__(self):
+        return int(self.columns['time'].shape[0])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+
+        replaced = int(self._column('replaced_page')[index])
+        return {
+            'time': int(self._column('time')[index]),
+            'page': int(self._column('page')[index]),
+            'memory': [int(p) for p in self._column('memory')[index]],
+            'page_fault': bool(self._column('page_fault')[index]),
+            'replaced_page': None if replaced == NO_PAGE else replaced
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+class _LazyMember:
+    """Column stored in a compressed archive, decompressed on first access"""
+
+    def __init__(self, archive, name, shape):
+        self.archive = archive
+        self.name = name
+        self.shape = tuple(shape)
+        self.values = None
+
+    def load(self):
+        if self.values is None:
+            self.values = self.archive[self.name]
+        return self.values
+
+def _materialise(values):
+    return values.load() if isinstance(values, _LazyMember) else values
+
+def _aligned(size):
+    return (size + COLUMN_ALIGNMENT - 1) // COLUMN_ALIGNMENT * COLUMN_ALIGNMENT
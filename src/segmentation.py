@@ -1,8 +1,6 @@
-import tkinter as tk
-from tkinter import ttk
-import matplotlib.patches as patches
-import matplotlib.pyplot as plt
-import numpy as np
+import time
+from array import array
+from free_space import FreeSpaceIndex
 
 class Segment:
     def __init__(self, segment_id, base, limit, name=""):
@@ -12,78 +10,418 @@ class Segment:
         self.name = name
         self.allocated = False
         self.process_id = None
+        self.requested_size = 0
         
     def allocate(self, process_id, size):
         if size <= self.limit:
             self.allocated = True
             self.process_id = process_id
+            self.requested_size = size
             return True
         return False
         
     def deallocate(self):
         self.allocated = False
         self.process_id = None
+        self.requested_size = 0
+
+PLACEMENT_POLICIES = ["FIRST_FIT", "BEST_FIT", "WORST_FIT", "NEXT_FIT"]
+
+# Bookkeeping size estimates used for metadata overhead reporting
+SEGMENT_DESCRIPTOR_BYTES = 16   # base + limit
+HOLE_TAG_BYTES = 16             # header and footer boundary tags
 
 class SegmentationSimulator:
-    def __init__(self, total_memory=1024):
+    """Segment allocator over fixed partitions or dynamic variable-size partitions
+
+    Until initialize_segments is called, memory is one hole that is split
+    on allocation and coalesced on free. initialize_segments switches to
+    the fixed-partition model, where each pre-carved segment is handed out
+    whole. In both modes holes are indexed by address and by size, so
+    placement is O(log n) for every policy.
+    
+    Fragmentation counters are updated on every allocate and free, and a
+    sample is appended to fragmentation_history every
+    fragmentation_sample_interval operations.
+    """
+    
+    engine_name = "SEGMENTATION"
+
+    def __init__(self, total_memory=1024, placement="FIRST_FIT", allocation_unit=1,
+                 fragmentation_sample_interval=1):
+        if placement not in PLACEMENT_POLICIES:
+            raise ValueError(f"Unknown placement policy: {placement}")
         self.total_memory = total_memory
+        self.placement = placement
+        self.allocation_unit = allocation_unit
+        self.fragmentation_sample_interval = fragmentation_sample_interval
+        self._reset_counters()
         self.segments = []
-        self.segment_table = {}
+        self.segment_table = {}        # segment_id -> entry
+        self.segment_bases = array('q')
+        self.segment_limits = array('q')
+        self.fixed_partitions = False
+        self.free_space = FreeSpaceIndex()
+        self.partitions_by_base = {}
+        self.allocated_segments = {}   # base -> Segment
+        self.process_segments = {}     # process_id -> {seg_name: Segment}
+        self.next_segment_id = 0
+        self.next_fit_cursor = 0
+        
+        if total_memory > 0:
+            self.free_space.add_hole(0, total_memory)
+        
+    @property
+    def supports_compaction(self):
+        """Only dynamic partitions can be compacted; fixed partitions never move"""
+        return not self.fixed_partitions
+        
+    def _reset_counters(self):
         self.fragmentation_history = []
+        self.allocated_bytes = 0
+        self.requested_bytes = 0
+        self.operation_count = 0
+        self.free_operations = 0
+        self.failed_allocations = 0
+        self.busy_time = 0.0
+        self.compactions = 0
+        self.bytes_moved = 0
         
     def initialize_segments(self, segment_sizes, segment_names=None):
+        if any(size < 0 for size in segment_sizes):
+            raise ValueError("Partition sizes cannot be negative")
         self.segments = []
+        self.segment_table = {}
+        self.segment_bases = array('q')
+        self.segment_limits = array('q')
+        self.fixed_partitions = True
+        self.free_space = FreeSpaceIndex()
+        self.allocated_segments = {}
+        self.process_segments = {}
+        self._reset_counters()
+        self.next_fit_cursor = 0
         base = 0
         
         for i, size in enumerate(segment_sizes):
             name = segment_names[i] if segment_names else f"Seg_{i}"
             segment = Segment(i, base, size, name)
             self.segments.append(segment)
+            if size > 0:
+                self.free_space.add_hole(base, size, coalesce=False)
             base += size
             
+        self.next_segment_id = len(self.segments)
+        self.partitions_by_base = {segment.base: segment for segment in self.segments}
+            
     def allocate_process(self, process_id, segment_requirements):
         """Allocate segments to a process"""
         allocations = {}
         
         for seg_name, size in segment_requirements.items():
-            for segment in self.segments:
-                if not segment.allocated and segment.limit >= size:
-                    if segment.allocate(process_id, size):
-                        allocations[seg_name] = segment.segment_id
-                        self.segment_table[f"{process_id}_{seg_name}"] = {
-                            'segment_id': segment.segment_id,
-                            'base': segment.base,
-                            'limit': segment.limit
-                        }
-                        break
+            segment = self.allocate_segment(process_id, seg_name, size)
+            if segment is not None:
+                allocations[seg_name] = segment.segment_id
         
         return allocations
     
+    def allocate_segment(self, process_id, seg_name, size):
+        """Place one segment using the configured policy; return it or None if no hole fits"""
+        if size <= 0:
+            raise ValueError(f"Segment size must be positive, got {size}")
+        if seg_name in self.process_segments.get(process_id, {}):
+            # Reusing a name frees the old segment first, as its own timed operation
+            self.deallocate_segment(process_id, seg_name)
+        
+        started = time.perf_counter()
+        segment = self._place(seg_name, size)
+        if segment is None:
+            self.failed_allocations += 1
+            self._record_operation(started)
+            return None
+        
+        segment.allocate(process_id, size)
+        self.allocated_bytes += segment.limit
+        self.requested_bytes += size
+        self.allocated_segments[segment.base] = segment
+        self.process_segments.setdefault(process_id, {})[seg_name] = segment
+        self.segment_table[segment.segment_id] = {
+            'segment_id': segment.segment_id,
+            'process_id': process_id,
+            'name': seg_name,
+            'base': segment.base,
+            'limit': segment.limit
+        }
+        self._map_segment(segment)
+        self._record_operation(started)
+        return segment
+    
+    def forget_failed_allocation(self):
+        """Drop the record of the last failed allocation, for a caller about to retry it"""
+        if self.fragmentation_history and self.fragmentation_history[-1][0] == self.operation_count:
+            self.fragmentation_history.pop()
+        self.operation_count -= 1
+        self.failed_allocations -= 1
+    
+    def deallocate_segment(self, process_id, seg_name):
+        """Free one segment of a process, coalescing it with neighbouring holes"""
+        started = time.perf_counter()
+        segments = self.process_segments.get(process_id)
+        if not segments or seg_name not in segments:
+            return False
+        
+        segment = segments.pop(seg_name)
+        if not segments:
+            del self.process_segments[process_id]
+        del self.allocated_segments[segment.base]
+        self.segment_table.pop(segment.segment_id, None)
+        self.segment_limits[segment.segment_id] = 0
+        
+        self.allocated_bytes -= segment.limit
+        self.requested_bytes -= segment.requested_size
+        segment.deallocate()
+        self._release(segment)
+        self._record_operation(started, freed=True)
+        return True
+    
+    def deallocate_process(self, process_id):
+        """Free every segment owned by a process; return how many were freed"""
+        names = list(self.process_segments.get(process_id, {}))
+        for seg_name in names:
+            self.deallocate_segment(process_id, seg_name)
+        return len(names)
+    
+    def _place(self, seg_name, size):
+        """Reserve memory for a segment and return it, or None if nothing fits"""
+        if self.fixed_partitions:
+            block_size = size
+        else:
+            # Dynamic partitions are rounded up to the allocation unit
+            block_size = -(-size // self.allocation_unit) * self.allocation_unit
+        
+        base = self.free_space.find(block_size, self.placement, self.next_fit_cursor)
+        if base is None:
+            return None
+        
+        if self.fixed_partitions:
+            self.free_space.take(base, block_size, split=False)
+            segment = self.partitions_by_base[base]
+        else:
+            self.free_space.take(base, block_size)
+            segment = Segment(self.next_segment_id, base, block_size, seg_name)
+            self.next_segment_id += 1
+        
+        self.next_fit_cursor = base + segment.limit
+        return segment
+    
+    def _release(self, segment):
+        self.free_space.add_hole(segment.base, segment.limit, coalesce=not self.fixed_partitions)
+    
+    def _map_segment(self, segment):
+        """Record base and bound in the dense arrays used by translate
+
+        The bound is the requested size, not the partition or rounded
+        block, so offsets into the unused tail fault as they would on
+        hardware with an exact limit register.
+        """
+        missing = segment.segment_id + 1 - len(self.segment_bases)
+        if missing > 0:
+            self.segment_bases.extend([0] * missing)
+            self.segment_limits.extend([0] * missing)
+        self.segment_bases[segment.segment_id] = segment.base
+        self.segment_limits[segment.segment_id] = segment.requested_size
+    
+    def segment_id_for(self, process_id, seg_name):
+        segment = self.process_segments.get(process_id, {}).get(seg_name)
+        return segment.segment_id if segment is not None else None
+    
+    def translate(self, segments, offsets):
+        """Translate arrays of (segment_id, offset) logical addresses in one vectorized pass
+
+        Returns (physical_addresses, fault_mask). Unknown or freed segments,
+        negative offsets and offsets at or beyond the requested size fault;
+        their physical address is -1.
+        """
+        import numpy as np
+        
+        segments = np.asarray(segments, dtype=np.int64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if len(self.segment_bases) == 0:
+            return np.full(segments.shape, -1, dtype=np.int64), np.ones(segments.shape, dtype=bool)
+        
+        bases = np.frombuffer(self.segment_bases, dtype=np.int64)
+        limits = np.frombuffer(self.segment_limits, dtype=np.int64)
+        
+        known = (segments >= 0) & (segments < len(bases))
+        index = np.where(known, segments, 0)
+        fault = ~known | (offsets < 0) | (offsets >= limits[index])
+        physical = np.where(fault, -1, bases[index] + offsets)
+        return physical, fault
+    
+    def compact(self):
+        """Slide every allocated segment down to close all holes; return the bytes moved
+
+        Only dynamic partitions can be compacted. The segment table is
+        rewritten with the new bases and the free space becomes one hole.
+        """
+        if not self.supports_compaction:
+            return 0
+        
+        started = time.perf_counter()
+        moved = 0
+        cursor = 0
+        relocated = {}
+        
+        for base in sorted(self.allocated_segments):
+            segment = self.allocated_segments[base]
+            if segment.base != cursor:
+                moved += segment.limit
+                segment.base = cursor
+                self.segment_table[segment.segment_id]['base'] = cursor
+                self.segment_bases[segment.segment_id] = cursor
+            relocated[cursor] = segment
+            cursor += segment.limit
+        
+        self.allocated_segments = relocated
+        self.free_space = FreeSpaceIndex()
+        if cursor < self.total_memory:
+            self.free_space.add_hole(cursor, self.total_memory - cursor)
+        self.next_fit_cursor = cursor
+        
+        self.compactions += 1
+        self.bytes_moved += moved
+        self.busy_time += time.perf_counter() - started
+        return moved
+    
+    def memory_layout(self):
+        """Return allocated segments and free holes in address order"""
+        if self.fixed_partitions:
+            return list(self.segments)
+        
+        layout = list(self.allocated_segments.values())
+        for base, size in self.free_space.iter_holes():
+            layout.append(Segment(None, base, size, "Free"))
+        layout.sort(key=lambda segment: segment.base)
+        return layout
+    
     def calculate_fragmentation(self):
-        """Calculate internal and external fragmentation"""
-        total_allocated = 0
-        internal_frag = 0
-        external_frag = 0
-        
-        for segment in self.segments:
-            if segment.allocated:
-                total_allocated += segment.limit
-                # Internal fragmentation: allocated but unused space within segment
-                internal_frag += segment.limit * 0.1  # Estimate 10% internal fragmentation
-            else:
-                external_frag += segment.limit
+        """Calculate internal and external fragmentation
+
+        Internal fragmentation is space allocated beyond what was requested.
+        External fragmentation is free memory outside the largest hole, i.e.
+        free space that cannot serve a single request of the largest size.
+        All values come from counters maintained on allocate and free.
+        """
+        internal_frag = self.allocated_bytes - self.requested_bytes
+        free_memory = self.free_space.free_bytes
+        largest_hole = self.free_space.largest_hole()
+        external_frag = free_memory - largest_hole
                 
         return {
             'internal_fragmentation': internal_frag,
             'external_fragmentation': external_frag,
-            'total_fragmentation': internal_frag + external_frag
+            'total_fragmentation': internal_frag + external_frag,
+            'free_memory': free_memory,
+            'largest_hole': largest_hole,
+            'hole_count': len(self.free_space),
+            'external_fragmentation_ratio': external_frag / free_memory if free_memory > 0 else 0
         }
+    
+    def metadata_bytes(self):
+        """Estimated bookkeeping size: one descriptor per segment and a boundary tag per hole"""
+        return (len(self.allocated_segments) * SEGMENT_DESCRIPTOR_BYTES
+                + len(self.free_space) * HOLE_TAG_BYTES)
+    
+    def get_statistics(self):
+        """Throughput, failure rate, fragmentation and metadata overhead of this engine"""
+        allocations = self.operation_count - self.free_operations
+        stats = {
+            'engine': self.engine_name,
+            'operations': self.operation_count,
+            'allocations': allocations,
+            'failed_allocations': self.failed_allocations,
+            'failure_rate': self.failed_allocations / allocations if allocations > 0 else 0,
+            'throughput': self.operation_count / self.busy_time if self.busy_time > 0 else 0,
+            'live_segments': len(self.allocated_segments),
+            'allocated_memory': self.allocated_bytes,
+            'requested_memory': self.requested_bytes,
+            'metadata_bytes': self.metadata_bytes(),
+            'compactions': self.compactions,
+            'bytes_moved': self.bytes_moved
+        }
+        stats.update(self.calculate_fragmentation())
+        return stats
+    
+    def _record_operation(self, started, freed=False):
+        self.busy_time += time.perf_counter() - started
+        self.operation_count += 1
+        if freed:
+            self.free_operations += 1
+        if self.operation_count % self.fragmentation_sample_interval == 0:
+            frag = self.calculate_fragmentation()
+            self.fragmentation_history.append((
+                self.operation_count,
+                frag['internal_fragmentation'],
+                frag['external_fragmentation'],
+                frag['largest_hole'],
+                frag['hole_count']
+            ))
+
+class PagedSegmentation:
+    """Segmentation on top of paging: segment bases are linear addresses backed by pages
+
+    Logical (segment_id, offset) pairs are bounds-checked and translated by
+    the segmentation layer in one vectorized pass; the resulting linear
+    addresses are split into pages of memory_simulator.page_size and fed to
+    the paging simulator in trace order. Each batch's pages are appended to
+    the paging simulator's reference string first, so OPTIMAL sees the
+    batch's future (but not that of later batches).
+    """
+
+    def __init__(self, seg_simulator, memory_simulator):
+        self.seg_simulator = seg_simulator
+        self.memory_simulator = memory_simulator
+        self.segment_faults = 0
+
+    def access(self, segments, offsets):
+        """Run logical addresses through both layers and return per-access results"""
+        import numpy as np
+        
+        linear, segment_fault = self.seg_simulator.translate(segments, offsets)
+        pages = np.where(segment_fault, -1, linear // self.memory_simulator.page_size)
+        page_fault = np.zeros(len(pages), dtype=bool)
+        self.segment_faults += int(segment_fault.sum())
+        
+        memory = self.memory_simulator
+        if len(memory.reference_string) != memory.time_counter:
+            # Drop any trace beyond the current step so this batch is what comes next
+            memory.set_reference_string(list(memory.reference_string[:memory.time_counter]))
+        memory.extend_reference_string(pages[~segment_fault].tolist())
+        simulate_step = memory.simulate_step
+        for i in np.flatnonzero(~segment_fault):
+            page_fault[i] = simulate_step(int(pages[i]))['page_fault']
+        
+        return {
+            'linear_addresses': linear,
+            'pages': pages,
+            'segment_fault': segment_fault,
+            'page_fault': page_fault
+        }
+
+    def get_statistics(self):
+        stats = self.memory_simulator.get_statistics()
+        stats['segment_faults'] = self.segment_faults
+        return stats
 
 class SegmentationVisualizer:
     def __init__(self):
+        # Imported here so the simulator itself can be used without matplotlib
+        import matplotlib.pyplot as plt
+        import numpy as np
         self.colors = plt.cm.tab10(np.linspace(0, 1, 10))
         
     def plot_segmentation_memory(self, fig, simulator):
+        import matplotlib.patches as patches
+        
         ax = fig.add_subplot(111)
         ax.clear()
         ax.set_title('Segmentation Memory Layout', fontsize=16, fontweight='bold')
@@ -91,7 +429,7 @@ class SegmentationVisualizer:
         memory_usage = []
         current_base = 0
         
-        for segment in simulator.segments:
+        for segment in simulator.memory_layout():
             color = 'red' if segment.allocated else 'lightgreen'
             memory_usage.append({
                 'base': segment.base,
@@ -142,9 +480,8 @@ class SegmentationVisualizer:
             return
             
         rows = []
-        for key, value in segment_table.items():
-            process_seg = key.split('_')
-            rows.append([process_seg[0], process_seg[1], value['segment_id'], 
+        for segment_id, value in sorted(segment_table.items()):
+            rows.append([value['process_id'], value['name'], segment_id, 
                         value['base'], value['limit']])
         
         # Create table
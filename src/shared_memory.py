@@ -0,0 +1,307 @@
+import random
+from algorithms import PageReplacementAlgorithms
+from memory_hierarchy import SWAP_LATENCY_NS
+from memory_simulator import MemoryFrame
+
+# Typical fault costs in nanoseconds
+MINOR_FAULT_NS = 1000            # map a zero-filled or already cached page
+MAJOR_FAULT_NS = SWAP_LATENCY_NS  # read a page back from swap or its file
+COW_FAULT_NS = 2500              # write-protect fault plus copying one page
+
+SHARED_POLICIES = ["FIFO", "LRU", "CLOCK", "RANDOM"]
+
+class Mapping:
+    """One virtual page of a process: the content it maps and whether writes must copy first"""
+
+    __slots__ = ('key', 'cow')
+
+    def __init__(self, key, cow=False):
+        self.key = key
+        self.cow = cow
+
+class SharedMemorySimulator:
+    """Physical frames shared between processes, with fork, copy-on-write and shared libraries
+
+    Frames hold page contents identified by a key: ('anon', n) for
+    anonymous memory or ('file', library, index) for library pages. Each
+    process maps virtual pages to keys, and a reverse map from key to
+    (pid, page) pairs gives every frame's reference count. fork() shares
+    all of the parent's pages with the child and write-protects the
+    private ones; the first write to a shared page then copies it (a COW
+    fault), unless no one else maps it any more. Library pages are shared
+    through the page cache and copied on write as private mappings.
+
+    When memory is full a frame is evicted from every process mapping it
+    at once and its content is remembered in swap, so a later fault by
+    any sharer brings back one shared copy.
+    """
+
+    def __init__(self, num_frames=64, page_size=4096, algorithm="LRU", seed=None):
+        if algorithm not in SHARED_POLICIES:
+            raise ValueError(f"Unknown replacement policy: {algorithm}")
+        self.num_frames = num_frames
+        self.page_size = page_size
+        self.algorithm = algorithm
+        self.seed = seed
+        self.reset()
+
+    def reset(self):
+        self.memory_frames = [MemoryFrame(i) for i in range(self.num_frames)]
+        self.algorithm_handler = PageReplacementAlgorithms(self.seed)
+        self.processes = {}   # pid -> {virtual page: Mapping}
+        self.resident = {}    # key -> frame index
+        self.mappers = {}     # key -> set of (pid, virtual page)
+        self.next_pid = 0
+        self.next_anon = 0
+        self.time_counter = 0
+        self.shared_mappings = 0  # mappings of resident pages beyond each page's first
+
+        self.total_accesses = 0
+        self.hits = 0
+        self.minor_faults = 0
+        self.major_faults = 0
+        self.cow_faults = 0
+        self.cow_copies = 0
+        self.evictions = 0
+        self.forks = 0
+        self.fault_time = 0
+        self.cow_time = 0
+        self.peak_pages_saved = 0
+
+    def create_process(self, pid=None):
+        pid = self._new_pid(pid)
+        self.processes[pid] = {}
+        return pid
+
+    def fork(self, parent, child=None):
+        """Create a child sharing all of the parent's pages; return its pid"""
+        child = self._new_pid(child)
+        child_table = {}
+        for page, mapping in self.processes[parent].items():
+            # Private pages become copy-on-write in both processes
+            mapping.cow = True
+            child_table[page] = Mapping(mapping.key, True)
+            self._add_mapper(mapping.key, child, page)
+        self.processes[child] = child_table
+        self.forks += 1
+        self._update_peak()
+        return child
+
+    def exit(self, pid):
+        """Unmap every page of a process, freeing anonymous frames no one else maps"""
+        for page, mapping in self.processes.pop(pid).items():
+            self._unmap(mapping.key, pid, page)
+
+    def map_library(self, pid, library, base_page, num_pages):
+        """Map num_pages of a shared library at base_page; pages load on first access"""
+        table = self.processes[pid]
+        for index in range(num_pages):
+            key = ('file', library, index)
+            page = base_page + index
+            if page in table:
+                self._unmap(table[page].key, pid, page)
+            table[page] = Mapping(key, True)
+            self._add_mapper(key, pid, page)
+        self._update_peak()
+
+    def access(self, pid, page, write=False):
+        """Read or write one virtual page of a process and return a step_info-style dict"""
+        self.time_counter += 1
+        self.total_accesses += 1
+        table = self.processes[pid]
+        mapping = table.get(page)
+        fault = None
+
+        if mapping is None:
+            # First touch of anonymous memory: map a zero-filled page
+            mapping = Mapping(self._new_anon())
+            table[page] = mapping
+            self._add_mapper(mapping.key, pid, page)
+            self._load(mapping.key)
+            self.minor_faults += 1
+            self.fault_time += MINOR_FAULT_NS
+            fault = 'minor'
+        elif mapping.key not in self.resident:
+            self._load(mapping.key)
+            self.major_faults += 1
+            self.fault_time += MAJOR_FAULT_NS
+            fault = 'major'
+        else:
+            self.memory_frames[self.resident[mapping.key]].access(self.time_counter)
+            self.hits += 1
+
+        if write and mapping.cow:
+            self.cow_faults += 1
+            if len(self.mappers[mapping.key]) > 1 or mapping.key[0] == 'file':
+                self._copy(mapping, pid, page)
+                cost = COW_FAULT_NS
+            else:
+                # Last sharer: the page is simply made writable again
+                cost = MINOR_FAULT_NS
+            self.cow_time += cost
+            self.fault_time += cost
+            mapping.cow = False
+            fault = 'cow'
+
+        self._update_peak()
+        return {
+            'step_number': self.time_counter,
+            'pid': pid,
+            'page': page,
+            'write': write,
+            'frame_index': self.resident[mapping.key],
+            'page_fault': fault is not None,
+            'fault': fault
+        }
+
+    def run(self, events):
+        """Replay (operation, *arguments) events and return the statistics
+
+        Operations are ('access', pid, page, write), ('create', pid),
+        ('fork', parent, child), ('exit', pid) and
+        ('map', pid, library, base_page, num_pages).
+        """
+        operations = {
+            'access': self.access,
+            'create': self.create_process,
+            'fork': self.fork,
+            'exit': self.exit,
+            'map': self.map_library
+        }
+        for operation, *arguments in events:
+            operations[operation](*arguments)
+        return self.get_statistics()
+
+    def pages_saved(self):
+        """Frames that sharing saves compared with a private copy for every mapping"""
+        return self.shared_mappings
+
+    def _new_pid(self, pid):
+        if pid is None:
+            pid = self.next_pid
+        if pid in self.processes:
+            raise ValueError(f"Process {pid} already exists")
+        self.next_pid = max(self.next_pid, pid + 1)
+        return pid
+
+    def _new_anon(self):
+        self.next_anon += 1
+        return ('anon', self.next_anon)
+
+    def _copy(self, mapping, pid, page):
+        """Give this mapping its own copy of a shared page"""
+        self._remove_mapper(mapping.key, pid, page)
+        mapping.key = self._new_anon()
+        self._add_mapper(mapping.key, pid, page)
+        self._load(mapping.key)
+        self.cow_copies += 1
+
+    def _add_mapper(self, key, pid, page):
+        sharers = self.mappers.setdefault(key, set())
+        if sharers and key in self.resident:
+            self.shared_mappings += 1
+        sharers.add((pid, page))
+
+    def _remove_mapper(self, key, pid, page):
+        sharers = self.mappers[key]
+        sharers.discard((pid, page))
+        if sharers and key in self.resident:
+            self.shared_mappings -= 1
+
+    def _extra_mappings(self, key):
+        return max(0, len(self.mappers.get(key, ())) - 1)
+
+    def _unmap(self, key, pid, page):
+        self._remove_mapper(key, pid, page)
+        if self.mappers[key] or key[0] == 'file':
+            return
+        # Anonymous content no one maps is gone, in memory and in swap
+        del self.mappers[key]
+        frame_index = self.resident.pop(key, None)
+        if frame_index is not None:
+            self.memory_frames[frame_index].deallocate()
+
+    def _load(self, key):
+        """Bring a page's content into a frame, evicting a victim if memory is full"""
+        frame_index = self._find_free_frame()
+        if frame_index is None:
+            frame_index = self._select_victim()
+            victim = self.memory_frames[frame_index]
+            self.shared_mappings -= self._extra_mappings(victim.page)
+            del self.resident[victim.page]
+            victim.deallocate()
+            self.evictions += 1
+
+        self.memory_frames[frame_index].allocate(key, self.time_counter)
+        self.resident[key] = frame_index
+        self.shared_mappings += self._extra_mappings(key)
+
+    def _find_free_frame(self):
+        for i, frame in enumerate(self.memory_frames):
+            if not frame.allocated:
+                return i
+        return None
+
+    def _select_victim(self):
+        handler = self.algorithm_handler
+        if self.algorithm == "FIFO":
+            return handler.fifo(self.memory_frames)
+        elif self.algorithm == "LRU":
+            return handler.lru(self.memory_frames)
+        elif self.algorithm == "CLOCK":
+            return handler.clock(self.memory_frames, self.time_counter)
+        else:
+            return handler.random_replacement(self.memory_frames)
+
+    def _update_peak(self):
+        self.peak_pages_saved = max(self.peak_pages_saved, self.shared_mappings)
+
+    def get_statistics(self):
+        total_faults = self.minor_faults + self.major_faults
+        total_accesses = self.total_accesses
+        pages_saved = self.pages_saved()
+
+        return {
+            'processes': len(self.processes),
+            'forks': self.forks,
+            'total_accesses': total_accesses,
+            'hits': self.hits,
+            'page_faults': total_faults,
+            'minor_faults': self.minor_faults,
+            'major_faults': self.major_faults,
+            'fault_ratio': total_faults / total_accesses if total_accesses > 0 else 0,
+            'cow_faults': self.cow_faults,
+            'cow_copies': self.cow_copies,
+            'cow_fault_time_ns': self.cow_time,
+            'total_fault_time_ns': self.fault_time,
+            'evictions': self.evictions,
+            'resident_pages': len(self.resident),
+            'pages_saved': pages_saved,
+            'bytes_saved': pages_saved * self.page_size,
+            'peak_pages_saved': self.peak_pages_saved,
+            'peak_bytes_saved': self.peak_pages_saved * self.page_size
+        }
+
+def prefork_workload(workers=8, heap_pages=64, library_pages=128, requests=1000, touches=16,
+                     write_ratio=0.1, library_share=0.5, seed=0):
+    """Events of a pre-fork server: a master warms its heap and a library, then forks workers
+
+    Workers serve requests in round-robin order; each request touches
+    random heap and library pages and writes a write_ratio share of the
+    heap touches.
+    """
+    rng = random.Random(seed)
+    library_base = heap_pages
+    events = [('create', 0), ('map', 0, "libc", library_base, library_pages)]
+    events += [('access', 0, page, True) for page in range(heap_pages)]
+    events += [('access', 0, library_base + page, False) for page in range(library_pages)]
+    events += [('fork', 0, worker) for worker in range(1, workers + 1)]
+
+    for request in range(requests):
+        worker = 1 + request % workers
+        for _ in range(touches):
+            if rng.random() < library_share:
+                events.append(('access', worker, library_base + rng.randrange(library_pages), False))
+            else:
+                events.append(('access', worker, rng.randrange(heap_pages), rng.random() < write_ratio))
+    return events
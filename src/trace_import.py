@@ -0,0 +1,270 @@
+import gzip
+import os
+import re
+import time
+import numpy as np
+
+# .pages files are raw little-endian int64 page numbers, memory-mappable as is
+PAGE_TRACE_DTYPE = np.dtype('<i8')
+PAGE_TRACE_EXTENSION = ".pages"
+
+TRACE_FORMATS = ["auto", "lackey", "addresses"]
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+COMPRESSED_EXTENSIONS = (".gz", ".zst")
+
+_NEWLINE = ord('\n')
+_COMMA = ord(',')
+_SPACE = ord(' ')
+_BLANKS = (ord(' '), ord('\t'), ord('\r'))
+
+# Most digits that always fit in 64 bits
+_MAX_DIGITS = {16: 16, 10: 19}
+_POWERS_OF_TEN = np.array([10 ** place for place in range(_MAX_DIGITS[10])], dtype=np.uint64)
+
+_LACKEY_LINE = re.compile(rb"^(I  | [LSM] )[0-9a-fA-F]+,\d+")
+
+def _digit_table(base):
+    table = np.full(256, -1, dtype=np.int8)
+    for value, char in enumerate("0123456789abcdef"[:base]):
+        table[ord(char)] = value
+        table[ord(char.upper())] = value
+    return table
+
+def open_trace(path):
+    """Open a trace for binary reading, decompressing gzip or zstd by content"""
+    with open(path, 'rb') as f:
+        magic = f.read(len(ZSTD_MAGIC))
+
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(path, 'rb')
+
+    if magic == ZSTD_MAGIC:
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading zstd traces requires the zstandard package (pip install zstandard)")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True,
+                                                          closefd=True)
+
+    return open(path, 'rb')
+
+def detect_format(text):
+    """Guess the format from complete lines: Lackey if any line looks like a Lackey access"""
+    for line in text.splitlines()[:200]:
+        if _LACKEY_LINE.match(line):
+            return "lackey"
+    return "addresses"
+
+def _line_bounds(data):
+    """Start and end (newline position) of every line in a buffer ending in a newline"""
+    ends = np.flatnonzero(data == _NEWLINE)
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    return starts, ends
+
+def _lackey_tokens(data, starts, ends, kinds):
+    """Address spans of Lackey 'I  addr,size' and ' K addr,size' lines of the wanted kinds"""
+    usable = ends - starts >= 5
+    starts, ends = starts[usable], ends[usable]
+
+    first = data[starts]
+    second = data[starts + 1]
+    well_formed = (data[starts + 2] == _SPACE) & (
+        ((first == ord('I')) & (second == _SPACE)) |
+        ((first == _SPACE) & np.isin(second, np.frombuffer(b"LSM", dtype=np.uint8))))
+
+    # Every Lackey access has its address at column 3, up to the comma
+    commas = np.flatnonzero(data == _COMMA)
+    address_starts = starts + 3
+    next_comma = np.searchsorted(commas, address_starts)
+    has_comma = next_comma < len(commas)
+    address_ends = np.where(has_comma, commas[np.minimum(next_comma, len(commas) - 1)], ends)
+    well_formed &= has_comma & (address_ends < ends)
+
+    kind = np.where(first == _SPACE, second, first)
+    wanted = well_formed & np.isin(kind, np.frombuffer(kinds.encode(), dtype=np.uint8))
+    return address_starts[wanted], address_ends[wanted], int(np.count_nonzero(~well_formed))
+
+def _address_tokens(data, starts, ends):
+    """Span of the first word on every line, without a 0x prefix"""
+    blank = np.isin(data, np.array(_BLANKS, dtype=np.uint8))
+    separator = blank | (data == _NEWLINE)
+
+    words = np.flatnonzero(~separator)
+    first_word = np.searchsorted(words, starts)
+    has_word = first_word < len(words)
+    word_starts = np.where(has_word, words[np.minimum(first_word, len(words) - 1)], ends)
+    has_word &= word_starts < ends
+
+    word_starts = word_starts[has_word]
+    separators = np.flatnonzero(separator)
+    word_ends = separators[np.searchsorted(separators, word_starts)]
+
+    prefixed = ((word_ends - word_starts > 2) & (data[word_starts] == ord('0')) &
+                ((data[np.minimum(word_starts + 1, len(data) - 1)] | 0x20) == ord('x')))
+    word_starts = word_starts + 2 * prefixed
+    return word_starts, word_ends, int(np.count_nonzero(~has_word))
+
+def _parse_numbers(data, starts, ends, digits, base):
+    """Convert every span data[start:end] to a uint64 at once; return (numbers, rejected count)
+
+    Spans are grouped by length and evaluated digit column by digit
+    column (Horner's rule), so each step is one gather over all numbers.
+    """
+    lengths = ends - starts
+    numbers = np.zeros(len(starts), dtype=np.uint64)
+    invalid = (lengths <= 0) | (lengths > _MAX_DIGITS[base])
+    radix = np.uint64(base)
+
+    for length in np.unique(lengths[~invalid]):
+        rows = np.flatnonzero(lengths == length)
+        positions = starts[rows]
+        value = np.zeros(len(rows), dtype=np.uint64)
+        bad = np.zeros(len(rows), dtype=bool)
+        for column in range(length):
+            digit = digits.take(data.take(positions + column))
+            bad |= digit < 0
+            value *= radix
+            value += digit.astype(np.uint64)
+        numbers[rows] = value
+        invalid[rows] = bad
+
+    return numbers[~invalid], int(np.count_nonzero(invalid))
+
+class TraceImporter:
+    """Stream page numbers out of a text memory trace in large vectorized chunks
+
+    Supported formats are Valgrind Lackey output (--tool=lackey
+    --trace-mem=yes) and plain logs with one address per line, in hex
+    with or without 0x (or decimal with base=10); only the first word of
+    a line is read. gzip and zstd input is decompressed on the fly.
+    Chunks are parsed with numpy index arithmetic instead of per-line
+    Python, so import speed is close to the speed of reading the file.
+    """
+
+    def __init__(self, path, format="auto", page_size=4096, base=16, kinds="ILSM",
+                 collapse_repeats=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        if format not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format: {format}")
+        if page_size <= 0 or page_size & (page_size - 1):
+            raise ValueError("page_size must be a power of two")
+        if base not in _MAX_DIGITS:
+            raise ValueError("base must be 10 or 16")
+
+        self.path = path
+        self.format = format
+        self.page_shift = np.uint64(page_size.bit_length() - 1)
+        self.base = base
+        self.digits = _digit_table(base)
+        self.kinds = kinds
+        self.collapse_repeats = collapse_repeats
+        self.chunk_size = chunk_size
+
+        self.lines = 0
+        self.skipped = 0
+        self.references = 0
+        self.bytes_read = 0
+        self.elapsed = 0.0
+        self._last_page = None
+
+    def chunks(self):
+        """Yield int64 arrays of page numbers in trace order"""
+        carry = b""
+        with open_trace(self.path) as f:
+            while True:
+                started = time.perf_counter()
+                block = f.read(self.chunk_size)
+                if not block:
+                    break
+                self.bytes_read += len(block)
+
+                block = carry + block
+                cut = block.rfind(b"\n") + 1
+                carry = block[cut:]
+                pages = self._parse(block[:cut]) if cut else None
+                self.elapsed += time.perf_counter() - started
+                if pages is not None and len(pages):
+                    yield pages
+
+        if carry:
+            started = time.perf_counter()
+            pages = self._parse(carry + b"\n")
+            self.elapsed += time.perf_counter() - started
+            if len(pages):
+                yield pages
+
+    def write(self, output_path):
+        """Write the whole trace as a .pages file and return import statistics"""
+        temp_path = output_path + ".tmp"
+        with open(temp_path, 'wb') as out:
+            for pages in self.chunks():
+                out.write(pages.astype(PAGE_TRACE_DTYPE, copy=False).tobytes())
+        os.replace(temp_path, output_path)
+        return self.get_statistics()
+
+    def get_statistics(self):
+        return {
+            'format': self.format,
+            'lines': self.lines,
+            'skipped_lines': self.skipped,
+            'references': self.references,
+            'bytes_read': self.bytes_read,
+            'elapsed': self.elapsed,
+            'throughput_mb_s': self.bytes_read / self.elapsed / 1e6 if self.elapsed > 0 else 0
+        }
+
+    def _parse(self, text):
+        if self.format == "auto":
+            self.format = detect_format(text)
+
+        data = np.frombuffer(text, dtype=np.uint8)
+        starts, ends = _line_bounds(data)
+        self.lines += len(starts)
+
+        if self.format == "lackey":
+            token_starts, token_ends, malformed = _lackey_tokens(data, starts, ends, self.kinds)
+        else:
+            token_starts, token_ends, malformed = _address_tokens(data, starts, ends)
+
+        addresses, rejected = _parse_numbers(data, token_starts, token_ends, self.digits, self.base)
+        self.skipped += malformed + rejected
+
+        pages = (addresses >> self.page_shift).astype(np.int64)
+        if self.collapse_repeats and len(pages):
+            keep = np.empty(len(pages), dtype=bool)
+            keep[0] = pages[0] != self._last_page
+            np.not_equal(pages[1:], pages[:-1], out=keep[1:])
+            self._last_page = pages[-1]
+            pages = pages[keep]
+
+        self.references += len(pages)
+        return pages
+
+def default_output_path(path):
+    """trace.out.gz -> trace.pages"""
+    base = path
+    for extension in COMPRESSED_EXTENSIONS:
+        if base.endswith(extension):
+            base = base[:-len(extension)]
+    return os.path.splitext(base)[0] + PAGE_TRACE_EXTENSION
+
+def import_trace(path, output_path=None, **options):
+    """Convert a text trace to a .pages file and return import statistics"""
+    if output_path is None:
+        output_path = default_output_path(path)
+    statistics = TraceImporter(path, **options).write(output_path)
+    statistics['output_path'] = output_path
+    return statistics
+
+def is_page_trace(path):
+    return path.endswith(PAGE_TRACE_EXTENSION)
+
+def load_page_trace(path):
+    """Memory-map a .pages file as a read-only int64 array"""
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=PAGE_TRACE_DTYPE)
+    return np.memmap(path, dtype=PAGE_TRACE_DTYPE, mode='r')
@@ -1,40 +1,92 @@
 import json
 import datetime
-import matplotlib.pyplot as plt
 import os
 
-def save_simulation_results(simulator, filename=None):
-    """Save simulation results to JSON file"""
+def save_simulation_results(simulator, filename=None, format=None, compress=None):
+    """Save simulation results to a file
+
+    JSON is written unless format="binary" is given or the filename ends
+    in .vmr (binary format whose history columns load_simulation_results
+    memory-maps) or .npz (the same columns in a compressed archive).
+    """
+    timestamp = datetime.datetime.now()
+    
+    if format is None:
+        binary = filename is not None and filename.endswith((".vmr", ".npz"))
+        format = "binary" if binary else "json"
+    if compress is None:
+        compress = filename is not None and filename.endswith(".npz")
+    
     if filename is None:
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"simulation_results_{timestamp}.json"
+        if format == "json":
+            extension = "json"
+        else:
+            extension = "npz" if compress else "vmr"
+        filename = f"simulation_results_{timestamp.strftime('%Y%m%d_%H%M%S')}.{extension}"
     
-    results = {
-        'timestamp': datetime.datetime.now().isoformat(),
+    if format == "json":
+        from memory_simulator import iter_pages
+        results = {
+            'timestamp': timestamp.isoformat(),
+            'configuration': {
+                'num_frames': simulator.num_frames,
+                'page_size': simulator.page_size,
+                'algorithm': simulator.algorithm,
+                'reference_string': list(iter_pages(simulator.reference_string))
+            },
+            'statistics': simulator.get_statistics(),
+            'history': simulator.history,
+            'final_memory_state': simulator.get_memory_state(),
+            'page_table': simulator.get_page_table()
+        }
+        
+        with open(filename, 'w') as f:
+            json.dump(results, f, indent=2)
+            
+        return filename
+    
+    import numpy as np
+    from result_format import history_to_columns, write_binary_results
+    
+    metadata = {
+        'timestamp': timestamp.isoformat(),
         'configuration': {
             'num_frames': simulator.num_frames,
             'page_size': simulator.page_size,
-            'algorithm': simulator.algorithm,
-            'reference_string': simulator.reference_string
+            'algorithm': simulator.algorithm
         },
         'statistics': simulator.get_statistics(),
-        'history': simulator.history,
         'final_memory_state': simulator.get_memory_state(),
-        'page_table': simulator.get_page_table()
+        'page_table': [[page, frame] for page, frame in simulator.get_page_table().items()]
     }
     
-    with open(filename, 'w') as f:
-        json.dump(results, f, indent=2)
-        
-    return filename
+    columns = history_to_columns(simulator.history, simulator.num_frames)
+    columns['reference_string'] = np.asarray(simulator.reference_string, dtype='<i8')
+    
+    return write_binary_results(filename, metadata, columns, compress=compress)
 
 def load_simulation_results(filename):
-    """Load simulation results from JSON file"""
+    """Load simulation results saved by save_simulation_results
+
+    Binary files are opened lazily: the returned object behaves like the
+    JSON dict, but history entries are only decoded when accessed.
+    """
+    from result_format import is_binary_results, read_binary_results
+    
+    if is_binary_results(filename):
+        return read_binary_results(filename)
+    
     with open(filename, 'r') as f:
         return json.load(f)
 
-def generate_performance_report(simulator, algorithms=None):
-    """Generate comparative performance report for multiple algorithms"""
+def generate_performance_report(simulator, algorithms=None, cache=None):
+    """Generate comparative performance report for multiple algorithms
+
+    If a ResultCache is given, previously simulated configurations are
+    returned from the cache instead of being re-run.
+    """
+    from memory_simulator import MemorySimulator, iter_pages, trace_digest
+    
     if algorithms is None:
         algorithms = ["FIFO", "LRU", "OPTIMAL", "CLOCK"]
     
@@ -43,20 +95,26 @@ def generate_performance_report(simulator, algorithms=None):
         'configuration': {
             'num_frames': simulator.num_frames,
             'page_size': simulator.page_size,
-            'reference_string': simulator.reference_string
+            'reference_string': list(iter_pages(simulator.reference_string))
         },
         'comparison': {}
     }
     
-    from memory_simulator import MemorySimulator
+    if cache is not None:
+        digest = trace_digest(simulator.reference_string)
     
     for algo in algorithms:
+        if cache is not None:
+            report['comparison'][algo] = cache.get_or_run(
+                simulator.reference_string, simulator.num_frames, simulator.page_size, algo, digest=digest)
+            continue
+            
         temp_simulator = MemorySimulator()
         temp_simulator.initialize(simulator.num_frames, simulator.page_size, algo)
         temp_simulator.set_reference_string(simulator.reference_string)
         
         # Run simulation
-        for page in temp_simulator.reference_string:
+        for page in iter_pages(temp_simulator.reference_string):
             temp_simulator.simulate_step(page)
             
         report['comparison'][algo] = temp_simulator.get_statistics()
@@ -64,12 +122,25 @@ def generate_performance_report(simulator, algorithms=None):
     return report
 
 def plot_algorithm_comparison(report, save_path=None):
-    """Create visualization comparing algorithm performance"""
+    """Create visualization comparing algorithm performance
+
+    With save_path the chart is rendered on its own Agg canvas, leaving
+    the process-wide matplotlib backend (e.g. TkAgg in the GUI) untouched.
+    """
+    if save_path:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(12, 5))
+        FigureCanvasAgg(fig)
+    else:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=(12, 5))
+    
     algorithms = list(report['comparison'].keys())
     fault_rates = [report['comparison'][algo]['fault_ratio'] for algo in algorithms]
     hit_rates = [report['comparison'][algo]['hit_ratio'] for algo in algorithms]
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+    ax1, ax2 = fig.subplots(1, 2)
     
     # Page faults comparison
     bars1 = ax1.bar(algorithms, fault_rates, color='lightcoral', edgecolor='darkred')
@@ -95,11 +166,10 @@ def plot_algorithm_comparison(report, save_path=None):
         ax2.text(bar.get_x() + bar.get_width()/2., height + 0.01,
                 f'{height:.1%}', ha='center', va='bottom')
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
     else:
         plt.show()
 
@@ -1,11 +1,539 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.colors import LinearSegmentedColormap, ListedColormap, to_rgba
 from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
 import numpy as np
 
+# Above this many changed items a full redraw is cheaper than blitting each one
+MAX_BLIT_ITEMS = 64
+
+# Past these sizes frames and references are aggregated into images; single
+# cells and bars are only drawn for a zoomed-in window no larger than this
+DETAIL_FRAME_LIMIT = 64
+DETAIL_REFERENCE_LIMIT = 200
+FRAME_IMAGE_COLUMNS = 32
+
+def opaque(color, alpha, background='white'):
+    """Pre-blend a translucent color over the background so redraws do not accumulate"""
+    r, g, b, _ = to_rgba(color)
+    br, bg, bb, _ = to_rgba(background)
+    return (br + (r - br) * alpha, bg + (g - bg) * alpha, bb + (b - bb) * alpha, 1.0)
+
+def _reference_bin_count(ax, length):
+    """One heatmap column per pixel of the axes at most"""
+    return max(1, min(length, int(ax.bbox.width)))
+
+def _reference_bins(length, bins, start, stop):
+    """Heatmap column of each reference from start to stop - 1"""
+    return np.arange(start, stop, dtype=np.int64) * bins // length
+
+def _fault_flags(history, start, stop):
+    """1.0 per fault and 0.0 per hit; steps missing from the history count as faults"""
+    flags = np.ones(stop - start)
+    recorded = history[start:stop] if history is not None else []
+    flags[:len(recorded)] = [step['page_fault'] for step in recorded]
+    return flags
+
+def _fault_rates(executed, faults):
+    """Fault rate per heatmap column, NaN (drawn gray) where nothing has run yet"""
+    rates = np.full(len(executed), np.nan)
+    seen = executed > 0
+    rates[seen] = faults[seen] / executed[seen]
+    return rates[np.newaxis, :]
+
+def _visible_references(ax, length):
+    """Return (start, stop) of the references in view, or None if too many to draw singly"""
+    x0, x1 = sorted(ax.get_xlim())
+    start = max(0, int(np.ceil(x0 - 0.5)))
+    stop = min(length, int(np.floor(x1 + 0.5)) + 1)
+    if stop - start > DETAIL_REFERENCE_LIMIT:
+        return None
+    return start, stop
+
+def _visible_frames(ax, num_frames):
+    """Return the occupancy-grid frames in view, or None if too many to label"""
+    x0, x1 = sorted(ax.get_xlim())
+    y0, y1 = sorted(ax.get_ylim())
+    columns = range(max(0, int(np.floor(x0))), min(FRAME_IMAGE_COLUMNS, int(np.ceil(x1))))
+    rows = range(max(0, int(np.floor(y0))), int(np.ceil(y1)))
+    if len(columns) * len(rows) > DETAIL_FRAME_LIMIT:
+        return None
+    return [row * FRAME_IMAGE_COLUMNS + column for row in rows for column in columns
+            if row * FRAME_IMAGE_COLUMNS + column < num_frames]
+
+def _page_table_summary(page_table, num_frames=None):
+    summary = f"{len(page_table)} pages mapped\n"
+    if num_frames is not None:
+        summary += f"{num_frames - len(page_table)} of {num_frames} frames free\n"
+    return summary + "\nZoom into the frame grid\nto see individual pages"
+
 class MemoryVisualizer:
     def __init__(self):
         self.colors = plt.cm.Set3(np.linspace(0, 1, 12))
+        self.page_cmap = ListedColormap([opaque(color, 0.8) for color in self.colors]).with_extremes(
+            bad=opaque('lightgray', 0.8), under='white')
+        self.fault_cmap = LinearSegmentedColormap.from_list(
+            'hit_fault', [opaque('green', 0.7), opaque('red', 0.7)]).with_extremes(bad=opaque('gray', 0.7))
+        self.scene = None
+        
+    def render(self, fig, canvas, simulator):
+        """Draw the simulator state, redrawing only the artists that changed
+
+        The first call (or any change of layout, a reset, or a canvas without
+        blitting support) builds every artist once and does a full draw. Later
+        calls update colors and labels of changed frames, page-table rows and
+        reference bars, draw just those artists over the existing image and
+        blit their bounding boxes. The small statistics panel is restored from
+        its saved background and redrawn as a whole.
+
+        Past DETAIL_FRAME_LIMIT frames or DETAIL_REFERENCE_LIMIT references
+        the panel is drawn as a single image instead, and individual cells
+        and bars only appear for the window the user has zoomed into.
+        """
+        if self._needs_rebuild(fig, canvas, simulator):
+            self._build_scene(fig, canvas, simulator)
+            canvas.draw()
+            return
+        
+        scene = self.scene
+        if scene['background'] is None:
+            canvas.draw()
+            return
+        
+        groups = self._update_frames(simulator)
+        groups += self._update_page_table(simulator)
+        groups += self._update_reference(simulator)
+        self._update_statistics(simulator)
+        
+        if len(groups) > MAX_BLIT_ITEMS:
+            canvas.draw()
+            return
+        
+        for artists in groups:
+            self._blit_artists(canvas, artists)
+        
+        canvas.restore_region(scene['background'])
+        for artist in scene['stats_artists']:
+            fig.draw_artist(artist)
+        canvas.blit(scene['stats_ax'].bbox)
+        
+    def _needs_rebuild(self, fig, canvas, simulator):
+        scene = self.scene
+        return (scene is None
+                or scene['fig'] is not fig
+                or scene['simulator'] is not simulator
+                or not canvas.supports_blit
+                or scene['num_frames'] != len(simulator.memory_frames)
+                or scene['reference_string'] is not simulator.reference_string
+                or scene['reference_length'] != len(simulator.reference_string)
+                or simulator.time_counter < scene['step'])
+        
+    def _build_scene(self, fig, canvas, simulator):
+        if self.scene is not None and self.scene['draw_cid'] is not None:
+            self.scene['canvas'].mpl_disconnect(self.scene['draw_cid'])
+        
+        fig.clear()
+        gs = fig.add_gridspec(2, 2, width_ratios=[3, 1], height_ratios=[2, 1])
+        scene = {
+            'fig': fig,
+            'canvas': canvas,
+            'simulator': simulator,
+            'num_frames': len(simulator.memory_frames),
+            'reference_string': simulator.reference_string,
+            'reference_length': len(simulator.reference_string),
+            'step': simulator.time_counter,
+            'background': None,
+            'draw_cid': None,
+            'animated': []
+        }
+        self.scene = scene
+        
+        self._build_frames(fig.add_subplot(gs[0, 0]), simulator)
+        self._build_page_table(fig.add_subplot(gs[0, 1]), simulator)
+        self._build_reference(fig.add_subplot(gs[1, 0]), simulator)
+        self._build_statistics(fig.add_subplot(gs[1, 1]))
+        
+        self._update_frames(simulator)
+        self._update_page_table(simulator)
+        self._update_reference(simulator)
+        self._update_statistics(simulator)
+        
+        for artist in scene['animated']:
+            artist.set_animated(True)
+        
+        fig.tight_layout()
+        scene['draw_cid'] = canvas.mpl_connect('draw_event', self._on_draw)
+        
+    def _on_draw(self, event):
+        """After a full draw, save the statistics background and paint the animated artists"""
+        scene = self.scene
+        if scene is None or event.canvas is not scene['canvas']:
+            return
+        scene['background'] = scene['canvas'].copy_from_bbox(scene['stats_ax'].bbox)
+        for artist in scene['animated']:
+            scene['fig'].draw_artist(artist)
+        
+    def _blit_artists(self, canvas, artists):
+        fig = self.scene['fig']
+        renderer = canvas.get_renderer()
+        for artist in artists:
+            fig.draw_artist(artist)
+        bbox = Bbox.union([artist.get_window_extent(renderer) for artist in artists if artist.get_visible()])
+        canvas.blit(bbox.padded(2))
+        
+    def _add_animated(self, artists):
+        for artist in artists:
+            artist.set_animated(True)
+            self.scene['animated'].append(artist)
+        
+    def _remove_animated(self, artists):
+        artists = set(artists)
+        for artist in artists:
+            artist.remove()
+        self.scene['animated'] = [artist for artist in self.scene['animated'] if artist not in artists]
+        
+    def _build_frames(self, ax, simulator):
+        scene = self.scene
+        num_frames = len(simulator.memory_frames)
+        scene['frames_ax'] = ax
+        scene['frame_cells'] = []
+        scene['frame_image'] = None
+        scene['frame_labels'] = {}
+        
+        if num_frames > DETAIL_FRAME_LIMIT:
+            ax.set_title('Memory Frames (occupancy)', fontsize=14, fontweight='bold')
+            scene['frame_grid'] = self._frame_grid(simulator.memory_frames)
+            scene['frame_image'] = self._draw_frame_image(ax, scene['frame_grid'])
+            scene['animated'].append(scene['frame_image'])
+            ax.callbacks.connect('xlim_changed', self._on_frames_zoom)
+            ax.callbacks.connect('ylim_changed', self._on_frames_zoom)
+            return
+        
+        ax.set_title('Memory Frames', fontsize=14, fontweight='bold')
+        cells = []
+        for i in range(num_frames):
+            x = i % 4
+            y = i // 4
+            rect = patches.Rectangle((x, y), 0.8, 0.8, linewidth=2,
+                                     edgecolor='black', facecolor='lightgray')
+            ax.add_patch(rect)
+            label = ax.text(x + 0.4, y + 0.4, '', ha='center', va='center')
+            frame_text = ax.text(x + 0.4, y + 0.3, '', ha='center', va='center', fontsize=10)
+            ref_text = ax.text(x + 0.4, y + 0.1, '', ha='center', va='center', fontsize=9)
+            cells.append({'x': x, 'y': y, 'artists': [rect, label, frame_text, ref_text], 'state': None})
+            scene['animated'].extend([rect, label, frame_text, ref_text])
+        
+        ax.set_xlim(0, 4)
+        ax.set_ylim(0, (num_frames + 3) // 4)
+        ax.set_aspect('equal')
+        ax.axis('off')
+        scene['frame_cells'] = cells
+        
+    def _update_frames(self, simulator):
+        if self.scene['frame_image'] is not None:
+            return self._update_frame_image(simulator)
+        
+        changed = []
+        for cell, frame in zip(self.scene['frame_cells'], simulator.memory_frames):
+            loaded = frame.allocated and frame.page is not None
+            state = (frame.page, frame.reference_bit) if loaded else None
+            if state == cell['state']:
+                continue
+            cell['state'] = state
+            
+            rect, label, frame_text, ref_text = cell['artists']
+            x, y = cell['x'], cell['y']
+            if loaded:
+                rect.set_facecolor(opaque(self.colors[frame.page % len(self.colors)], 0.8))
+                label.set_text(f'Page {frame.page}')
+                label.set_position((x + 0.4, y + 0.6))
+                label.set_fontsize(12)
+                label.set_fontweight('bold')
+                label.set_fontstyle('normal')
+                frame_text.set_text(f'Frame {frame.frame_id}')
+                ref_text.set_text(f'Ref: {frame.reference_bit}')
+            else:
+                rect.set_facecolor(opaque('lightgray', 0.8))
+                label.set_text('Free')
+                label.set_position((x + 0.4, y + 0.4))
+                label.set_fontsize(11)
+                label.set_fontweight('normal')
+                label.set_fontstyle('italic')
+                frame_text.set_text('')
+                ref_text.set_text('')
+            changed.append(cell['artists'])
+        return changed
+        
+    def _update_frame_image(self, simulator):
+        """Recolor the occupancy image; zoomed-in labels are redrawn on top of it"""
+        scene = self.scene
+        grid = self._frame_grid(simulator.memory_frames)
+        if np.array_equal(grid, scene['frame_grid'], equal_nan=True):
+            return []
+        
+        scene['frame_grid'] = grid
+        scene['frame_image'].set_data(grid)
+        labels = scene['frame_labels']
+        for i, text in labels.items():
+            text.set_text(self._frame_label(simulator.memory_frames[i]))
+        return [[scene['frame_image']] + list(labels.values())]
+        
+    def _on_frames_zoom(self, ax):
+        scene = self.scene
+        if scene is None or scene.get('frames_ax') is not ax:
+            return
+        self._remove_animated(scene['frame_labels'].values())
+        
+        memory_frames = scene['simulator'].memory_frames
+        indices = _visible_frames(ax, len(memory_frames)) or []
+        labels = self._draw_frame_labels(ax, [self._frame_label(memory_frames[i]) for i in indices], indices)
+        self._add_animated(labels.values())
+        scene['frame_labels'] = labels
+        
+    def _build_page_table(self, ax, simulator):
+        scene = self.scene
+        num_frames = len(simulator.memory_frames)
+        ax.set_title('Page Table', fontsize=14, fontweight='bold')
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
+        
+        rows = []
+        scene['page_table_summary'] = None
+        if num_frames > DETAIL_FRAME_LIMIT:
+            background = patches.Rectangle((0, 0), 1, 1, facecolor='white',
+                                           edgecolor='none', transform=ax.transAxes)
+            ax.add_patch(background)
+            text = ax.text(0.05, 0.95, '', va='top', fontsize=10, transform=ax.transAxes)
+            scene['page_table_summary'] = {'artists': [background, text], 'text': None}
+            scene['animated'].extend([background, text])
+            num_frames = 0
+        
+        row_height = 1 / max(num_frames, 1)
+        for i in range(num_frames):
+            y = 1 - (i + 1) * row_height
+            background = patches.Rectangle((0, y), 1, row_height, facecolor='white',
+                                           edgecolor='none', transform=ax.transAxes)
+            ax.add_patch(background)
+            text = ax.text(0.05, y + row_height / 2, '', va='center', fontsize=10,
+                           fontweight='bold', transform=ax.transAxes)
+            rows.append({'artists': [background, text], 'page': False})
+            scene['animated'].extend([background, text])
+        scene['page_table_rows'] = rows
+        
+    def _update_page_table(self, simulator):
+        summary = self.scene['page_table_summary']
+        if summary is not None:
+            text = _page_table_summary(simulator.page_table, len(simulator.memory_frames))
+            if text == summary['text']:
+                return []
+            summary['text'] = text
+            summary['artists'][1].set_text(text)
+            return [summary['artists']]
+        
+        changed = []
+        for row, frame in zip(self.scene['page_table_rows'], simulator.memory_frames):
+            page = frame.page if frame.allocated else None
+            if page == row['page']:
+                continue
+            row['page'] = page
+            
+            background, text = row['artists']
+            if page is None:
+                text.set_text(f'Frame {frame.frame_id}: -')
+                background.set_facecolor('white')
+            else:
+                text.set_text(f'Page {page} → Frame {frame.frame_id}')
+                background.set_facecolor(opaque('skyblue', 0.6))
+            changed.append(row['artists'])
+        return changed
+        
+    def _build_reference(self, ax, simulator):
+        scene = self.scene
+        reference_string = simulator.reference_string
+        ax.set_title('Reference String Progress', fontsize=14, fontweight='bold')
+        scene['reference_ax'] = ax
+        scene['reference_items'] = {}
+        scene['reference_image'] = None
+        scene['reference_drawn'] = 0
+        
+        if not reference_string:
+            ax.text(0.5, 0.5, 'No reference string set', 
+                   ha='center', va='center', fontsize=12, style='italic')
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
+            ax.axis('off')
+            return
+        
+        if len(reference_string) > DETAIL_REFERENCE_LIMIT:
+            bins = _reference_bin_count(ax, len(reference_string))
+            scene['reference_executed'] = np.zeros(bins)
+            scene['reference_faults'] = np.zeros(bins)
+            scene['reference_image'] = self._draw_reference_image(
+                ax, _fault_rates(scene['reference_executed'], scene['reference_faults']), len(reference_string))
+            scene['animated'].append(scene['reference_image'])
+            ax.callbacks.connect('xlim_changed', self._on_reference_zoom)
+            return
+        
+        x = np.arange(len(reference_string))
+        bars = ax.bar(x, [1] * len(reference_string), color=opaque('gray', 0.7))
+        for i, (bar, page) in enumerate(zip(bars, reference_string)):
+            text = ax.text(bar.get_x() + bar.get_width()/2., 0.5, str(page),
+                           ha='center', va='center', fontweight='bold', color='black')
+            scene['reference_items'][i] = [bar, text]
+            scene['animated'].extend([bar, text])
+        
+        ax.set_xlabel('Step')
+        ax.set_ylabel('Page')
+        ax.set_xticks(x)
+        ax.set_yticks([])
+        ax.set_ylim(0, 1.2)
+        
+    def _update_reference(self, simulator):
+        scene = self.scene
+        start = scene['reference_drawn']
+        current_step = min(simulator.time_counter, scene['reference_length'])
+        scene['step'] = simulator.time_counter
+        if current_step <= start:
+            return []
+        scene['reference_drawn'] = current_step
+        
+        items = scene['reference_items']
+        changed = [items[i] for i in sorted(items) if start <= i < current_step]
+        for bar, text in changed:
+            bar.set_facecolor(opaque('red', 0.7))
+            text.set_color('white')
+        
+        image = scene['reference_image']
+        if image is None:
+            return changed
+        
+        length = scene['reference_length']
+        bins = len(scene['reference_executed'])
+        index = _reference_bins(length, bins, start, current_step)
+        scene['reference_executed'] += np.bincount(index, minlength=bins)
+        scene['reference_faults'] += np.bincount(
+            index, weights=_fault_flags(simulator.history, start, current_step), minlength=bins)
+        image.set_data(_fault_rates(scene['reference_executed'], scene['reference_faults']))
+        return [[image] + [artist for item in items.values() for artist in item]]
+        
+    def _on_reference_zoom(self, ax):
+        scene = self.scene
+        if scene is None or scene.get('reference_ax') is not ax:
+            return
+        self._remove_animated([artist for item in scene['reference_items'].values() for artist in item])
+        
+        window = _visible_references(ax, scene['reference_length'])
+        items = {}
+        if window is not None:
+            items = self._draw_reference_details(ax, scene['reference_string'],
+                                                 scene['reference_drawn'], *window)
+        self._add_animated([artist for item in items.values() for artist in item])
+        scene['reference_items'] = items
+        
+    def _build_statistics(self, ax):
+        scene = self.scene
+        ax.set_title('Performance Metrics', fontsize=14, fontweight='bold')
+        
+        bars = ax.bar(['Hit Ratio', 'Fault Ratio'], [0, 0], color=['green', 'red'],
+                      alpha=0.7, edgecolor='black')
+        labels = [ax.text(bar.get_x() + bar.get_width()/2., 0.01, '', ha='center',
+                          va='bottom', fontweight='bold') for bar in bars]
+        info = ax.text(0.02, 0.98, '', transform=ax.transAxes, va='top', ha='left', fontsize=10,
+                       bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+        empty = ax.text(0.5, 0.5, 'No data available', transform=ax.transAxes,
+                        ha='center', va='center', fontsize=12, style='italic')
+        
+        # Headroom keeps the value labels inside the axes area that gets restored
+        ax.set_ylabel('Ratio')
+        ax.set_ylim(0, 1.15)
+        ax.set_yticks(np.linspace(0, 1, 6))
+        ax.grid(axis='y', alpha=0.3)
+        
+        scene['stats_ax'] = ax
+        scene['stats_bars'] = list(bars)
+        scene['stats_labels'] = labels
+        scene['stats_info'] = info
+        scene['stats_empty'] = empty
+        scene['stats_artists'] = list(bars) + labels + [info, empty]
+        scene['animated'].extend(scene['stats_artists'])
+        
+    def _update_statistics(self, simulator):
+        scene = self.scene
+        statistics = simulator.get_statistics()
+        has_data = statistics['total_accesses'] > 0
+        values = [statistics['hit_ratio'], statistics['fault_ratio']]
+        
+        for bar, label, value in zip(scene['stats_bars'], scene['stats_labels'], values):
+            bar.set_height(value)
+            bar.set_visible(has_data)
+            label.set_y(value + 0.01)
+            label.set_text(f'{value:.1%}')
+            label.set_visible(has_data)
+        
+        info_text = f"Step: {simulator.time_counter}\n"
+        info_text += f"Total: {statistics['total_accesses']}\n"
+        info_text += f"Hits: {statistics['hits']}\n"
+        info_text += f"Faults: {statistics['page_faults']}\n"
+        info_text += f"Algorithm: {statistics['algorithm']}"
+        scene['stats_info'].set_text(info_text)
+        scene['stats_info'].set_visible(has_data)
+        scene['stats_empty'].set_visible(not has_data)
+        
+    def _frame_grid(self, memory_frames):
+        """Color index of each frame in rows of FRAME_IMAGE_COLUMNS (NaN for free, -1 for padding)"""
+        rows = max(1, -(-len(memory_frames) // FRAME_IMAGE_COLUMNS))
+        grid = np.full(rows * FRAME_IMAGE_COLUMNS, -1.0)
+        grid[:len(memory_frames)] = [frame.page % len(self.colors) if frame.allocated and frame.page is not None
+                                     else np.nan for frame in memory_frames]
+        return grid.reshape(rows, FRAME_IMAGE_COLUMNS)
+        
+    def _draw_frame_image(self, ax, grid):
+        rows, columns = grid.shape
+        image = ax.imshow(grid, cmap=self.page_cmap, vmin=-0.5, vmax=len(self.colors) - 0.5,
+                          interpolation='nearest', origin='lower', aspect='auto',
+                          extent=(0, columns, 0, rows))
+        ax.set_xlim(0, columns)
+        ax.set_ylim(0, rows)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        return image
+        
+    def _frame_label(self, frame):
+        if frame.allocated and frame.page is not None:
+            return f'Page {frame.page}\nFrame {frame.frame_id}'
+        return 'Free'
+        
+    def _draw_frame_labels(self, ax, labels, indices):
+        """Label the occupancy cells of the given frames, labels[k] belonging to indices[k]"""
+        return {i: ax.text(i % FRAME_IMAGE_COLUMNS + 0.5, i // FRAME_IMAGE_COLUMNS + 0.5, label,
+                           ha='center', va='center', fontsize=8)
+                for i, label in zip(indices, labels)}
+        
+    def _draw_reference_image(self, ax, rates, length):
+        image = ax.imshow(rates, cmap=self.fault_cmap, vmin=0, vmax=1, interpolation='nearest',
+                          aspect='auto', extent=(-0.5, length - 0.5, 0, 1))
+        ax.set_xlim(-0.5, length - 0.5)
+        ax.set_ylim(0, 1.2)
+        ax.set_autoscale_on(False)
+        ax.set_xlabel('Step')
+        ax.set_ylabel('Fault rate')
+        ax.set_yticks([])
+        return image
+        
+    def _draw_reference_details(self, ax, reference_string, current_step, start, stop):
+        """Per-reference bars and labels for steps start..stop-1 over the heatmap"""
+        items = {}
+        for i in range(start, stop):
+            executed = i < current_step
+            bar = patches.Rectangle((i - 0.5, 0), 1, 1, edgecolor='white',
+                                    facecolor=opaque('red' if executed else 'gray', 0.7))
+            ax.add_patch(bar)
+            text = ax.text(i, 0.5, str(reference_string[i]), ha='center', va='center',
+                           fontweight='bold', color='white' if executed else 'black')
+            items[i] = [bar, text]
+        return items
         
     def plot_memory_state(self, fig, simulator):
         memory_frames = simulator.memory_frames
@@ -25,7 +553,7 @@ class MemoryVisualizer:
         
         # Reference string progress
         ax3 = fig.add_subplot(gs[1, 0])
-        self.plot_reference_progress(ax3, simulator.reference_string, current_step)
+        self.plot_reference_progress(ax3, simulator.reference_string, current_step, simulator.history)
         
         # Statistics
         ax4 = fig.add_subplot(gs[1, 1])
@@ -38,6 +566,11 @@ class MemoryVisualizer:
         ax.set_title(f'Memory Frames (Step: {current_step})', fontsize=14, fontweight='bold')
         
         num_frames = len(memory_frames)
+        if num_frames > DETAIL_FRAME_LIMIT:
+            self._draw_frame_image(ax, self._frame_grid(memory_frames))
+            labels = [self._frame_label(frame) for frame in memory_frames]
+            self._connect_zoom_details(ax, lambda: self._snapshot_frame_labels(ax, labels))
+            return
         
         for i, frame in enumerate(memory_frames):
             x = i % 4
@@ -77,6 +610,12 @@ class MemoryVisualizer:
             ax.set_ylim(0, 1)
             ax.axis('off')
             return
+        
+        if len(page_table) > DETAIL_FRAME_LIMIT:
+            ax.text(0.05, 0.95, _page_table_summary(page_table),
+                    va='top', fontsize=10, transform=ax.transAxes)
+            ax.axis('off')
+            return
             
         pages = list(page_table.keys())
         frames = list(page_table.values())
@@ -93,7 +632,7 @@ class MemoryVisualizer:
         for i, v in enumerate(frames):
             ax.text(v + 0.1, i, str(v), va='center', fontweight='bold')
             
-    def plot_reference_progress(self, ax, reference_string, current_step):
+    def plot_reference_progress(self, ax, reference_string, current_step, history=None):
         ax.clear()
         ax.set_title('Reference String Progress', fontsize=14, fontweight='bold')
         
@@ -104,6 +643,10 @@ class MemoryVisualizer:
             ax.set_ylim(0, 1)
             ax.axis('off')
             return
+        
+        if len(reference_string) > DETAIL_REFERENCE_LIMIT:
+            self._plot_reference_heatmap(ax, reference_string, current_step, history)
+            return
             
         x = np.arange(len(reference_string))
         colors = ['red' if i < current_step else 'gray' for i in range(len(reference_string))]
@@ -123,6 +666,37 @@ class MemoryVisualizer:
         ax.set_yticks([])
         ax.set_ylim(0, 1.2)
         
+    def _snapshot_frame_labels(self, ax, labels):
+        indices = _visible_frames(ax, len(labels)) or []
+        return list(self._draw_frame_labels(ax, [labels[i] for i in indices], indices).values())
+        
+    def _plot_reference_heatmap(self, ax, reference_string, current_step, history):
+        """Fault rate per step range, green for hits and red for faults, gray where not yet run"""
+        length = len(reference_string)
+        current_step = min(current_step, length)
+        bins = _reference_bin_count(ax, length)
+        index = _reference_bins(length, bins, 0, current_step)
+        executed = np.bincount(index, minlength=bins)
+        faults = np.bincount(index, weights=_fault_flags(history, 0, current_step), minlength=bins)
+        
+        self._draw_reference_image(ax, _fault_rates(executed, faults), length)
+        self._connect_zoom_details(ax, lambda: [
+            artist for item in self._draw_reference_details(
+                ax, reference_string, current_step, *(_visible_references(ax, length) or (0, 0))).values()
+            for artist in item])
+        
+    def _connect_zoom_details(self, ax, draw_details):
+        """Replace the artists made by draw_details whenever the view of ax changes"""
+        details = []
+        
+        def on_zoom(ax):
+            for artist in details:
+                artist.remove()
+            details[:] = draw_details()
+        
+        ax.callbacks.connect('xlim_changed', on_zoom)
+        ax.callbacks.connect('ylim_changed', on_zoom)
+        
     def plot_statistics(self, ax, statistics):
         ax.clear()
         ax.set_title('Performance Metrics', fontsize=14, fontweight='bold')
@@ -0,0 +1,94 @@
+import pytest
+from allocation_replay import ALLOC, EXIT, FREE, AllocationEvent, AllocationReplayer, read_allocation_trace
+from segmentation import SegmentationSimulator
+
+def fragmenting_events(size):
+    """Fill three 100-byte regions, free the outer two, then ask for size bytes"""
+    events = [AllocationEvent(0, ALLOC, pid, "data", 100) for pid in (1, 2, 3)]
+    events += [AllocationEvent(1, FREE, pid, "data", 0) for pid in (1, 3)]
+    events.append(AllocationEvent(2, ALLOC, 4, "data", size))
+    return events
+
+def test_dynamic_partitions_compact_and_retry():
+    engine = SegmentationSimulator(300)
+    stats = AllocationReplayer(engine, compaction_threshold=0.1).replay(fragmenting_events(150))
+
+    assert stats['compactions'] == 1
+    assert stats['bytes_moved'] == 100
+    assert stats['failures'] == 0
+    # The retried allocation counts once, as a success
+    engine_stats = engine.get_statistics()
+    assert engine_stats['failed_allocations'] == 0
+    assert engine_stats['allocations'] == 4
+    assert [sample[0] for sample in engine.fragmentation_history] == list(range(1, 7))
+
+def test_compaction_threshold_above_the_fragmentation_skips_compaction():
+    engine = SegmentationSimulator(300)
+    # Free 200 bytes in two 100-byte holes: external fragmentation ratio 0.5
+    stats = AllocationReplayer(engine, compaction_threshold=0.6).replay(fragmenting_events(150))
+
+    assert stats['compactions'] == 0
+    assert stats['failures'] == 1
+    assert engine.get_statistics()['failed_allocations'] == 1
+
+def test_failed_retry_counts_one_failure():
+    # 250 bytes free, but 220 bytes round up to a 300-byte block even after compaction
+    engine = SegmentationSimulator(350, allocation_unit=100)
+    stats = AllocationReplayer(engine, compaction_threshold=0.1).replay(fragmenting_events(220))
+
+    assert stats['compactions'] == 1
+    assert engine.get_statistics()['failed_allocations'] == stats['failures'] == 1
+
+def test_free_and_exit_events():
+    engine = SegmentationSimulator(1000)
+    events = [AllocationEvent(0, ALLOC, 1, "code", 100),
+              AllocationEvent(0, ALLOC, 1, "heap", 200),
+              AllocationEvent(0, ALLOC, 2, "code", 50),
+              AllocationEvent(1, FREE, 1, "heap", 0),
+              AllocationEvent(1, FREE, 9, "missing", 0),
+              AllocationEvent(2, EXIT, 1, "", 0)]
+    stats = AllocationReplayer(engine).replay(events)
+
+    assert (stats['allocations'], stats['frees'], stats['process_exits']) == (3, 2, 1)
+    assert engine.process_segments == {2: {"code": engine.process_segments[2]["code"]}}
+    assert engine.allocated_bytes == 50
+
+def test_read_allocation_trace(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text("timestamp,op,process,segment,size\n"
+                    "# warm-up\n"
+                    "\n"
+                    "0.5,ALLOC,1,code,64\n"
+                    "1,free,1,code\n"
+                    "2,exit,1\n")
+
+    assert list(read_allocation_trace(str(path))) == [
+        AllocationEvent(0.5, ALLOC, 1, "code", 64),
+        AllocationEvent(1.0, FREE, 1, "code", 0),
+        AllocationEvent(2.0, EXIT, 1, "", 0)
+    ]
+
+@pytest.mark.parametrize("row, message", [
+    ("0,alloc,1,code,", "alloc needs a positive size"),
+    ("0,alloc,1,code,-4", "alloc needs a positive size"),
+    ("0,alloc,1,,16", "needs a segment name"),
+    ("0,alloc,x,code,16", "invalid literal"),
+    ("0,resize,1,code,16", "unknown operation")
+])
+def test_malformed_rows_are_rejected_with_their_line(tmp_path, row, message):
+    path = tmp_path / "trace.csv"
+    path.write_text("0,alloc,1,data,8\n" + row + "\n")
+
+    with pytest.raises(ValueError, match=f"trace.csv:2: .*{message}"):
+        list(read_allocation_trace(str(path)))
+
+def test_fixed_partitions_are_never_compacted():
+    engine = SegmentationSimulator(300)
+    engine.initialize_segments([100, 100, 100])
+    assert not engine.supports_compaction
+
+    stats = AllocationReplayer(engine, compaction_threshold=0.1).replay(fragmenting_events(150))
+
+    assert stats['compactions'] == 0
+    assert stats['bytes_moved'] == 0
+    assert stats['failures'] == 1
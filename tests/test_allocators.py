@@ -0,0 +1,99 @@
+import random
+import pytest
+from allocators import BuddyAllocator, SlabAllocator
+
+def free_blocks(buddy):
+    return sorted((base, buddy.min_block << order)
+                  for order, free in enumerate(buddy.free_lists) for base in free)
+
+def accounted_bytes(engine):
+    """Requested + internal fragmentation + free memory: every byte of the engine"""
+    frag = engine.calculate_fragmentation()
+    return (engine.requested_bytes + frag['internal_fragmentation'] + frag['free_memory']
+            + frag.get('unusable_memory', 0))
+
+def test_buddy_splits_and_coalesces():
+    buddy = BuddyAllocator(1024, min_block=16)
+    segment = buddy.allocate_segment(1, "a", 100)
+
+    assert (segment.base, segment.limit) == (0, 128)
+    assert free_blocks(buddy) == [(128, 128), (256, 256), (512, 512)]
+
+    other = buddy.allocate_segment(2, "a", 100)
+    assert other.base == 128
+    buddy.deallocate_segment(1, "a")
+    assert free_blocks(buddy) == [(0, 128), (256, 256), (512, 512)]
+    buddy.deallocate_segment(2, "a")
+    assert free_blocks(buddy) == [(0, 1024)]
+
+def test_buddy_uses_memory_beyond_the_top_block():
+    buddy = BuddyAllocator(1000, min_block=16)
+
+    assert free_blocks(buddy) == [(0, 512), (512, 256), (768, 128), (896, 64), (960, 32)]
+    frag = buddy.calculate_fragmentation()
+    assert frag['free_memory'] == 992
+    assert frag['unusable_memory'] == 8
+    for process_id, size in enumerate([512, 256, 128, 64, 32]):
+        assert buddy.allocate_segment(process_id, "a", size) is not None
+    assert buddy.allocate_segment(9, "a", 16) is None
+
+    for process_id in range(5):
+        buddy.deallocate_segment(process_id, "a")
+    assert free_blocks(buddy) == [(0, 512), (512, 256), (768, 128), (896, 64), (960, 32)]
+
+def test_slab_routes_requests_to_size_classes():
+    slab = SlabAllocator(1024, slab_size=64, size_classes=(4, 8, 16, 32, 64))
+
+    assert slab.allocate_segment(1, "a", 3).limit == 4
+    assert slab.allocate_segment(1, "b", 5).limit == 8
+    assert slab.allocate_segment(1, "c", 64).limit == 64
+    assert [slab.caches[size].slab_count for size in (4, 8, 16, 32, 64)] == [1, 1, 0, 0, 1]
+
+    # Objects of one class share a slab until it is full
+    second = slab.allocate_segment(2, "a", 4)
+    assert second.base == slab.process_segments[1]["a"].base + 4
+    assert slab.caches[4].slab_count == 1
+
+def test_slab_large_objects_take_whole_slabs_from_the_pool():
+    slab = SlabAllocator(1024, slab_size=64)
+    large = slab.allocate_segment(1, "big", 65)
+
+    assert large.limit == 128
+    assert large.base in slab.large_objects
+    assert slab.free_space.free_bytes == 1024 - 128
+
+    slab.deallocate_segment(1, "big")
+    assert list(slab.free_space.iter_holes()) == [(0, 1024)]
+
+def test_slab_returns_empty_slabs_to_the_pool():
+    slab = SlabAllocator(256, slab_size=64)
+    for name in "abc":
+        slab.allocate_segment(1, name, 16)
+    assert slab.free_space.free_bytes == 192
+
+    slab.deallocate_process(1)
+    assert slab.caches[16].slab_count == 0
+    assert list(slab.free_space.iter_holes()) == [(0, 256)]
+    assert slab.calculate_fragmentation()['hole_count'] == 1
+
+@pytest.mark.parametrize("engine", [
+    lambda: BuddyAllocator(1000, min_block=16),
+    lambda: SlabAllocator(1000, slab_size=64, size_classes=(8, 24, 64))
+])
+def test_memory_accounting_holds_under_random_alloc_free(engine):
+    engine = engine()
+    rng = random.Random(7)
+    live = []
+
+    for step in range(800):
+        if live and rng.random() < 0.45:
+            assert engine.deallocate_segment(*live.pop(rng.randrange(len(live))))
+        elif engine.allocate_segment(step, "a", rng.choice([rng.randint(1, 64), rng.randint(65, 200)])):
+            live.append((step, "a"))
+        assert accounted_bytes(engine) == engine.total_memory
+
+    for process_id, name in live:
+        engine.deallocate_segment(process_id, name)
+    frag = engine.calculate_fragmentation()
+    assert engine.allocated_bytes == engine.requested_bytes == 0
+    assert frag['free_memory'] + frag.get('unusable_memory', 0) == engine.total_memory
@@ -0,0 +1,34 @@
+import pytest
+from analysis import (analyze_trace, fault_curves, find_anomalies, random_traces, scan_traces,
+                      simulated_fault_curve, stack_fault_curve)
+
+BELADY_TRACE = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+
+@pytest.mark.parametrize("algorithm", ["LRU", "OPTIMAL"])
+def test_stack_curves_match_simulation(algorithm):
+    frame_counts = list(range(1, 9))
+    for name, trace in random_traces(25, length=40, max_page=9, seed=4).items():
+        assert stack_fault_curve(trace, algorithm, 8) == simulated_fault_curve(trace, frame_counts, algorithm), name
+
+def test_fifo_shows_beladys_anomaly_on_the_classic_trace():
+    result = analyze_trace(BELADY_TRACE, [1, 2, 3, 4, 5], ["FIFO", "LRU"])
+
+    assert result['curves']['FIFO'] == [12, 12, 9, 10, 5]
+    assert result['anomalies'] == {'FIFO': [{'frames': 3, 'faults': 9, 'more_frames': 4, 'more_faults': 10}]}
+
+def test_find_anomalies_ignores_equal_and_falling_counts():
+    assert find_anomalies([1, 2, 3], [5, 5, 4]) == []
+
+def test_random_curves_are_reproducible():
+    traces = random_traces(10, length=40, max_page=7, seed=2)
+    first = scan_traces(traces, list(range(1, 7)), ["RANDOM", "FIFO"], seed=3)
+    second = scan_traces(traces, list(range(1, 7)), ["RANDOM", "FIFO"], seed=3)
+
+    assert first == second
+    trace = traces['random-0']
+    assert fault_curves(trace, [2, 3, 4], ["RANDOM"], seed=5) == fault_curves(trace, [2, 3, 4], ["RANDOM"], seed=5)
+
+def test_parallel_scan_matches_serial():
+    traces = random_traces(12, length=30, max_page=6, seed=8)
+    algorithms = ["FIFO", "LRU", "RANDOM"]
+    assert scan_traces(traces, [1, 2, 3, 4], algorithms, workers=2) == scan_traces(traces, [1, 2, 3, 4], algorithms)
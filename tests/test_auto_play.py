@@ -0,0 +1,42 @@
+import time
+import pytest
+from main import (AUTO_PLAY_BUDGET, AUTO_PLAY_MAX_LAG, AUTO_PLAY_RENDER_SHARE, auto_play_budget,
+                  auto_play_due, simulate_steps)
+from memory_simulator import MemorySimulator
+
+def make_simulator(length=5000):
+    simulator = MemorySimulator()
+    simulator.initialize(8, 1024, "LRU")
+    simulator.set_reference_string([i % 20 for i in range(length)])
+    return simulator
+
+def test_due_steps_follow_the_rate():
+    assert auto_play_due(0.0, 100, 0.05) == pytest.approx(5)
+    assert auto_play_due(0.5, 10, 0.016) == pytest.approx(0.66)
+
+def test_due_steps_are_capped_after_a_stall():
+    rate = 10000
+    assert auto_play_due(0.0, rate, 5.0) == rate * AUTO_PLAY_MAX_LAG + 1
+
+def test_budget_grows_with_render_time():
+    assert auto_play_budget(0.0) == AUTO_PLAY_BUDGET
+    render_time = 0.1
+    budget = auto_play_budget(render_time)
+    assert render_time / (budget + render_time) == pytest.approx(AUTO_PLAY_RENDER_SHARE)
+
+def test_all_due_steps_run_within_the_budget():
+    simulator = make_simulator()
+    records = simulate_steps(simulator, 0, 1000, time.monotonic() + 60)
+
+    assert len(records) == 1000 == simulator.time_counter
+    assert [record[1] for record in records[:3]] == [0, 1, 2]
+
+def test_a_passed_deadline_stops_after_one_batch():
+    simulator = make_simulator()
+    simulate_steps(simulator, 0, 10, time.monotonic() + 60)
+    records = simulate_steps(simulator, 10, 1000, time.monotonic() - 1)
+
+    # The deadline is checked every 256 steps
+    assert len(records) == 256
+    assert records[0][0] == 11
+    assert simulator.time_counter == 266
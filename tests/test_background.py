@@ -0,0 +1,62 @@
+import threading
+from background import BackgroundTask
+
+class FakeRoot:
+    """Stands in for Tk: after() callbacks run when the test pumps them"""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay, callback):
+        self.pending.append(callback)
+
+    def pump(self, task):
+        while self.pending:
+            task.thread.join(1)
+            self.pending.pop(0)()
+
+def run_task(function, **callbacks):
+    root = FakeRoot()
+    events = []
+    for name in ("on_message", "on_done", "on_cancel", "on_error"):
+        def record(*args, name=name):
+            events.append((name, threading.current_thread() is threading.main_thread()) + args)
+        callbacks.setdefault(name, record)
+    task = BackgroundTask(root, function, **callbacks).start()
+    root.pump(task)
+    assert not task.running
+    return task, events
+
+def test_messages_and_result_arrive_on_the_calling_thread():
+    def work(task):
+        for i in range(3):
+            task.post('progress', i)
+        return "result"
+
+    _, events = run_task(work)
+    assert events == [('on_message', True, 'progress', 0), ('on_message', True, 'progress', 1),
+                      ('on_message', True, 'progress', 2), ('on_done', True, "result")]
+
+def test_cancel_stops_the_worker():
+    started = threading.Event()
+
+    def work(task):
+        started.set()
+        while True:
+            task.check_cancelled()
+
+    root = FakeRoot()
+    events = []
+    task = BackgroundTask(root, work, on_cancel=lambda: events.append('cancelled'),
+                          on_done=lambda result: events.append('done')).start()
+    started.wait(1)
+    task.cancel()
+    root.pump(task)
+    assert events == ['cancelled']
+
+def test_errors_are_handed_to_on_error():
+    def work(task):
+        raise ValueError("broken")
+
+    _, events = run_task(work)
+    assert [(name, str(args[0])) for name, _, *args in events] == [('on_error', "broken")]
@@ -0,0 +1,63 @@
+import os
+import random
+import pytest
+from checkpoint import (capture_state, fork_simulator, load_checkpoint, run_with_checkpoints,
+                        save_checkpoint, trace_path_for)
+from memory_simulator import MemorySimulator
+
+def make_simulator(algorithm, length=400, steps=200):
+    rng = random.Random(5)
+    simulator = MemorySimulator()
+    simulator.initialize(4, 1024, algorithm, seed=9)
+    simulator.set_reference_string([rng.randint(1, 10) for _ in range(length)])
+    for page in simulator.reference_string[:steps]:
+        simulator.simulate_step(page)
+    return simulator
+
+def finish(simulator):
+    for page in simulator.reference_string[simulator.time_counter:]:
+        simulator.simulate_step(page)
+    return simulator.get_statistics(), simulator.get_memory_state()
+
+@pytest.mark.parametrize("algorithm", ["FIFO", "LRU", "OPTIMAL", "CLOCK", "RANDOM"])
+def test_checkpoint_round_trip_continues_identically(tmp_path, algorithm):
+    path = str(tmp_path / "run.vmr")
+    simulator = make_simulator(algorithm)
+    save_checkpoint(simulator, path, include_history=True)
+
+    restored = load_checkpoint(path)
+    assert restored.history == simulator.history
+    assert finish(restored) == finish(simulator)
+
+def test_checkpoint_file_is_not_pickle(tmp_path):
+    path = str(tmp_path / "run.vmr")
+    save_checkpoint(make_simulator("LRU"), path)
+    with open(path, 'rb') as f:
+        assert f.read(8) == b"VMSRES01"
+
+def test_periodic_checkpoints_store_the_trace_once(tmp_path):
+    path = str(tmp_path / "run.vmr")
+    simulator = make_simulator("CLOCK", length=20000, steps=0)
+    run_with_checkpoints(simulator, path, interval=5000, max_steps=10000)
+
+    assert os.path.getsize(path) < 4096
+    assert os.path.getsize(trace_path_for(path)) == 8 * 20000
+    restored = load_checkpoint(path)
+    assert restored.time_counter == 10000
+    assert finish(restored) == finish(simulator)
+
+def test_mismatched_trace_is_rejected(tmp_path):
+    path = str(tmp_path / "run.vmr")
+    simulator = make_simulator("FIFO")
+    save_checkpoint(simulator, path, include_reference=False)
+    with pytest.raises(ValueError):
+        load_checkpoint(path)
+    with pytest.raises(ValueError):
+        load_checkpoint(path, simulator.reference_string[:-1])
+    assert load_checkpoint(path, list(simulator.reference_string)).time_counter == 200
+
+def test_forks_continue_independently():
+    simulator = make_simulator("RANDOM")
+    first, second = fork_simulator(simulator, 2)
+    assert finish(first) == finish(second) == finish(simulator)
+    assert capture_state(first)['reference_digest'] == capture_state(simulator)['reference_digest']
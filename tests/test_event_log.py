@@ -0,0 +1,115 @@
+import json
+import random
+from event_log import RECOVERY_CHUNK, EventLogWriter, read_events, read_header, resume_from_log
+from memory_simulator import MemorySimulator
+
+def random_trace(length=500, seed=1):
+    rng = random.Random(seed)
+    return [rng.randint(1, 12) for _ in range(length)]
+
+def test_resume_reproduces_a_random_run(tmp_path):
+    path = str(tmp_path / "run.ndjson")
+    reference = random_trace()
+
+    original = MemorySimulator()
+    original.initialize(4, 1024, "RANDOM")
+    original.set_reference_string(reference)
+    with EventLogWriter(path) as writer:
+        writer.write_header(original.algorithm, original.num_frames, original.page_size, original.seed)
+        original.add_listener(writer)
+        for page in reference[:250]:
+            original.simulate_step(page)
+    for page in reference[250:]:
+        original.simulate_step(page)
+
+    resumed = MemorySimulator()
+    resumed.initialize(4, 1024, "RANDOM")
+    resumed.set_reference_string(reference)
+    writer = resume_from_log(resumed, path)
+    assert writer.last_step == 250
+    assert resumed.seed == original.seed
+    for page in reference[250:]:
+        resumed.simulate_step(page)
+    writer.close()
+
+    assert resumed.get_memory_state() == original.get_memory_state()
+    assert resumed.page_faults == original.page_faults
+    steps = [event['step'] for event in read_events(path) if event['type'] == 'step']
+    assert steps == list(range(1, len(reference) + 1))
+
+def test_reset_rewinds_clock_and_random_state():
+    simulator = MemorySimulator()
+    simulator.initialize(3, 1024, "CLOCK", seed=7)
+    simulator.set_reference_string(random_trace(100))
+    for page in simulator.reference_string:
+        simulator.simulate_step(page)
+    first = simulator.get_statistics()
+
+    simulator.reset()
+    for page in simulator.reference_string:
+        simulator.simulate_step(page)
+    assert simulator.get_statistics() == first
+
+def test_new_log_gets_a_header(tmp_path):
+    path = str(tmp_path / "fresh.ndjson")
+    simulator = MemorySimulator()
+    simulator.initialize(3, 1024, "RANDOM", seed=11)
+    simulator.set_reference_string([1, 2, 3])
+    resume_from_log(simulator, path).close()
+    assert read_header(path)['seed'] == 11
+
+def write_steps(path, count, interval=None):
+    simulator = MemorySimulator()
+    simulator.initialize(3, 1024, "FIFO", seed=1)
+    simulator.set_reference_string(random_trace(count))
+    writer = EventLogWriter(path, interval=interval)
+    writer.write_header(simulator.algorithm, simulator.num_frames, simulator.page_size, simulator.seed)
+    simulator.add_listener(writer)
+    for page in simulator.reference_string:
+        simulator.simulate_step(page)
+    return writer
+
+def test_recovery_looks_past_large_trailing_records(tmp_path):
+    path = str(tmp_path / "run.ndjson")
+    writer = write_steps(path, 40, interval=7)
+    writer.write_event('note', text="x" * (3 * RECOVERY_CHUNK))
+    writer.close()
+
+    assert EventLogWriter(path).last_step == 40
+
+def test_recovery_drops_a_long_partial_line(tmp_path):
+    path = str(tmp_path / "run.ndjson")
+    write_steps(path, 30).close()
+    with open(path, 'ab') as f:
+        f.write(b'{"type":"step","step":31,"note":"' + b"y" * (2 * RECOVERY_CHUNK))
+
+    writer = EventLogWriter(path)
+    writer.close()
+    assert writer.last_step == 30
+    with open(path, 'rb') as f:
+        lines = f.read().splitlines()
+    assert json.loads(lines[-1])['step'] == 30
+
+def test_resume_never_writes_a_header_after_existing_records(tmp_path):
+    path = str(tmp_path / "notes.ndjson")
+    with EventLogWriter(path) as writer:
+        writer.write_event('note', text="started elsewhere")
+
+    simulator = MemorySimulator()
+    simulator.initialize(3, 1024, "FIFO", seed=2)
+    simulator.set_reference_string([1, 2, 3, 4])
+    writer = resume_from_log(simulator, path)
+    for page in simulator.reference_string:
+        simulator.simulate_step(page)
+    writer.close()
+
+    types = [event['type'] for event in read_events(path)]
+    assert types == ['note', 'step', 'step', 'step', 'step']
+
+def test_queue_is_bounded(tmp_path):
+    writer = EventLogWriter(str(tmp_path / "run.ndjson"), max_pending=8)
+    assert writer.queue.maxsize == 8
+    for step in range(1, 200):
+        writer({'step_number': step, 'page': step, 'page_fault': True, 'replaced_page': None, 'frame_index': 0})
+    writer.close()
+    assert writer.events_written == 199
@@ -0,0 +1,127 @@
+import random
+import pytest
+from free_space import FreeSpaceIndex, HoleTree
+from segmentation import PLACEMENT_POLICIES, SegmentationSimulator
+
+def holes_from_layout(simulator):
+    """Holes recomputed from scratch as the gaps between allocated segments"""
+    holes = []
+    cursor = 0
+    for base in sorted(simulator.allocated_segments):
+        if base > cursor:
+            holes.append((cursor, base - cursor))
+        cursor = base + simulator.allocated_segments[base].limit
+    if cursor < simulator.total_memory:
+        holes.append((cursor, simulator.total_memory - cursor))
+    return holes
+
+def reference_find(holes, size, policy, cursor):
+    """Linear-scan placement over (base, size) holes in address order"""
+    fitting = [(base, hole) for base, hole in holes if hole >= size]
+    if not fitting:
+        return None
+    if policy == "BEST_FIT":
+        return min(fitting, key=lambda item: (item[1], item[0]))[0]
+    if policy == "WORST_FIT":
+        return max(fitting, key=lambda item: (item[1], item[0]))[0]
+    if policy == "NEXT_FIT":
+        after = [base for base, _ in fitting if base >= cursor]
+        return after[0] if after else fitting[0][0]
+    return fitting[0][0]
+
+def test_hole_tree_first_fit_skips_small_holes():
+    tree = HoleTree()
+    for key, size in [(0, 4), (10, 2), (20, 8), (40, 16)]:
+        tree.insert(key, size)
+
+    assert tree.first_fit(5).key == 20
+    assert tree.first_fit(5, min_key=21).key == 40
+    assert tree.first_fit(17) is None
+    tree.remove(20)
+    assert tree.first_fit(5).key == 40
+    assert list(tree) == [(0, 4), (10, 2), (40, 16)]
+    assert len(tree) == 3
+
+def test_take_splits_and_add_hole_coalesces():
+    index = FreeSpaceIndex()
+    index.add_hole(0, 100)
+
+    assert index.take(0, 30) == 30
+    assert list(index.iter_holes()) == [(30, 70)]
+    assert index.take(30, 20) == 20
+    assert list(index.iter_holes()) == [(50, 50)]
+
+    # Freeing the first block leaves a separate hole; freeing the middle merges all three
+    assert index.add_hole(0, 30) == (0, 30)
+    assert len(index) == 2
+    assert index.add_hole(30, 20) == (0, 100)
+    assert list(index.iter_holes()) == [(0, 100)]
+    assert index.free_bytes == 100
+    assert index.largest_hole() == 100
+
+def test_take_without_split_consumes_the_whole_hole():
+    index = FreeSpaceIndex()
+    index.add_hole(0, 64)
+    assert index.take(0, 10, split=False) == 64
+    assert len(index) == 0
+    assert index.free_bytes == 0
+
+@pytest.mark.parametrize("policy, expected", [
+    ("FIRST_FIT", 0),
+    ("BEST_FIT", 60),
+    ("WORST_FIT", 100),
+    ("NEXT_FIT", 100)
+])
+def test_placement_policies(policy, expected):
+    index = FreeSpaceIndex()
+    for base, size in [(0, 20), (30, 5), (60, 12), (100, 40)]:
+        index.add_hole(base, size, coalesce=False)
+    assert index.find(12, policy, cursor=70) == expected
+
+def test_next_fit_wraps_around():
+    index = FreeSpaceIndex()
+    for base, size in [(0, 20), (60, 5)]:
+        index.add_hole(base, size, coalesce=False)
+    assert index.find(10, "NEXT_FIT", cursor=50) == 0
+
+@pytest.mark.parametrize("policy", PLACEMENT_POLICIES)
+def test_random_allocate_free_keeps_hole_invariants(policy):
+    rng = random.Random(policy)
+    simulator = SegmentationSimulator(4096, policy)
+    live = []
+
+    for step in range(600):
+        if live and rng.random() < 0.45:
+            process_id, name = live.pop(rng.randrange(len(live)))
+            assert simulator.deallocate_segment(process_id, name)
+        else:
+            size = rng.randint(1, 300)
+            holes = holes_from_layout(simulator)
+            expected = reference_find(holes, size, policy, simulator.next_fit_cursor)
+            segment = simulator.allocate_segment(step, "seg", size)
+            if expected is None:
+                assert segment is None
+            else:
+                assert segment.base == expected
+                live.append((step, "seg"))
+
+        holes = holes_from_layout(simulator)
+        frag = simulator.calculate_fragmentation()
+        assert list(simulator.free_space.iter_holes()) == holes
+        assert frag['hole_count'] == len(holes)
+        assert frag['largest_hole'] == max((size for _, size in holes), default=0)
+        assert frag['free_memory'] == sum(size for _, size in holes)
+
+@pytest.mark.parametrize("size", [0, -10])
+def test_non_positive_segment_sizes_are_rejected(size):
+    simulator = SegmentationSimulator(1024)
+    with pytest.raises(ValueError):
+        simulator.allocate_segment(1, "code", size)
+    assert list(simulator.free_space.iter_holes()) == [(0, 1024)]
+    assert simulator.operation_count == 0
+
+def test_negative_partition_sizes_are_rejected():
+    simulator = SegmentationSimulator(1024)
+    with pytest.raises(ValueError):
+        simulator.initialize_segments([100, -10])
+    assert not simulator.fixed_partitions
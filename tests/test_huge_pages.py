@@ -0,0 +1,100 @@
+import random
+import pytest
+from huge_pages import HugePageSimulator, format_size, parse_size
+from memory_simulator import MemorySimulator
+
+# Small page sizes keep the traces short: 16 base pages per huge page, 4 huge pages per giant one
+PAGE_SIZE = 4096
+HUGE_SIZES = (16 * PAGE_SIZE, 64 * PAGE_SIZE)
+
+def clustered_trace(length=3000, regions=12, seed=5):
+    """Accesses that stay inside one huge-page region for a while, then jump"""
+    rng = random.Random(seed)
+    trace = []
+    while len(trace) < length:
+        base = rng.randrange(regions) * 16
+        trace += [base + rng.randrange(16) for _ in range(rng.randint(5, 40))]
+    return trace[:length]
+
+def check_invariants(simulator, accessed):
+    units = [frame.page for frame in simulator.memory.frames]
+    assert simulator.memory.used_bytes == sum(simulator.sizes[level] for level, _ in units)
+    assert simulator.memory.used_bytes <= simulator.memory.capacity
+
+    # Every base page is mapped by at most one unit, and every huge page
+    # only records touched pages inside its own range
+    covered = set()
+    touched_pages = 0
+    for level, index in units:
+        span = simulator.pages_per_unit[level]
+        pages = range(index * span, (index + 1) * span)
+        assert covered.isdisjoint(pages)
+        covered.update(pages)
+        if level > 0:
+            touched = simulator.touched[(level, index)]
+            assert touched <= set(pages) and touched <= accessed
+            touched_pages += len(touched)
+
+    assert simulator.huge_touched_pages == touched_pages
+    assert simulator.huge_bytes == sum(simulator.sizes[level] for level, _ in units if level > 0)
+    assert simulator.internal_fragmentation() >= 0
+
+@pytest.mark.parametrize("policy", ["FIFO", "LRU"])
+def test_thp_never_matches_memory_simulator(policy):
+    trace = clustered_trace()
+    simulator = HugePageSimulator(24, PAGE_SIZE, HUGE_SIZES, policy=policy, thp="never")
+    statistics = simulator.run(trace)
+
+    memory = MemorySimulator()
+    memory.initialize(24, PAGE_SIZE, policy)
+    memory.set_reference_string(trace)
+    for page in trace:
+        memory.simulate_step(page)
+
+    assert statistics['page_faults'] == memory.page_faults
+    assert statistics['hits'] == memory.hits
+    assert statistics['promotions'] == statistics['huge_page_bytes'] == 0
+
+@pytest.mark.parametrize("thp", ["always", "promote"])
+@pytest.mark.parametrize("demote", [True, False])
+def test_promotion_and_demotion_keep_invariants(thp, demote):
+    simulator = HugePageSimulator(48, PAGE_SIZE, HUGE_SIZES, thp=thp, promote_threshold=0.5, demote=demote)
+    accessed = set()
+
+    for page in clustered_trace():
+        step = simulator.access(page)
+        accessed.add(page)
+        assert simulator.lookup(page) is not None
+        assert step['page_size'] in simulator.sizes
+        check_invariants(simulator, accessed)
+
+    assert simulator.promotions > 0 or thp == "always"
+    assert simulator.demotions > 0 if demote else simulator.demotions == 0
+    assert simulator.peak_fragmentation >= simulator.internal_fragmentation()
+
+def test_promote_collapses_a_dense_region():
+    simulator = HugePageSimulator(64, PAGE_SIZE, HUGE_SIZES, thp="promote", promote_threshold=0.5)
+    for page in range(8):
+        simulator.access(page)
+
+    assert simulator.lookup(0) == (1, 0)
+    assert simulator.promotions == 1
+    assert simulator.internal_fragmentation() == 8 * PAGE_SIZE
+
+def test_demotion_keeps_only_touched_pages():
+    simulator = HugePageSimulator(16, PAGE_SIZE, HUGE_SIZES, thp="always")
+    for page in (0, 1, 2):
+        simulator.access(page)
+    assert simulator.lookup(0) == (1, 0)
+
+    # Memory is full, so the next fault splits the huge page into its three touched base pages
+    simulator.access(100)
+    assert simulator.demotions == 1
+    assert [simulator.lookup(page) for page in (0, 1, 2, 3)] == [(0, 0), (0, 1), (0, 2), None]
+    assert simulator.memory.used_bytes == 4 * PAGE_SIZE
+
+def test_sizes_round_trip():
+    for text in ("4K", "2M", "1G", "4096"):
+        assert parse_size(format_size(parse_size(text))) == parse_size(text)
+    with pytest.raises(ValueError):
+        HugePageSimulator(8, PAGE_SIZE, (3 * PAGE_SIZE + 1,))
@@ -0,0 +1,43 @@
+from array import array
+from log_view import NO_VALUE, StepLog
+from memory_simulator import MemorySimulator
+
+def run_steps(reference_string, num_frames=2):
+    simulator = MemorySimulator()
+    simulator.initialize(num_frames, 1024, "FIFO")
+    simulator.set_reference_string(reference_string)
+    return [simulator.simulate_step(page) for page in reference_string]
+
+def test_steps_are_stored_in_typed_arrays():
+    log = StepLog()
+    for step_info in run_steps([1, 2, 1, 3]):
+        log.append(step_info)
+
+    assert len(log) == 4
+    assert all(isinstance(column, array) for column in (log.steps, log.pages, log.faults, log.frames, log.replaced))
+    assert list(log.pages) == [1, 2, 1, 3]
+    assert list(log.faults) == [1, 1, 0, 1]
+    assert list(log.replaced) == [NO_VALUE, NO_VALUE, NO_VALUE, 1]
+
+def test_lines_format_only_the_requested_slice():
+    log = StepLog()
+    log.extend(StepLog.record(step_info) for step_info in run_steps([1, 2, 1, 3]))
+
+    assert log.lines(1, 4) == [
+        "Step 02: Page 2 - Page Fault (Loaded in frame 1)",
+        "Step 03: Page 1 - Hit",
+        "Step 04: Page 3 - Page Fault (Replaced page 1 in frame 0)"
+    ]
+    assert log.lines(4, 4) == []
+
+def test_append_and_extend_agree():
+    steps = run_steps([5, 6, 7, 5, 6, 8] * 50, num_frames=3)
+    appended = StepLog()
+    for step_info in steps:
+        appended.append(step_info)
+    extended = StepLog()
+    extended.extend(map(StepLog.record, steps))
+
+    assert appended.lines(0, len(steps)) == extended.lines(0, len(steps))
+    extended.clear()
+    assert len(extended) == 0
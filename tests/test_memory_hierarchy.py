@@ -0,0 +1,60 @@
+import random
+import pytest
+from memory_hierarchy import (DRAM_LATENCY_NS, SWAP_LATENCY_NS, SWAP_STORE_LATENCY_NS, CompressionModel,
+                              MemoryHierarchy, MemoryTier, standard_hierarchy)
+from memory_simulator import MemorySimulator
+
+def random_trace(length=600, max_page=30, seed=1):
+    rng = random.Random(seed)
+    return [rng.randrange(max_page) for _ in range(length)]
+
+@pytest.mark.parametrize("policy", ["FIFO", "LRU", "OPTIMAL", "CLOCK", "RANDOM"])
+def test_single_dram_tier_matches_memory_simulator(policy):
+    trace = random_trace()
+    hierarchy = MemoryHierarchy([MemoryTier("DRAM", 8 * 4096, DRAM_LATENCY_NS, policy, seed=3)])
+    statistics = hierarchy.run(trace)
+
+    simulator = MemorySimulator()
+    simulator.initialize(8, 4096, policy, seed=3)
+    simulator.set_reference_string(trace)
+    for page in trace:
+        simulator.simulate_step(page)
+
+    assert statistics['cold_misses'] == simulator.page_faults
+    assert statistics['tiers'][0]['hits'] == simulator.hits
+    assert statistics['total_access_time_ns'] == (simulator.page_faults * SWAP_LATENCY_NS
+                                                  + simulator.hits * DRAM_LATENCY_NS)
+
+def test_swap_out_is_charged_to_the_access_that_causes_it():
+    hierarchy = standard_hierarchy(1)
+    latencies = [hierarchy.access(page)['latency'] for page in (1, 2, 1)]
+
+    assert latencies == [SWAP_LATENCY_NS,
+                         SWAP_LATENCY_NS + SWAP_STORE_LATENCY_NS,
+                         SWAP_LATENCY_NS + SWAP_STORE_LATENCY_NS]
+    assert hierarchy.get_statistics()['tiers'][1]['demotions'] == 2
+
+def test_each_page_lives_in_at_most_one_tier():
+    hierarchy = standard_hierarchy(4, numa_frames=4, compressed_pool_pages=2, compression_spread=1.0, seed=2)
+    trace = random_trace(max_page=40)
+
+    for page in trace:
+        hierarchy.access(page)
+        assert sum(page in tier for tier in hierarchy.tiers) == 1
+        for tier in hierarchy.tiers:
+            assert tier.capacity is None or tier.used_bytes <= tier.capacity
+            assert tier.used_bytes == sum(tier.sizes.values())
+
+    statistics = hierarchy.get_statistics()
+    assert statistics['cold_misses'] == len(set(trace))
+    assert statistics['discarded_pages'] == 0
+
+def test_incompressible_pages_skip_the_compressed_tier():
+    compression = CompressionModel(ratio=1.5, min_ratio=2.0)
+    pool = MemoryTier("COMPRESSED", 4 * 4096, 3000, compression=compression)
+    hierarchy = MemoryHierarchy([MemoryTier("DRAM", 4096, DRAM_LATENCY_NS), pool])
+    hierarchy.run([1, 2, 3])
+
+    assert len(pool) == 0
+    assert pool.rejected == 2
+    assert hierarchy.discarded == 2
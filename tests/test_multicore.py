@@ -0,0 +1,104 @@
+import random
+from collections import OrderedDict
+import pytest
+from memory_simulator import MemorySimulator
+from multicore import MultiCoreSimulator, Unmap, interleave
+
+def make_streams(num_cores, length=400, max_page=40, seed=3):
+    rng = random.Random(seed)
+    streams = []
+    for core in range(num_cores):
+        stream = []
+        for _ in range(length):
+            page = rng.randrange(max_page)
+            stream.append(Unmap(page) if rng.random() < 0.02 else page)
+        streams.append(stream)
+    return streams
+
+def reference_run(simulator, streams):
+    """Step-by-step model: shootdowns hit every TLB as soon as they happen"""
+    accesses = [item for _, item in interleave(streams, simulator.quantum) if not isinstance(item, Unmap)]
+    memories = []
+    for partition in range(simulator.partitions):
+        memory = MemorySimulator()
+        memory.initialize(simulator.partition_frames(partition), simulator.page_size, simulator.algorithm,
+                          (simulator.seed + partition) & 0xffffffff)
+        memory.set_reference_string([page for page in accesses if page % simulator.partitions == partition])
+        memories.append(memory)
+
+    tlbs = [OrderedDict() for _ in streams]
+    per_core = [{'tlb_hits': 0, 'tlb_misses': 0, 'ipis_received': 0, 'page_faults': 0} for _ in streams]
+
+    def shoot_down(page, initiator):
+        for core, tlb in enumerate(tlbs):
+            if tlb.pop(page, None) is not None and core != initiator:
+                per_core[core]['ipis_received'] += 1
+
+    for core, item in interleave(streams, simulator.quantum):
+        if isinstance(item, Unmap):
+            if memories[item.page % simulator.partitions].unmap_page(item.page) is not None:
+                shoot_down(item.page, core)
+            continue
+
+        step_info = memories[item % simulator.partitions].simulate_step(item)
+        per_core[core]['page_faults'] += step_info['page_fault']
+        if step_info['replaced_page'] is not None:
+            shoot_down(step_info['replaced_page'], core)
+
+        tlb = tlbs[core]
+        if item in tlb:
+            tlb.move_to_end(item)
+            per_core[core]['tlb_hits'] += 1
+        else:
+            per_core[core]['tlb_misses'] += 1
+            tlb[item] = True
+            if len(tlb) > simulator.tlb_entries:
+                tlb.popitem(last=False)
+    return per_core
+
+def without_timings(statistics):
+    return {key: value for key, value in statistics.items() if key != 'elapsed'}
+
+@pytest.mark.parametrize("partitions", [1, 4])
+@pytest.mark.parametrize("algorithm", ["FIFO", "LRU", "OPTIMAL", "RANDOM"])
+def test_matches_step_by_step_model(algorithm, partitions):
+    streams = make_streams(4)
+    simulator = MultiCoreSimulator(4, 16, algorithm=algorithm, tlb_entries=8, quantum=5,
+                                   partitions=partitions, seed=11)
+    statistics = simulator.run(streams)
+
+    expected = reference_run(simulator, streams)
+    for core, reference in zip(statistics['per_core'], expected):
+        assert {key: core[key] for key in reference} == reference
+    assert statistics['page_faults'] == sum(core['page_faults'] for core in expected)
+
+@pytest.mark.parametrize("shootdown", ["precise", "broadcast"])
+@pytest.mark.parametrize("partitions", [1, 4])
+def test_parallel_run_matches_serial(partitions, shootdown):
+    streams = make_streams(4)
+    options = dict(num_frames=16, algorithm="RANDOM", tlb_entries=8, quantum=7,
+                   shootdown=shootdown, partitions=partitions, seed=5)
+
+    serial = MultiCoreSimulator(4, **options).run(streams)
+    parallel = MultiCoreSimulator(4, workers=2, **options).run(streams)
+
+    assert without_timings(parallel) == without_timings(serial)
+    assert serial['shootdowns'] > 0 and serial['unmaps'] > 0
+
+def test_partitions_cannot_exceed_frames():
+    with pytest.raises(ValueError):
+        MultiCoreSimulator(2, num_frames=4, partitions=5)
+
+def test_shared_frames_are_the_default_model():
+    streams = make_streams(3)
+    statistics = MultiCoreSimulator(3, 12, algorithm="LRU", quantum=4).run(streams)
+
+    memory = MemorySimulator()
+    memory.initialize(12, 1024, "LRU")
+    for _, item in interleave(streams, 4):
+        if isinstance(item, Unmap):
+            memory.unmap_page(item.page)
+        else:
+            memory.simulate_step(item)
+    assert statistics['memory_model'] == "shared"
+    assert statistics['page_faults'] == memory.page_faults
@@ -0,0 +1,30 @@
+import os
+import numpy as np
+from memory_simulator import trace_digest
+from result_cache import ResultCache
+
+REFERENCE = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+
+def test_digest_is_the_same_for_lists_and_arrays():
+    assert trace_digest(REFERENCE) == trace_digest(np.array(REFERENCE, dtype=np.int64))
+    assert trace_digest(REFERENCE) != trace_digest(REFERENCE[:-1])
+
+def test_precomputed_digest_hits_the_same_entry(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    first = cache.get_or_run(REFERENCE, 3, 1024, "FIFO")
+    second = cache.get_or_run(REFERENCE, 3, 1024, "FIFO", digest=trace_digest(REFERENCE))
+    assert first == second
+    assert cache.hits == 1 and cache.misses == 1
+
+def test_other_versions_keep_their_entries(tmp_path):
+    old = ResultCache(str(tmp_path), version="0.9")
+    old.get_or_run(REFERENCE, 3, 1024, "LRU")
+
+    new = ResultCache(str(tmp_path), version="1.0")
+    new.get_or_run(REFERENCE, 3, 1024, "LRU")
+    assert new.misses == 1
+
+    again = ResultCache(str(tmp_path), version="0.9")
+    again.get_or_run(REFERENCE, 3, 1024, "LRU")
+    assert again.hits == 1
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".json")]) == 2
@@ -0,0 +1,133 @@
+import random
+import numpy as np
+import pytest
+from memory_simulator import MemorySimulator
+from segmentation import PagedSegmentation, SegmentationSimulator
+
+def paged(algorithm):
+    seg_simulator = SegmentationSimulator(8192)
+    code = seg_simulator.allocate_segment(1, "code", 2048)
+    data = seg_simulator.allocate_segment(1, "data", 4096)
+    memory = MemorySimulator()
+    memory.initialize(3, 256, algorithm, seed=1)
+    return PagedSegmentation(seg_simulator, memory), [code.segment_id, data.segment_id]
+
+def logical_trace(segment_ids, length, seed):
+    rng = random.Random(seed)
+    segments = np.array([rng.choice(segment_ids) for _ in range(length)])
+    # Some offsets run past the 2048-byte code segment and fault
+    offsets = np.array([rng.randrange(3000) for _ in range(length)])
+    return segments, offsets
+
+@pytest.mark.parametrize("algorithm", ["FIFO", "LRU", "OPTIMAL"])
+def test_paged_segmentation_matches_a_plain_run_of_its_pages(algorithm):
+    system, segment_ids = paged(algorithm)
+    batches = [logical_trace(segment_ids, 150, seed) for seed in (1, 2)]
+    results = [system.access(segments, offsets) for segments, offsets in batches]
+
+    # OPTIMAL can only look ahead within a batch, so replay each batch on its own trace
+    expected = MemorySimulator()
+    expected.initialize(3, 256, algorithm, seed=1)
+    for result in results:
+        pages = result['pages'][~result['segment_fault']].tolist()
+        expected.set_reference_string(expected.reference_string[:expected.time_counter] + pages)
+        faults = [expected.simulate_step(page)['page_fault'] for page in pages]
+        assert result['page_fault'][~result['segment_fault']].tolist() == faults
+
+    assert system.segment_faults > 0
+    stats = system.get_statistics()
+    assert stats['page_faults'] == expected.page_faults
+    assert stats['hits'] == expected.hits
+
+def test_optimal_looks_ahead_in_the_current_batch():
+    system, segment_ids = paged("OPTIMAL")
+    data = segment_ids[1]
+    # The segment's pages 0 1 2 3 0 1: OPTIMAL evicts page 2 for page 3, so 0 and 1 then hit
+    offsets = np.array([0, 256, 512, 768, 0, 256])
+    system.access(np.full(len(offsets), data), offsets)
+    assert system.memory_simulator.page_faults == 4
+
+def test_batches_extend_the_trace_in_place():
+    system, segment_ids = paged("OPTIMAL")
+    system.memory_simulator.set_reference_string([99, 98, 97])
+    trace = None
+    total = 0
+    for seed in range(5):
+        result = system.access(*logical_trace(segment_ids, 40, seed))
+        total += int((~result['segment_fault']).sum())
+        if trace is None:
+            trace = system.memory_simulator.reference_string
+        assert system.memory_simulator.reference_string is trace
+    assert len(trace) == total == system.memory_simulator.time_counter
+
+def test_translate_bounds_offsets_by_the_requested_size():
+    simulator = SegmentationSimulator(1024, allocation_unit=64)
+    segment = simulator.allocate_segment(1, "data", 100)
+    assert segment.limit == 128
+
+    physical, fault = simulator.translate([segment.segment_id] * 3, [99, 100, 127])
+    assert fault.tolist() == [False, True, True]
+    assert physical.tolist() == [segment.base + 99, -1, -1]
+
+def test_fixed_partitions_bound_by_the_requested_size():
+    simulator = SegmentationSimulator(1024)
+    simulator.initialize_segments([256, 256])
+    segment = simulator.allocate_segment(1, "code", 200)
+
+    _, fault = simulator.translate([segment.segment_id] * 2, [199, 200])
+    assert fault.tolist() == [False, True]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        self.now += 1.0
+        return self.now
+
+def test_reusing_a_name_times_the_implicit_free_once(monkeypatch):
+    import segmentation
+    clock = FakeClock()
+    monkeypatch.setattr(segmentation, "time", clock)
+    simulator = SegmentationSimulator(1024)
+    simulator.allocate_segment(1, "heap", 100)
+    busy = simulator.busy_time
+
+    simulator.allocate_segment(1, "heap", 200)
+    # One free and one allocation, each timed by its own pair of clock reads
+    assert simulator.busy_time - busy == 2.0
+    assert simulator.operation_count == 3
+    assert [sample[0] for sample in simulator.fragmentation_history] == [1, 2, 3]
+
+@pytest.mark.parametrize("allocation_unit", [1, 32])
+def test_incremental_counters_match_a_full_recount(allocation_unit):
+    rng = random.Random(allocation_unit)
+    simulator = SegmentationSimulator(4096, "BEST_FIT", allocation_unit=allocation_unit)
+
+    for _ in range(700):
+        process_id = rng.randrange(8)
+        name = rng.choice(["code", "data", "heap"])
+        if rng.random() < 0.4:
+            simulator.deallocate_segment(process_id, name)
+        elif rng.random() < 0.1:
+            simulator.deallocate_process(process_id)
+        else:
+            simulator.allocate_segment(process_id, name, rng.randint(1, 400))
+
+        live = [segment for segments in simulator.process_segments.values() for segment in segments.values()]
+        assert simulator.allocated_bytes == sum(segment.limit for segment in live)
+        assert simulator.requested_bytes == sum(segment.requested_size for segment in live)
+
+        used = sorted((segment.base, segment.base + segment.limit) for segment in live)
+        holes = []
+        cursor = 0
+        for start, end in used + [(4096, 4096)]:
+            assert start >= cursor
+            if start > cursor:
+                holes.append(start - cursor)
+            cursor = end
+        frag = simulator.calculate_fragmentation()
+        assert frag['hole_count'] == len(holes)
+        assert frag['largest_hole'] == max(holes, default=0)
+        assert frag['free_memory'] == sum(holes)
+        assert frag['internal_fragmentation'] == simulator.allocated_bytes - simulator.requested_bytes
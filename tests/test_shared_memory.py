@@ -0,0 +1,90 @@
+import random
+from collections import Counter
+from shared_memory import SharedMemorySimulator, prefork_workload
+
+def mapping_counts(simulator):
+    """Reference count of every key, recomputed from the page tables"""
+    return Counter(mapping.key for table in simulator.processes.values() for mapping in table.values())
+
+def check_refcounts(simulator):
+    counts = mapping_counts(simulator)
+    assert {key: len(sharers) for key, sharers in simulator.mappers.items() if sharers} == dict(counts)
+    assert simulator.pages_saved() == sum(counts[key] - 1 for key in simulator.resident if counts[key] > 0)
+    for key, frame_index in simulator.resident.items():
+        assert simulator.memory_frames[frame_index].page == key
+
+def test_fork_shares_pages_and_exit_drops_references():
+    simulator = SharedMemorySimulator(num_frames=16)
+    parent = simulator.create_process()
+    simulator.map_library(parent, "libc", 10, 2)
+    for page in (0, 1, 10, 11):
+        simulator.access(parent, page)
+    child = simulator.fork(parent)
+    check_refcounts(simulator)
+    assert simulator.pages_saved() == 4
+
+    simulator.access(child, 0, write=True)
+    check_refcounts(simulator)
+    assert simulator.cow_copies == 1
+    assert simulator.pages_saved() == 3
+
+    simulator.exit(parent)
+    check_refcounts(simulator)
+    assert simulator.pages_saved() == 0
+    # The parent's private page 0 is gone, page 1 is still mapped by the child
+    assert len(simulator.resident) == 4
+
+    simulator.exit(child)
+    check_refcounts(simulator)
+    assert all(key[0] == 'file' for key in simulator.resident)
+
+def test_remapping_a_page_drops_its_old_reference():
+    simulator = SharedMemorySimulator(num_frames=8)
+    pid = simulator.create_process()
+    simulator.access(pid, 5, write=True)
+    simulator.map_library(pid, "libm", 5, 1)
+
+    check_refcounts(simulator)
+    assert ('anon', 1) not in simulator.resident
+
+def test_last_sharer_write_does_not_copy():
+    simulator = SharedMemorySimulator(num_frames=8)
+    parent = simulator.create_process()
+    simulator.access(parent, 0, write=True)
+    child = simulator.fork(parent)
+    simulator.exit(parent)
+
+    step = simulator.access(child, 0, write=True)
+    assert step['fault'] == 'cow'
+    assert simulator.cow_copies == 0
+    check_refcounts(simulator)
+
+def test_refcounts_hold_under_random_events_and_eviction():
+    rng = random.Random(4)
+    simulator = SharedMemorySimulator(num_frames=12, algorithm="CLOCK", seed=4)
+    live = [simulator.create_process()]
+    simulator.map_library(live[0], "libc", 100, 6)
+
+    for _ in range(1500):
+        choice = rng.random()
+        if choice < 0.03 and len(live) < 6:
+            live.append(simulator.fork(rng.choice(live)))
+        elif choice < 0.05 and len(live) > 1:
+            simulator.exit(live.pop(rng.randrange(len(live))))
+        elif choice < 0.06:
+            simulator.map_library(rng.choice(live), "libz", rng.randrange(20), 3)
+        else:
+            page = rng.choice([rng.randrange(20), 100 + rng.randrange(6)])
+            simulator.access(rng.choice(live), page, write=rng.random() < 0.3)
+        check_refcounts(simulator)
+
+    assert simulator.evictions > 0
+    assert simulator.peak_pages_saved >= simulator.pages_saved()
+
+def test_prefork_workload_shares_the_library():
+    simulator = SharedMemorySimulator(num_frames=256)
+    statistics = simulator.run(prefork_workload(workers=4, heap_pages=16, library_pages=32, requests=50))
+
+    check_refcounts(simulator)
+    assert statistics['processes'] == 5
+    assert statistics['pages_saved'] >= 4 * 32 - statistics['cow_copies']
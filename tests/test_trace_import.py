@@ -0,0 +1,85 @@
+import gzip
+import numpy as np
+import pytest
+from cli import read_trace
+from memory_simulator import iter_pages
+from trace_import import TraceImporter, import_trace, load_page_trace
+
+LACKEY = (b"==1234== Lackey, an example Valgrind tool\n"
+          b"I  04000000,3\n"
+          b" S 7ff000108,8\n"
+          b" L 04222cac,8\n"
+          b" M 0421d7f0,4\n"
+          b"I  04000003,5\n")
+
+def pages_of(*addresses, page_size=4096):
+    return [address // page_size for address in addresses]
+
+def import_bytes(tmp_path, data, name="trace.txt", **options):
+    path = tmp_path / name
+    path.write_bytes(data)
+    output = str(tmp_path / "trace.pages")
+    statistics = import_trace(str(path), output, **options)
+    return load_page_trace(output).tolist(), statistics
+
+def test_lackey_lines(tmp_path):
+    pages, statistics = import_bytes(tmp_path, LACKEY)
+
+    assert statistics['format'] == "lackey"
+    assert pages == pages_of(0x04000000, 0x7ff000108, 0x04222cac, 0x0421d7f0, 0x04000003)
+    assert statistics['skipped_lines'] == 1   # the banner
+
+def test_lackey_kinds_filter(tmp_path):
+    pages, _ = import_bytes(tmp_path, LACKEY, kinds="LS")
+    assert pages == pages_of(0x7ff000108, 0x04222cac)
+
+def test_gzip_input_matches_plain(tmp_path):
+    plain, _ = import_bytes(tmp_path, LACKEY)
+    compressed, _ = import_bytes(tmp_path, gzip.compress(LACKEY), name="trace.out.gz")
+    assert compressed == plain
+
+def test_address_variants_and_crlf(tmp_path):
+    data = b"0x1000\r\n2000 extra words\r\n0X3fff\r\n\t  0x4000\r\n"
+    pages, statistics = import_bytes(tmp_path, data)
+
+    assert statistics['format'] == "addresses"
+    assert pages == pages_of(0x1000, 0x2000, 0x3fff, 0x4000)
+    assert statistics['skipped_lines'] == 0
+
+def test_decimal_addresses(tmp_path):
+    pages, _ = import_bytes(tmp_path, b"4096\n8191\n12288\n", base=10)
+    assert pages == [1, 1, 3]
+
+def test_malformed_lines_are_rejected(tmp_path):
+    data = b"0x1000\nzzz\n0x12g4\n\n0x" + b"f" * 17 + b"\n-4096\n0x2000"
+    pages, statistics = import_bytes(tmp_path, data)
+
+    assert pages == pages_of(0x1000, 0x2000)
+    assert statistics['skipped_lines'] == 5
+
+def test_chunk_boundaries_do_not_change_the_result(tmp_path):
+    path = tmp_path / "trace.txt"
+    path.write_bytes(b"".join(b"0x%x\n" % (page * 4096 + 7) for page in range(500)))
+
+    whole = np.concatenate(list(TraceImporter(str(path)).chunks())).tolist()
+    small = np.concatenate(list(TraceImporter(str(path), chunk_size=37).chunks())).tolist()
+    assert whole == small == list(range(500))
+
+def test_collapse_repeats(tmp_path):
+    pages, _ = import_bytes(tmp_path, b"0x1000\n0x1008\n0x2000\n0x1000\n", collapse_repeats=True)
+    assert pages == [1, 2, 1]
+
+def test_read_trace_keeps_pages_memory_mapped(tmp_path):
+    import_bytes(tmp_path, b"0x1000\n0x2000\n0x1000\n")
+    trace = read_trace(str(tmp_path / "trace.pages"))
+
+    assert isinstance(trace, np.memmap)
+    pages = list(iter_pages(trace, chunk_size=2))
+    assert pages == [1, 2, 1]
+    assert all(type(page) is int for page in pages)
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        TraceImporter("unused", page_size=3000)
+    with pytest.raises(ValueError):
+        TraceImporter("unused", format="pin")
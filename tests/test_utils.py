@@ -0,0 +1,58 @@
+import json
+import numpy as np
+from memory_simulator import MemorySimulator
+from result_format import is_binary_results
+from utils import load_simulation_results, save_simulation_results
+
+def make_simulator():
+    simulator = MemorySimulator()
+    simulator.initialize(3, 1024, "FIFO")
+    simulator.set_reference_string([1, 2, 3, 4, 1, 2, 5])
+    for page in simulator.reference_string:
+        simulator.simulate_step(page)
+    return simulator
+
+def test_json_extension_writes_json(tmp_path):
+    path = str(tmp_path / "out.json")
+    save_simulation_results(make_simulator(), path)
+    with open(path) as f:
+        assert json.load(f)['statistics']['page_faults'] == 7
+
+def test_binary_extensions_round_trip(tmp_path):
+    for name in ("out.vmr", "out.npz"):
+        path = str(tmp_path / name)
+        save_simulation_results(make_simulator(), path)
+        assert is_binary_results(path)
+        assert load_simulation_results(path)['statistics']['page_faults'] == 7
+
+def test_saving_a_plot_keeps_the_matplotlib_backend(tmp_path):
+    import matplotlib
+    from utils import generate_performance_report, plot_algorithm_comparison
+
+    backend = matplotlib.get_backend()
+    path = str(tmp_path / "comparison.png")
+    plot_algorithm_comparison(generate_performance_report(make_simulator()), save_path=path)
+
+    assert matplotlib.get_backend() == backend
+    with open(path, 'rb') as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+def test_json_is_the_default_format(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for filename in (None, str(tmp_path / "results.txt")):
+        path = save_simulation_results(make_simulator(), filename)
+        assert not is_binary_results(path)
+        assert load_simulation_results(path)['statistics']['page_faults'] == 7
+
+    path = save_simulation_results(make_simulator(), str(tmp_path / "results.out"), format="binary")
+    assert is_binary_results(path)
+
+def test_binary_history_is_read_one_step_at_a_time(tmp_path):
+    simulator = make_simulator()
+    path = save_simulation_results(simulator, str(tmp_path / "out.vmr"))
+    results = load_simulation_results(path)
+
+    assert all(isinstance(values, np.memmap) for values in results.columns.values())
+    assert results.step(4) == simulator.history[4]
+    assert results['history'][-1] == simulator.history[-1]
+    assert len(results['history']) == len(simulator.history)
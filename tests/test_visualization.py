@@ -0,0 +1,103 @@
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from memory_simulator import MemorySimulator
+from visualization import (DETAIL_FRAME_LIMIT, DETAIL_REFERENCE_LIMIT, MemoryVisualizer,
+                           _visible_frames, _visible_references)
+
+class CountingCanvas(FigureCanvasAgg):
+    """Agg canvas that counts full draws and blits"""
+
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.draws = 0
+        self.blits = 0
+
+    def draw(self):
+        self.draws += 1
+        super().draw()
+
+    def blit(self, bbox=None):
+        self.blits += 1
+
+def make_simulator(num_frames=4, reference_string=(1, 2, 3, 4, 1, 2, 5, 1, 2, 3)):
+    simulator = MemorySimulator()
+    simulator.initialize(num_frames, 1024, "LRU")
+    simulator.set_reference_string(list(reference_string))
+    return simulator
+
+def make_canvas():
+    fig = Figure(figsize=(8, 6))
+    return fig, CountingCanvas(fig)
+
+def test_steps_are_blitted_without_full_redraws():
+    simulator = make_simulator()
+    visualizer = MemoryVisualizer()
+    fig, canvas = make_canvas()
+
+    visualizer.render(fig, canvas, simulator)
+    assert canvas.draws == 1
+
+    for page in simulator.reference_string:
+        simulator.simulate_step(page)
+        visualizer.render(fig, canvas, simulator)
+    assert canvas.draws == 1
+    assert canvas.blits > 0
+
+    # A reset rewinds the step counter, which needs a fresh scene
+    simulator.reset()
+    visualizer.render(fig, canvas, simulator)
+    assert canvas.draws == 2
+
+def render_scene(simulator, steps=0):
+    visualizer = MemoryVisualizer()
+    fig, canvas = make_canvas()
+    for page in simulator.reference_string[:steps]:
+        simulator.simulate_step(page)
+    visualizer.render(fig, canvas, simulator)
+    return visualizer
+
+@pytest.mark.parametrize("num_frames, aggregated", [(DETAIL_FRAME_LIMIT, False), (DETAIL_FRAME_LIMIT + 1, True)])
+def test_frames_are_aggregated_past_the_detail_limit(num_frames, aggregated):
+    scene = render_scene(make_simulator(num_frames), steps=5).scene
+
+    assert (scene['frame_image'] is not None) == aggregated
+    assert len(scene['frame_cells']) == (0 if aggregated else num_frames)
+    assert (scene['page_table_summary'] is not None) == aggregated
+
+@pytest.mark.parametrize("length, aggregated", [(DETAIL_REFERENCE_LIMIT, False),
+                                                (DETAIL_REFERENCE_LIMIT + 1, True)])
+def test_references_are_aggregated_past_the_detail_limit(length, aggregated):
+    scene = render_scene(make_simulator(reference_string=[i % 7 for i in range(length)]), steps=50).scene
+
+    assert (scene['reference_image'] is not None) == aggregated
+    assert len(scene['reference_items']) == (0 if aggregated else length)
+    if aggregated:
+        assert scene['reference_executed'].sum() == 50
+
+def test_zooming_in_draws_single_references():
+    # Zoom callbacks are held weakly, so the visualizer must stay alive as it does in the GUI
+    visualizer = render_scene(make_simulator(reference_string=list(range(1000))), steps=10)
+    scene = visualizer.scene
+    ax = scene['reference_ax']
+
+    ax.set_xlim(0, 19)
+    assert sorted(scene['reference_items']) == list(range(20))
+    ax.set_xlim(-0.5, 999.5)
+    assert scene['reference_items'] == {}
+
+def test_visible_windows_respect_the_limits():
+    fig = Figure()
+    ax = fig.add_subplot()
+
+    ax.set_xlim(10, 19)
+    assert _visible_references(ax, 1000) == (10, 20)
+    ax.set_xlim(-0.5, DETAIL_REFERENCE_LIMIT + 0.5)
+    assert _visible_references(ax, 1000) is None
+
+    ax.set_xlim(0, 4)
+    ax.set_ylim(0, 2)
+    assert _visible_frames(ax, 100) == [0, 1, 2, 3, 32, 33, 34, 35]
+    ax.set_xlim(0, 32)
+    ax.set_ylim(0, 3)
+    assert _visible_frames(ax, 100) is None